@@ -12,12 +12,13 @@ Usage:
 
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from src.storage import ResultsStorage
 from src.analysis import (
     calculate_baseline,
     get_all_baselines,
     print_baseline_report,
-    detect_drift,
+    detect_drift_all,
     compare_periods,
     print_drift_report,
 )
@@ -43,31 +44,36 @@ def cmd_baseline(args):
 def cmd_drift(args):
     """Detect drift from baseline."""
     storage = ResultsStorage()
-    runs = storage.load_all_runs()
+    table = storage.as_table()
     
-    if len(runs) < args.baseline + args.current:
+    if table.num_runs < args.baseline + args.current:
         print(f" Need at least {args.baseline + args.current} runs")
-        print(f"   Currently have: {len(runs)}")
+        print(f"   Currently have: {table.num_runs}")
         print(f"   Keep running daily and try again later!")
         return 1
     
     # Get all models
     model_names = set()
-    for run in runs:
-        model_names.update(run.models_tested)
+    for models_tested in table.run_models:
+        model_names.update(models_tested)
     
-    # Detect drift for each
-    for model_name in model_names:
-        try:
-            result = detect_drift(
-                storage,
-                model_name,
-                baseline_runs=args.baseline,
-                current_runs=args.current
-            )
+    # Detect drift for every model in one pass
+    try:
+        results = detect_drift_all(
+            storage,
+            model_names,
+            baseline_runs=args.baseline,
+            current_runs=args.current
+        )
+    except Exception as e:
+        print(f"Error analyzing drift: {e}")
+        return 1
+    
+    for model_name, result in results.items():
+        if isinstance(result, Exception):
+            print(f"Error analyzing {model_name}: {result}")
+        else:
             print_drift_report(result)
-        except Exception as e:
-            print(f"Error analyzing {model_name}: {e}")
     
     return 0
 
@@ -76,16 +82,16 @@ def cmd_compare(args):
     """Compare two time periods."""
     storage = ResultsStorage()
     
-    # Get all models
-    runs = storage.load_all_runs()
+    # Get all models. The table is shared by the compare_periods() calls
     model_names = set()
-    for run in runs:
-        model_names.update(run.models_tested)
-    
-    # Compare periods for each model
-    for model_name in model_names:
-        try:
-            result = compare_periods(
+    for models_tested in storage.as_table().run_models:
+        model_names.update(models_tested)
+    
+    # Compare periods for each model concurrently, report in a stable order
+    with ThreadPoolExecutor(max_workers=min(8, len(model_names) or 1)) as executor:
+        futures = {
+            model_name: executor.submit(
+                compare_periods,
                 storage,
                 model_name,
                 args.period1_start,
@@ -93,7 +99,12 @@ def cmd_compare(args):
                 args.period2_start,
                 args.period2_end
             )
-            print_drift_report(result)
+            for model_name in model_names
+        }
+    
+    for model_name, future in futures.items():
+        try:
+            print_drift_report(future.result())
         except Exception as e:
             print(f"Error comparing {model_name}: {e}")
     
@@ -109,18 +120,22 @@ def cmd_summary(args):
         print("No data found.")
         return 1
     
+    # Data point count and models in a single pass
+    total_results = 0
+    model_names = set()
+    for run in runs:
+        total_results += len(run.results)
+        model_names.update(run.models_tested)
+    
     print(f"\n{'='*60}")
     print("DATA SUMMARY")
     print(f"{'='*60}")
     print(f"Total runs: {len(runs)}")
     print(f"Date range: {runs[0].timestamp[:10]} to {runs[-1].timestamp[:10]}")
-    print(f"Total data points: {sum(len(r.results) for r in runs)}")
+    print(f"Total data points: {total_results}")
     print()
     
     # Models
-    model_names = set()
-    for run in runs:
-        model_names.update(run.models_tested)
     print(f"Models: {', '.join(model_names)}")
     print()
     
@@ -129,7 +144,7 @@ def cmd_summary(args):
         print("Recent Performance (last 3 runs):")
         for run in runs[-3:]:
             date = run.timestamp[:10]
-            summary = run.calculate_summary()
+            summary = run.summary
             print(f"\n  {date}:")
             for model, stats in summary["by_model"].items():
                 print(f"    {model}: {stats['avg_score']:.1%}")
@@ -13,6 +13,7 @@ from datetime import datetime
 
 from src.storage import ResultsStorage
 from src.analysis import get_all_baselines, detect_drift
+from dashboard.components.data import build_results_df
 from dashboard.components.charts import (
     plot_performance_over_time,
     plot_model_comparison,
@@ -62,16 +63,80 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_data(show_spinner=False)
+def _load_run_file_cached(results_dir: str, filepath: str, mtime_ns: int, size: int):
+    """Parse one run file. Cached until the file is rewritten."""
+    return ResultsStorage(results_dir).load_run_file(filepath)
+
+
+@st.cache_data(show_spinner=False)
+def _load_runs_cached(results_dir: str, dir_signature: tuple):
+    """
+    Load all runs from disk. Cached until dir_signature changes.
+    
+    Files are parsed through a per-file cache, so when a new run lands
+    only that file is read instead of the whole directory.
+    """
+    runs = []
+    for filepath, mtime_ns, size in dir_signature:
+        try:
+            runs.append(_load_run_file_cached(results_dir, filepath, mtime_ns, size))
+        except Exception as e:
+            print(f"Warning: Could not load {filepath}: {e}")
+    return runs
+
+
+@st.cache_data(show_spinner=False)
+def _load_run_dates_cached(results_dir: str, dir_signature: tuple):
+    """Calendar date of each run, parsed once. Cached until dir_signature changes."""
+    return [
+        datetime.fromisoformat(run.timestamp).date()
+        for run in _load_runs_cached(results_dir, dir_signature)
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _load_models_cached(results_dir: str, dir_signature: tuple):
+    """Sorted names of every model tested. Cached until dir_signature changes."""
+    all_models = set()
+    for run in _load_runs_cached(results_dir, dir_signature):
+        all_models.update(run.models_tested)
+    return tuple(sorted(all_models))
+
+
+@st.cache_data(show_spinner=False)
+def _load_results_df_cached(results_dir: str, dir_signature: tuple):
+    """Flat results DataFrame for all runs. Cached until dir_signature changes."""
+    return build_results_df(_load_runs_cached(results_dir, dir_signature))
+
+
+@st.cache_data(show_spinner=False)
+def _load_baselines_cached(results_dir: str, dir_signature: tuple, num_runs: int):
+    """Baselines for every model. Cached until dir_signature changes."""
+    return get_all_baselines(ResultsStorage(results_dir), num_runs=num_runs)
+
+
+@st.cache_data(show_spinner=False)
+def _to_csv_cached(_df: pd.DataFrame, data_key: tuple) -> bytes:
+    """CSV export of _df. Cached on data_key, the frame itself is not hashed."""
+    return _df.to_csv(index=False).encode("utf-8")
+
+
 def load_data():
     """Load all data from storage."""
     storage = ResultsStorage()
-    runs = storage.load_all_runs()
+    signature = storage.signature()
+    runs = _load_runs_cached(str(storage.data_dir), signature)
     
     if not runs:
         st.error("No data found. Run `python main.py` to collect data first.")
         st.stop()
     
-    return storage, runs
+    run_dates = _load_run_dates_cached(str(storage.data_dir), signature)
+    all_models = _load_models_cached(str(storage.data_dir), signature)
+    results_df = _load_results_df_cached(str(storage.data_dir), signature)
+    
+    return storage, runs, run_dates, all_models, results_df
 
 
 def main():
@@ -80,14 +145,14 @@ def main():
     st.markdown('<div class="sub-header">Track how AI models change over time</div>', unsafe_allow_html=True)
     
     # Load data
-    storage, runs = load_data()
+    storage, runs, run_dates, all_models, results_df = load_data()
     
     # Sidebar
     st.sidebar.title("⚙ Settings")
     
     # Date range filter
-    min_date = datetime.fromisoformat(runs[0].timestamp).date()
-    max_date = datetime.fromisoformat(runs[-1].timestamp).date()
+    min_date = run_dates[0]
+    max_date = run_dates[-1]
     
     date_range = st.sidebar.date_input(
         "Date Range",
@@ -97,14 +162,10 @@ def main():
     )
     
     # Model filter
-    all_models = set()
-    for run in runs:
-        all_models.update(run.models_tested)
-    
     selected_models = st.sidebar.multiselect(
         "Models",
-        options=sorted(all_models),
-        default=sorted(all_models)
+        options=list(all_models),
+        default=list(all_models)
     )
     
     # Category filter
@@ -122,17 +183,18 @@ def main():
     st.sidebar.metric("Date Range", f"{min_date} to {max_date}")
     st.sidebar.metric("Models", len(all_models))
     
-    # Filter runs by date
+    # Filter results by date. ISO date strings compare in calendar order,
+    # so this is a vectorized mask with no timestamp parsing
     if len(date_range) == 2:
         start_date, end_date = date_range
-        filtered_runs = [
-            r for r in runs
-            if start_date <= datetime.fromisoformat(r.timestamp).date() <= end_date
+        filtered_df = results_df[
+            (results_df["Date"] >= start_date.isoformat()) &
+            (results_df["Date"] <= end_date.isoformat())
         ]
     else:
-        filtered_runs = runs
+        filtered_df = results_df
     
-    if not filtered_runs:
+    if filtered_df.empty:
         st.warning("No data in selected date range.")
         return
     
@@ -144,14 +206,14 @@ def main():
         st.header("Performance Overview")
         
         # Summary metrics
-        display_summary_metrics(filtered_runs, selected_models)
+        display_summary_metrics(filtered_df, selected_models)
         
         st.markdown("---")
         
         # Performance over time
         st.subheader("Performance Over Time")
         fig_timeline = plot_performance_over_time(
-            filtered_runs, 
+            filtered_df,
             selected_models,
             selected_categories
         )
@@ -164,13 +226,13 @@ def main():
         
         with col1:
             st.subheader("Model Comparison")
-            fig_comparison = plot_model_comparison(filtered_runs, selected_models)
+            fig_comparison = plot_model_comparison(filtered_df, selected_models)
             st.plotly_chart(fig_comparison, use_container_width=True)
         
         with col2:
             st.subheader("By Category")
             fig_category = plot_category_breakdown(
-                filtered_runs,
+                filtered_df,
                 selected_models,
                 selected_categories
             )
@@ -186,7 +248,11 @@ def main():
             st.subheader("Baseline Metrics")
             
             try:
-                baselines = get_all_baselines(storage, num_runs=min(7, len(runs)))
+                baselines = _load_baselines_cached(
+                    str(storage.data_dir),
+                    storage.signature(),
+                    num_runs=min(7, len(runs))
+                )
                 
                 for model_name in selected_models:
                     if model_name in baselines:
@@ -231,36 +297,39 @@ def main():
             st.markdown("---")
             
             st.subheader("Drift Timeline")
-            fig_drift = plot_drift_timeline(runs, selected_models)
+            fig_drift = plot_drift_timeline(results_df, selected_models)
             st.plotly_chart(fig_drift, use_container_width=True)
     
     # TAB 4: Raw Data
     with tabs[3]:
         st.header("Raw Data")
         
-        # Convert to DataFrame
-        all_results = []
-        for run in filtered_runs:
-            for result in run.results:
-                if result.model_name in selected_models:
-                    if not selected_categories or result.category in selected_categories:
-                        all_results.append({
-                            "Date": run.timestamp[:10],
-                            "Time": run.timestamp[11:19],
-                            "Model": result.model_name,
-                            "Test ID": result.test_id,
-                            "Category": result.category,
-                            "Score": result.score,
-                            "Latency (ms)": result.latency_ms,
-                            "Tokens": result.tokens_total,
-                        })
+        # Select from the shared results frame
+        mask = filtered_df["Model"].isin(selected_models)
+        if selected_categories:
+            mask &= filtered_df["Category"].isin(selected_categories)
         
-        df = pd.DataFrame(all_results)
+        df = filtered_df.loc[mask, [
+            "Date",
+            "Time",
+            "Model",
+            "Test ID",
+            "Category",
+            "Score",
+            "Latency (ms)",
+            "Tokens",
+        ]].reset_index(drop=True)
         
         st.dataframe(df, use_container_width=True, height=400)
         
-        # Download button
-        csv = df.to_csv(index=False)
+        # Download button. The CSV only changes with the data on disk and
+        # the filters, so don't rebuild it on unrelated reruns
+        csv = _to_csv_cached(df, (
+            storage.signature(),
+            tuple(date_range),
+            tuple(selected_models),
+            tuple(selected_categories),
+        ))
         st.download_button(
             label="Download CSV",
             data=csv,
@@ -1,3 +1,5 @@
+from .data import build_results_df
+
 from .charts import (
     plot_performance_over_time,
     plot_model_comparison,
@@ -15,6 +17,7 @@ from .metrics import (
 )
 
 __all__ = [
+    "build_results_df",
     "plot_performance_over_time",
     "plot_model_comparison",
     "plot_category_breakdown",
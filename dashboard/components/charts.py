@@ -4,42 +4,36 @@ import pandas as pd
 from typing import List
 
 
-def plot_performance_over_time(runs, models: List[str], categories: List[str] = None):
+def plot_performance_over_time(df: pd.DataFrame, models: List[str], categories: List[str] = None):
     """
     Line chart showing performance over time.
     Args:
-        runs: List of TestRun objects
+        df: Flat results DataFrame (see build_results_df)
         models: Which models to include
         categories: Optional category filter
     """
-    data = []
-    
-    for run in runs:
-        date = run.timestamp[:10]
-        
-        for model in models:
-            model_results = [r for r in run.results if r.model_name == model]
-            
-            # Filter by category if specified
-            if categories:
-                model_results = [r for r in model_results if r.category in categories]
-            
-            if model_results:
-                avg_score = sum(r.score for r in model_results) / len(model_results)
-                data.append({
-                    "Date": date,
-                    "Model": model,
-                    "Score": avg_score * 100,  # Convert to percentage
-                })
-    
-    df = pd.DataFrame(data)
+    mask = df["Model"].isin(models)
+    
+    # Filter by category if specified
+    if categories:
+        mask &= df["Category"].isin(categories)
+    
+    # One point per run and model
+    data = (
+        df[mask]
+        .groupby(["Run", "Date", "Model"], observed=True)["Score"]
+        .mean()
+        .mul(100)  # Convert to percentage
+        .reset_index()
+    )
     
     fig = px.line(
-        df,
+        data,
         x="Date",
         y="Score",
         color="Model",
         markers=True,
+        category_orders={"Model": models},
         title="Performance Over Time"
     )
     
@@ -54,30 +48,26 @@ def plot_performance_over_time(runs, models: List[str], categories: List[str] =
     return fig
 
 
-def plot_model_comparison(runs, models: List[str]):
+def plot_model_comparison(df: pd.DataFrame, models: List[str]):
     """
     Bar chart comparing average performance between models.
     """
-    data = []
-    
-    for model in models:
-        all_results = []
-        for run in runs:
-            model_results = [r for r in run.results if r.model_name == model]
-            all_results.extend(model_results)
-        
-        if all_results:
-            avg_score = sum(r.score for r in all_results) / len(all_results)
-            data.append({
-                "Model": model,
-                "Average Score": avg_score * 100,
-                "Tests": len(all_results)
-            })
+    data = (
+        df[df["Model"].isin(models)]
+        .groupby("Model", observed=True)["Score"]
+        .agg(["mean", "count"])
+        .reindex(models)
+        .dropna()
+    )
     
-    df = pd.DataFrame(data)
+    data = pd.DataFrame({
+        "Model": data.index,
+        "Average Score": data["mean"].to_numpy() * 100,
+        "Tests": data["count"].astype(int).to_numpy(),
+    })
     
     fig = px.bar(
-        df,
+        data,
         x="Model",
         y="Average Score",
         text="Average Score",
@@ -95,41 +85,32 @@ def plot_model_comparison(runs, models: List[str]):
     return fig
 
 
-def plot_category_breakdown(runs, models: List[str], categories: List[str] = None):
+def plot_category_breakdown(df: pd.DataFrame, models: List[str], categories: List[str] = None):
     """
     Grouped bar chart showing performance by category.
     """
-    data = []
-    
     all_categories = categories or ["math", "reasoning", "factual", "consistency", "instruction"]
     
-    for model in models:
-        for category in all_categories:
-            category_results = []
-            
-            for run in runs:
-                model_results = [
-                    r for r in run.results
-                    if r.model_name == model and r.category == category
-                ]
-                category_results.extend(model_results)
-            
-            if category_results:
-                avg_score = sum(r.score for r in category_results) / len(category_results)
-                data.append({
-                    "Model": model,
-                    "Category": category.capitalize(),
-                    "Score": avg_score * 100
-                })
-    
-    df = pd.DataFrame(data)
+    mask = df["Model"].isin(models) & df["Category"].isin(all_categories)
+    data = (
+        df[mask]
+        .groupby(["Model", "Category"], observed=True)["Score"]
+        .mean()
+        .mul(100)
+        .reset_index()
+    )
+    data["Category"] = data["Category"].str.capitalize()
     
     fig = px.bar(
-        df,
+        data,
         x="Category",
         y="Score",
         color="Model",
         barmode="group",
+        category_orders={
+            "Model": models,
+            "Category": [c.capitalize() for c in all_categories],
+        },
         title="Performance by Category"
     )
     
@@ -142,60 +123,36 @@ def plot_category_breakdown(runs, models: List[str], categories: List[str] = Non
     return fig
 
 
-def plot_drift_timeline(runs, models: List[str]):
+def plot_drift_timeline(df: pd.DataFrame, models: List[str]):
     """
     Timeline showing when drift was detected.
     """
-    # Calculate rolling average for each model
-    data = []
+    # Average score for each run, per model
+    data = (
+        df[df["Model"].isin(models)]
+        .groupby(["Run", "Date", "Model"], observed=True)["Score"]
+        .agg(["sum", "count"])
+        .reset_index()
+    )
+    data["Score"] = data["sum"] / data["count"]
     
-    for model in models:
-        for i, run in enumerate(runs):
-            model_results = [r for r in run.results if r.model_name == model]
-            
-            if model_results:
-                avg_score = sum(r.score for r in model_results) / len(model_results)
-                
-                # Calculate baseline (first 7 runs)
-                # Calculate baseline (first 7 runs that contain THIS model)
-                if i >= 7:
-                    # Find first 7 runs containing this model
-                    model_runs_before_current = []
-                    for past_run in runs[:i]:  # Only look at runs BEFORE current run
-                        if model in past_run.models_tested:
-                            model_runs_before_current.append(past_run)
-                            if len(model_runs_before_current) >= 7:
-                                break
-                    
-                    if len(model_runs_before_current) >= 7:
-                        # Calculate baseline from first 7 runs containing this model
-                        baseline_results = []
-                        for baseline_run in model_runs_before_current[:7]:
-                            baseline_model_results = [
-                                r for r in baseline_run.results 
-                                if r.model_name == model
-                            ]
-                            baseline_results.extend(baseline_model_results)
-                        
-                        baseline_avg = sum(r.score for r in baseline_results) / len(baseline_results) if baseline_results else avg_score
-                        deviation = ((avg_score - baseline_avg) / baseline_avg) * 100 if baseline_avg > 0 else 0
-                    else:
-                        deviation = 0
-                else:
-                    deviation = 0
-                data.append({
-                    "Date": run.timestamp[:10],
-                    "Model": model,
-                    "Score": avg_score * 100,
-                    "Deviation": deviation
-                })
+    # How many earlier runs contain this model
+    data["Model Run"] = data.groupby("Model", observed=True).cumcount()
+    
+    # Baseline is the first 7 runs that contain each model; it doesn't
+    # depend on the current run, so compute it once per model
+    baseline_totals = data[data["Model Run"] < 7].groupby("Model", observed=True)[["sum", "count"]].sum()
+    baselines = baseline_totals["sum"] / baseline_totals["count"]
+    baseline_avg = data["Model"].map(baselines).astype(float)
     
-    df = pd.DataFrame(data)
+    # Deviation only once 7 earlier runs make up the baseline
+    deviation = (data["Score"] - baseline_avg) / baseline_avg * 100
+    data["Deviation"] = deviation.where((data["Model Run"] >= 7) & (baseline_avg > 0), 0)
     
     fig = go.Figure()
     
     for model in models:
-        model_df = df[df["Model"] == model]
+        model_df = data[data["Model"] == model]
         
         fig.add_trace(go.Scatter(
             x=model_df["Date"],
@@ -225,27 +182,25 @@ def plot_test_heatmap(runs, model: str):
     """
     Heatmap showing which tests pass/fail over time.
     """
-    # Get all unique test IDs
+    # Index each run's scores by test ID once, so each cell is a dict lookup
+    run_index = []
     test_ids = set()
     for run in runs:
+        scores = {}
         for result in run.results:
             if result.model_name == model:
-                test_ids.add(result.test_id)
+                scores.setdefault(result.test_id, result.score)
+        run_index.append(scores)
+        test_ids.update(scores)
     
     test_ids = sorted(test_ids)
     dates = [run.timestamp[:10] for run in runs]
     
     # Create matrix
-    matrix = []
-    for test_id in test_ids:
-        row = []
-        for run in runs:
-            result = next(
-                (r for r in run.results if r.test_id == test_id and r.model_name == model),
-                None
-            )
-            row.append(result.score if result else None)
-        matrix.append(row)
+    matrix = [
+        [scores.get(test_id) for scores in run_index]
+        for test_id in test_ids
+    ]
     
     fig = go.Figure(data=go.Heatmap(
         z=matrix,
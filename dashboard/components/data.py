@@ -0,0 +1,62 @@
+import pandas as pd
+
+
+# One row per test result; names match what the raw data tab displays
+RESULT_COLUMNS = [
+    "Run",
+    "Date",
+    "Time",
+    "Model",
+    "Test ID",
+    "Category",
+    "Score",
+    "Latency (ms)",
+    "Tokens",
+    "Success",
+]
+
+
+def build_results_df(runs) -> pd.DataFrame:
+    """
+    Flatten runs into a single DataFrame with one row per result.
+    
+    Charts and metrics aggregate this with pandas instead of re-walking
+    runs -> results in Python, so it only needs building once per data load.
+    
+    Args:
+        runs: List of TestRun objects (oldest first)
+    
+    Returns:
+        DataFrame with RESULT_COLUMNS. "Run" is the run's index in `runs`.
+    """
+    records = [
+        (
+            run_idx,
+            run.timestamp[:10],
+            run.timestamp[11:19],
+            result.model_name,
+            result.test_id,
+            result.category,
+            result.score,
+            result.latency_ms,
+            result.tokens_total,
+            result.success,
+        )
+        for run_idx, run in enumerate(runs)
+        for result in run.results
+    ]
+    
+    df = pd.DataFrame.from_records(records, columns=RESULT_COLUMNS)
+    
+    # Few distinct values, filtered and grouped on constantly: store as
+    # categoricals so comparisons are integer codes instead of strings
+    df["Model"] = df["Model"].astype("category")
+    df["Category"] = df["Category"].astype("category")
+    
+    # Run indexes, latencies and token counts are small integers: store
+    # them in the narrowest type that fits instead of int64. Scores stay
+    # float64, since float32 can't hold values like 0.7 exactly
+    for column in ("Run", "Latency (ms)", "Tokens"):
+        df[column] = pd.to_numeric(df[column], downcast="integer")
+    
+    return df
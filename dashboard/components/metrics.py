@@ -1,47 +1,70 @@
 import streamlit as st
+import pandas as pd
 from typing import List
-from src.analysis import detect_drift
+from src.analysis import detect_drift_all
+from src.storage import ResultsStorage
 
 
-def display_summary_metrics(runs, models: List[str]):
+@st.cache_resource(show_spinner=False)
+def _shared_storage(results_dir: str) -> ResultsStorage:
+    """One storage per results dir, so drift checks share its results table."""
+    return ResultsStorage(results_dir)
+
+
+@st.cache_data(show_spinner=False)
+def _detect_drift_cached(
+    results_dir: str,
+    dir_signature: tuple,
+    models: tuple,
+    baseline_runs: int,
+    current_runs: int
+):
+    """Drift results for the given models. Cached until dir_signature changes."""
+    return detect_drift_all(
+        _shared_storage(results_dir),
+        models,
+        baseline_runs=baseline_runs,
+        current_runs=current_runs
+    )
+
+
+def display_summary_metrics(df: pd.DataFrame, models: List[str]):
     """
     Display summary metrics at the top of the dashboard.
     """
     cols = st.columns(len(models))
     
+    # Calculate metrics for every model in one groupby
+    selected = df[df["Model"].isin(models)]
+    summary = selected.assign(
+        # Only successful calls count towards latency
+        success_latency=selected["Latency (ms)"].where(selected["Success"])
+    ).groupby("Model", observed=True).agg(
+        avg_score=("Score", "mean"),
+        success_rate=("Success", "mean"),
+        avg_latency=("success_latency", "mean"),
+    )
+    
+    # Compare recent half of the runs to the first half, for every model
+    run_ids = df["Run"].unique()
+    mid_point = len(run_ids) // 2
+    
+    if mid_point > 0:
+        recent = (selected["Run"] >= run_ids[mid_point]).rename("Recent")
+        halves = selected.groupby(
+            [selected["Model"], recent], observed=True
+        )["Score"].mean().unstack().reindex(columns=[False, True])
+        
+        # Models with results in only one half get no delta
+        deltas = (halves[True] - halves[False]).fillna(0)
+    else:
+        deltas = pd.Series(dtype=float)
+    
     for idx, model in enumerate(models):
         with cols[idx]:
-            # Get all results for this model
-            all_results = []
-            for run in runs:
-                model_results = [r for r in run.results if r.model_name == model]
-                all_results.extend(model_results)
-            
-            if all_results:
-                # Calculate metrics
-                avg_score = sum(r.score for r in all_results) / len(all_results)
-                success_rate = sum(1 for r in all_results if r.success) / len(all_results)
-                avg_latency = sum(r.latency_ms for r in all_results if r.success) / len([r for r in all_results if r.success])
-                
-                # Compare to first half
-                mid_point = len(runs) // 2
-                if mid_point > 0:
-                    early_results = []
-                    for run in runs[:mid_point]:
-                        early_results.extend([r for r in run.results if r.model_name == model])
-                    
-                    recent_results = []
-                    for run in runs[mid_point:]:
-                        recent_results.extend([r for r in run.results if r.model_name == model])
-                    
-                    if early_results and recent_results:
-                        early_avg = sum(r.score for r in early_results) / len(early_results)
-                        recent_avg = sum(r.score for r in recent_results) / len(recent_results)
-                        delta = recent_avg - early_avg
-                    else:
-                        delta = 0
-                else:
-                    delta = 0
+            if model in summary.index:
+                avg_score, success_rate, avg_latency = summary.loc[model]
+                delta = deltas.get(model, 0)
                 
                 # Display
                 st.metric(
@@ -50,7 +73,8 @@ def display_summary_metrics(runs, models: List[str]):
                     delta=f"{delta:+.1%}" if delta != 0 else None
                 )
                 
-                st.caption(f" {avg_latency:.0f}ms avg")
+                if pd.notna(avg_latency):
+                    st.caption(f" {avg_latency:.0f}ms avg")
                 st.caption(f" {success_rate:.0%} success rate")
 
 
@@ -58,9 +82,28 @@ def display_drift_alerts(storage, models: List[str]):
     """
     Display drift detection alerts.
     """
+    if not models:
+        return
+    
+    signature = storage.signature()
+    
+    # All models in one pass; too few runs means no model can be checked
+    try:
+        results = _detect_drift_cached(
+            str(storage.data_dir),
+            signature,
+            tuple(models),
+            baseline_runs=7,
+            current_runs=3
+        )
+    except Exception as e:
+        results = {model: e for model in models}
+    
     for model in models:
         try:
-            result = detect_drift(storage, model, baseline_runs=7, current_runs=3)
+            result = results[model]
+            if isinstance(result, Exception):
+                raise result
             
             if result.drift_detected:
                 # Show alert
@@ -86,6 +129,9 @@ def display_drift_alerts(storage, models: List[str]):
                     st.markdown(f"**Period:** {result.test_period}")
             else:
                 st.success(f" **{model}**: {result.summary}")
+            
+            if result.warning:
+                st.caption(f" {result.warning}")
         
         except ValueError as e:
             if "Need at least" in str(e):
@@ -96,24 +142,20 @@ def display_drift_alerts(storage, models: List[str]):
             st.error(f" Error analyzing {model}: {e}")
 
 
-def display_category_performance(runs, model: str):
+def display_category_performance(df: pd.DataFrame, model: str):
     """
     Display performance breakdown by category.
     """
     categories = ["math", "reasoning", "factual", "consistency", "instruction"]
     
+    # Average score per category for this model in one groupby
+    cat_scores = df[df["Model"] == model].groupby(
+        "Category", observed=True
+    )["Score"].mean()
+    
     for category in categories:
-        # Get results for this category
-        cat_results = []
-        for run in runs:
-            results = [
-                r for r in run.results
-                if r.model_name == model and r.category == category
-            ]
-            cat_results.extend(results)
-        
-        if cat_results:
-            avg_score = sum(r.score for r in cat_results) / len(cat_results)
+        if category in cat_scores.index:
+            avg_score = cat_scores[category]
             
             # Create progress bar
             st.markdown(f"**{category.capitalize()}**")
@@ -121,40 +163,32 @@ def display_category_performance(runs, model: str):
             st.markdown("")  # Spacing
 
 
-def display_latency_stats(runs, model: str):
+def display_latency_stats(df: pd.DataFrame, model: str):
     """
     Display latency statistics.
     """
-    all_results = []
-    for run in runs:
-        model_results = [r for r in run.results if r.model_name == model and r.success]
-        all_results.extend(model_results)
+    # Batch API results have no latency (NaN) and are left out
+    latencies = df.loc[(df["Model"] == model) & df["Success"], "Latency (ms)"].dropna()
     
-    if all_results:
-        latencies = [r.latency_ms for r in all_results]
-        
-        avg_latency = sum(latencies) / len(latencies)
-        min_latency = min(latencies)
-        max_latency = max(latencies)
+    if not latencies.empty:
+        stats = latencies.agg(["mean", "min", "max"])
         
         cols = st.columns(3)
-        cols[0].metric("Average", f"{avg_latency:.0f}ms")
-        cols[1].metric("Min", f"{min_latency:.0f}ms")
-        cols[2].metric("Max", f"{max_latency:.0f}ms")
+        cols[0].metric("Average", f"{stats['mean']:.0f}ms")
+        cols[1].metric("Min", f"{stats['min']:.0f}ms")
+        cols[2].metric("Max", f"{stats['max']:.0f}ms")
 
 
-def display_token_stats(runs, model: str):
+def display_token_stats(df: pd.DataFrame, model: str):
     """
     Display token usage statistics.
     """
-    all_results = []
-    for run in runs:
-        model_results = [r for r in run.results if r.model_name == model]
-        all_results.extend(model_results)
+    tokens = df.loc[df["Model"] == model, "Tokens"]
     
-    if all_results:
-        total_tokens = sum(r.tokens_total for r in all_results)
-        avg_tokens = total_tokens / len(all_results)
+    if not tokens.empty:
+        stats = tokens.agg(["sum", "mean"])
+        total_tokens = int(stats["sum"])
+        avg_tokens = stats["mean"]
         
         # Estimate cost (rough estimates)
         # GPT-4: $0.03 per 1K input, $0.06 per 1K output (average ~$0.045/1K)
@@ -12,12 +12,18 @@ Options:
   --model     Specify model(s) to test: gpt4, claude, or all
   --category  Test specific category: math, reasoning, factual, consistency, instruction
   --no-save   Don't save results to disk
+  --concurrency  Maximum API calls in flight at once (default: 8)
+  --batch     Use the OpenAI/Anthropic Batch APIs (half price, slower)
+  --async     Query through the SDKs' async clients instead of a thread pool (not with --batch)
+  --cache     Replay cached responses for repeated prompts (development only)
+  --retries   Retries per failed API call on rate limits/5xx (default: 3)
 
 Examples:
   python main.py                    # Run full suite against all models
   python main.py --quick            # Quick verification test
   python main.py --model claude     # Test only Claude
   python main.py --category math    # Run only math tests
+  python main.py --batch            # Scheduled run through the Batch APIs
 """
 
 import argparse
@@ -27,9 +33,13 @@ from datetime import datetime
 # Add src to path so imports work
 sys.path.insert(0, '.')
 
-from src.models import OpenAIModel, AnthropicModel, get_all_models
-from src.tests import get_all_tests, get_tests_by_category, TestCategory
-from src.runner import DriftMonitorRunner, run_quick_test
+from src.tests import TestCategory
+
+CATEGORY_CHOICES = tuple(c.value for c in TestCategory)
+
+# src.models pulls in every provider SDK (openai, anthropic, google, ...),
+# which takes seconds. Those imports live inside the functions that need
+# them so --help and argument errors return immediately.
 
 
 def parse_args():
@@ -63,7 +73,7 @@ Examples:
     parser.add_argument(
         "--category",
         type=str,
-        choices=["math", "reasoning", "factual", "consistency", "instruction"],
+        choices=CATEGORY_CHOICES,
         default=None,
         help="Test only a specific category"
     )
@@ -74,6 +84,49 @@ Examples:
         help="Don't save results to disk"
     )
     
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum API calls in flight at once (default: 8)"
+    )
+    
+    # A batch job is submitted and polled, so there's nothing to run async
+    query_mode = parser.add_mutually_exclusive_group()
+    
+    query_mode.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit OpenAI/Anthropic prompts through their Batch APIs (half price, can take hours)"
+    )
+    
+    query_mode.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Query models through their async clients on one event loop"
+    )
+    
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Replay cached responses for prompts already sent (development only, hides drift)"
+    )
+    
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=86400,
+        help="Seconds a cached response stays valid (default: 86400)"
+    )
+    
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries per API call on rate limits, 5xx errors and timeouts (default: 3, 0 disables)"
+    )
+    
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -86,10 +139,13 @@ Examples:
 def get_models_from_arg(model_arg: str):
     """Get model instances based on command line argument."""
     if model_arg == "all":
+        from src.models import get_all_models
         return get_all_models()
     elif model_arg == "gpt4":
+        from src.models import OpenAIModel
         return [OpenAIModel()]
     elif model_arg == "claude":
+        from src.models import AnthropicModel
         return [AnthropicModel()]
     else:
         raise ValueError(f"Unknown model: {model_arg}")
@@ -99,6 +155,9 @@ def main():
     """Main entry point."""
     args = parse_args()
     
+    from src.tests import get_all_tests, get_tests_by_category
+    from src.runner import DriftMonitorRunner
+    
     # Print header
     if not args.quiet:
         print("""
@@ -114,13 +173,22 @@ def main():
         if not args.quiet:
             print("\n🚀 Running quick test (5 tests per model)...\n")
         
-        models = get_all_models()
+        models = get_models_from_arg("all")
         
-        for model in models:
-            run = run_quick_test(model.name)
-            
-            if not args.quiet:
-                avg = sum(r.score for r in run.results) / len(run.results) if run.results else 0
+        # One runner for every model, so all models are queried concurrently
+        runner = DriftMonitorRunner(
+            models=models,
+            max_concurrency=args.concurrency,
+            retries=args.retries,
+            use_cache=args.cache,
+            cache_ttl=args.cache_ttl
+        )
+        run = runner.run_all_tests(tests=get_all_tests()[:5], save=False)
+        
+        if not args.quiet:
+            by_model = run.summary["by_model"]
+            for model in models:
+                avg = by_model[model.name]["avg_score"] if model.name in by_model else 0
                 print(f" {model.name}: {avg:.1%} avg score")
         
         if not args.quiet:
@@ -137,6 +205,10 @@ def main():
             print(" No models available. Check your API keys in .env")
             return 1
         
+        if args.cache:
+            if not args.quiet:
+                print("\n⚠ Response cache enabled: repeated prompts are replayed, not re-queried")
+        
         # Get tests
         if args.category:
             category = TestCategory(args.category)
@@ -149,14 +221,29 @@ def main():
         # Create runner
         runner = DriftMonitorRunner(
             models=models,
-            verbose=not args.quiet
+            verbose=not args.quiet,
+            max_concurrency=args.concurrency,
+            retries=args.retries,
+            use_cache=args.cache,
+            cache_ttl=args.cache_ttl
         )
         
-        # Run tests
-        run = runner.run_all_tests(
-            tests=tests,
-            save=not args.no_save
-        )
+        # Run tests, keeping a running total for the overall score
+        total_score = 0.0
+        count = 0
+        if args.use_async:
+            run = runner.run_all_tests(tests=tests, save=not args.no_save, use_async=True)
+            total_score = sum(result.score for result in run.results)
+            count = len(run.results)
+        else:
+            for result in runner.iter_results(
+                tests=tests,
+                save=not args.no_save,
+                batch=args.batch
+            ):
+                total_score += result.score
+                count += 1
+            run = runner.finalize()
         
         # Final summary
         if not args.quiet:
@@ -164,14 +251,14 @@ def main():
             print(" TEST RUN COMPLETE")
             print(f"{'='*60}")
             print(f"Run ID: {run.run_id}")
-            print(f"Total results: {len(run.results)}")
+            print(f"Total results: {count}")
             
             # Overall score
-            avg_score = sum(r.score for r in run.results) / len(run.results)
+            avg_score = total_score / count if count else 0.0
             print(f"Overall average score: {avg_score:.1%}")
             
             if not args.no_save:
-                print(f"\n📁 Results saved to: data/raw/run_{run.run_id}.json")
+                print(f"\n📁 Results saved to: data/raw/run_{run.run_id}.jsonl")
             
             print("\n💡 Next steps:")
             print("   - Run 'python dashboard/app.py' to view results")
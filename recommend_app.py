@@ -7,15 +7,14 @@ Public-facing AI Model Recommendation Tool
 Run with: streamlit run recommend_app.py
 """
 
+import math
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
 
-from src.storage import ResultsStorage
+from src.storage import ResultsStorage, ResultsTable
 from src.recommender import ModelRecommender, TaskType
 
 
@@ -59,6 +58,86 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_recommender(results_dir: str, dir_signature: tuple) -> ModelRecommender:
+    """Recommender over all runs. Rebuilt only when dir_signature changes."""
+    return ModelRecommender(ResultsStorage(results_dir))
+
+
+@st.cache_data(show_spinner=False)
+def _compare_models_cached(results_dir: str, dir_signature: tuple, task_value: str):
+    """Per-model stats for one task type. Cached until dir_signature changes."""
+    recommender = _load_recommender(results_dir, dir_signature)
+    return recommender.compare_models(TaskType(task_value))
+
+
+@st.cache_data(show_spinner=False)
+def _stats_table_cached(results_dir: str, dir_signature: tuple, task_value: str):
+    """Formatted per-model stats table for one task type."""
+    import pandas as pd
+    
+    comparison = _compare_models_cached(results_dir, dir_signature, task_value)
+    return pd.DataFrame.from_records(
+        [
+            (
+                model,
+                f"{stats['avg_score']:.1%}",
+                f"{max(0, 1 - stats['std']*2):.1%}",
+                f"{stats['avg_latency']:.0f}ms" if pd.notna(stats['avg_latency']) else "n/a",
+                stats['count'],
+            )
+            for model, stats in comparison.items()
+        ],
+        columns=["Model", "Accuracy", "Consistency", "Avg Speed", "Tests"]
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _load_totals_cached(results_dir: str, dir_signature: tuple):
+    """(runs, models, results) counts. Cached until dir_signature changes."""
+    df = ResultsTable(ResultsStorage(results_dir)).load(columns=["run_id", "model_name"])
+    return df["run_id"].nunique(), df["model_name"].nunique(), len(df)
+
+
+@st.cache_data(show_spinner=False)
+def _model_strengths_cached(results_dir: str, dir_signature: tuple):
+    """Top 3 categories per model. Cached until dir_signature changes."""
+    recommender = _load_recommender(results_dir, dir_signature)
+    return {
+        model: recommender.get_model_strengths(model, top=3)
+        for model in recommender.performance_matrix
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _comparison_chart_cached(task_value: str, recommended: str, model_scores: tuple) -> dict:
+    """Plotly spec for the accuracy bar chart. Built once per distinct input."""
+    import plotly.graph_objects as go
+    
+    models = [m for m, _ in model_scores]
+    scores = [score * 100 for _, score in model_scores]
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=models,
+            y=scores,
+            text=[f"{s:.1f}%" for s in scores],
+            textposition='outside',
+            marker_color=['#667eea' if m == recommended else '#cbd5e0' for m in models]
+        )
+    ])
+    
+    fig.update_layout(
+        title=f"Performance Comparison: {task_value.title()}",
+        yaxis_title="Accuracy (%)",
+        yaxis_range=[0, 100],
+        showlegend=False,
+        height=300
+    )
+    
+    return fig.to_dict()
+
+
 def main():
     # Header
     st.markdown('<div class="big-title"> AI Model Advisor</div>', unsafe_allow_html=True)
@@ -67,10 +146,12 @@ def main():
         unsafe_allow_html=True
     )
     
-    # Load data
+    # Load data. Slider changes only redo the cheap weighted sum in
+    # recommend(); parsing runs and aggregating them is cached
     try:
         storage = ResultsStorage()
-        recommender = ModelRecommender(storage)
+        signature = storage.signature()
+        recommender = _load_recommender(str(storage.data_dir), signature)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         st.info("Make sure you've run `python main.py` to collect performance data first.")
@@ -84,13 +165,12 @@ def main():
         
         task_descriptions = {
             TaskType.MATH: " Math & Calculations",
-            TaskType.LOGICAL_REASONING: "🧩 Logic Puzzles & Reasoning",
+            TaskType.REASONING: "🧩 Logic Puzzles & Reasoning",
             TaskType.CREATIVE_WRITING: "✍ Creative Writing & Stories",
-            TaskType.CODE_GENERATION: "💻 Code Generation & Debugging",
-            TaskType.FACTUAL_QA: "📚 Factual Questions & Knowledge",
+            TaskType.CODING: "💻 Code Generation & Debugging",
+            TaskType.FACTUAL: "📚 Factual Questions & Knowledge",
             TaskType.INSTRUCTION_FOLLOWING: " Following Specific Instructions",
-            TaskType.COMPLEX_PROBLEM: "🔬 Complex Problem Solving",
-            TaskType.GENERAL: "🌐 General Purpose Tasks",
+            TaskType.CONSISTENCY: "🔁 Consistent Answers",
         }
         
         selected_task = st.radio(
@@ -147,6 +227,7 @@ def main():
         
         try:
             recommendation = recommender.recommend(selected_task, priorities)
+            latency = recommendation.performance_details['latency_ms']
             
             # Main recommendation
             st.markdown(f"""
@@ -159,7 +240,7 @@ def main():
                     <div>
                         <div style="font-size: 0.9rem; opacity: 0.8;">Performance</div>
                         <div style="font-size: 1.8rem; font-weight: bold;">
-                            {recommendation.performance_score:.1%}
+                            {recommendation.performance_details['accuracy']:.1%}
                         </div>
                     </div>
                     <div>
@@ -171,7 +252,7 @@ def main():
                     <div>
                         <div style="font-size: 0.9rem; opacity: 0.8;">Avg Speed</div>
                         <div style="font-size: 1.8rem; font-weight: bold;">
-                            {recommendation.avg_latency_ms}ms
+                            {"n/a" if math.isnan(latency) else f"{latency:.0f}ms"}
                         </div>
                     </div>
                 </div>
@@ -182,11 +263,11 @@ def main():
             if recommendation.alternatives:
                 st.markdown("### Consider These Alternatives")
                 
-                for alt_model, alt_score, reason in recommendation.alternatives:
+                for alt_model, alt_score in recommendation.alternatives:
                     st.markdown(f"""
                     <div class="alternative-box">
                         <strong>{alt_model}</strong> ({alt_score:.1%})<br>
-                        <span style="color: #666;">{reason}</span>
+                        <span style="color: #666;">Consider if you prioritize different metrics</span>
                     </div>
                     """, unsafe_allow_html=True)
             
@@ -194,48 +275,29 @@ def main():
             st.markdown("---")
             st.markdown("### Detailed Comparison")
             
-            comparison = recommender.compare_models(selected_task)
+            comparison = _compare_models_cached(
+                str(storage.data_dir),
+                signature,
+                selected_task.value
+            )
             
             if comparison:
                 # Create comparison chart
-                models = list(comparison.keys())
-                scores = [comparison[m]["avg_score"] * 100 for m in models]
-                
-                fig = go.Figure(data=[
-                    go.Bar(
-                        x=models,
-                        y=scores,
-                        text=[f"{s:.1f}%" for s in scores],
-                        textposition='outside',
-                        marker_color=['#667eea' if m == recommendation.recommended_model else '#cbd5e0' for m in models]
-                    )
-                ])
-                
-                fig.update_layout(
-                    title=f"Performance Comparison: {selected_task.value.title()}",
-                    yaxis_title="Accuracy (%)",
-                    yaxis_range=[0, 100],
-                    showlegend=False,
-                    height=300
+                fig = _comparison_chart_cached(
+                    selected_task.value,
+                    recommendation.recommended_model,
+                    tuple((m, stats["avg_score"]) for m, stats in comparison.items())
                 )
                 
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Detailed stats table
                 with st.expander(" View Detailed Statistics"):
-                    import pandas as pd
-                    
-                    data = []
-                    for model, stats in comparison.items():
-                        data.append({
-                            "Model": model,
-                            "Accuracy": f"{stats['avg_score']:.1%}",
-                            "Consistency": f"{max(0, 1 - stats['std']*2):.1%}",
-                            "Avg Speed": f"{stats['avg_latency']:.0f}ms",
-                            "Tests": stats['count']
-                        })
-                    
-                    df = pd.DataFrame(data)
+                    df = _stats_table_cached(
+                        str(storage.data_dir),
+                        signature,
+                        selected_task.value
+                    )
                     st.dataframe(df, hide_index=True, use_container_width=True)
         
         except Exception as e:
@@ -248,19 +310,19 @@ def main():
     
     col1, col2, col3 = st.columns(3)
     
+    # Read from the columnar results table, only the two columns needed
+    total_runs, total_models, total_tests = _load_totals_cached(
+        str(storage.data_dir),
+        signature
+    )
+    
     with col1:
-        total_runs = len(recommender.runs)
         st.metric("Data Points", f"{total_runs} runs")
     
     with col2:
-        models = list(recommender.performance_matrix.keys())
-        st.metric("Models Tested", len(models))
+        st.metric("Models Tested", total_models)
     
     with col3:
-        total_tests = sum(
-            sum(cat["count"] for cat in model_data.values())
-            for model_data in recommender.performance_matrix.values()
-        )
         st.metric("Total Tests", total_tests)
     
     st.markdown("""
@@ -274,11 +336,11 @@ def main():
     with st.expander(" View Model Strengths"):
         st.markdown("### What Each Model Excels At")
         
-        for model in recommender.performance_matrix.keys():
-            strengths = recommender.get_model_strengths(model)
-            
+        model_strengths = _model_strengths_cached(str(storage.data_dir), signature)
+        
+        for model, strengths in model_strengths.items():
             st.markdown(f"**{model}:**")
-            for i, (category, score) in enumerate(strengths[:3], 1):
+            for i, (category, score) in enumerate(strengths, 1):
                 st.markdown(f"  {i}. {category.title()}: {score:.1%}")
             st.markdown("")
     
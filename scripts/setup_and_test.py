@@ -1,5 +1,6 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to path
@@ -7,17 +8,56 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
-def check_file_exists(filepath: str) -> bool:
+def scan_parents(paths) -> dict:
+    """
+    List the parent directories of `paths` with one scandir each.
+    
+    Returns:
+        Dictionary mapping each entry's path to whether it is a directory
+    """
+    entries = {}
+    
+    for parent in sorted({os.path.dirname(p) or "." for p in paths}):
+        try:
+            with os.scandir(parent) as it:
+                for entry in it:
+                    entries[os.path.normpath(os.path.join(parent, entry.name))] = entry.is_dir()
+        except OSError:
+            # Missing parent, so everything in it is missing too
+            continue
+    
+    return entries
+
+
+def smoke_test_api(label: str, class_name: str):
+    """
+    Send one short prompt through a model class from src.models.
+    
+    Returns:
+        Tuple of (model or None if it failed, status line to print)
+    """
+    try:
+        import src.models
+        model = getattr(src.models, class_name)()
+        response = model.query("Say 'hello' and nothing else.")
+        if response.success:
+            return model, f"   {label} API working (latency: {response.latency_ms}ms)"
+        return None, f"   {label} API error: {response.error}"
+    except Exception as e:
+        return None, f"   {label} API error: {e}"
+
+
+def check_file_exists(filepath: str, entries: dict) -> bool:
     """Check if a file exists and print status."""
-    exists = os.path.exists(filepath)
+    exists = os.path.normpath(filepath) in entries
     status = "" if exists else ""
     print(f"  {status} {filepath}")
     return exists
 
 
-def check_directory_exists(dirpath: str) -> bool:
+def check_directory_exists(dirpath: str, entries: dict) -> bool:
     """Check if a directory exists and print status."""
-    exists = os.path.isdir(dirpath)
+    exists = entries.get(os.path.normpath(dirpath), False)
     status = "" if exists else ""
     print(f"  {status} {dirpath}/")
     return exists
@@ -52,10 +92,6 @@ def main():
         "src/runner.py",
     ]
     
-    for f in required_files:
-        if not check_file_exists(f):
-            all_good = False
-    
     required_dirs = [
         "data/raw",
         "data/processed",
@@ -64,8 +100,15 @@ def main():
         "scripts",
     ]
     
+    # A handful of directory listings instead of one stat per path
+    entries = scan_parents(required_files + required_dirs)
+    
+    for f in required_files:
+        if not check_file_exists(f, entries):
+            all_good = False
+    
     for d in required_dirs:
-        if not check_directory_exists(d):
+        if not check_directory_exists(d, entries):
             all_good = False
     
     if not all_good:
@@ -137,33 +180,23 @@ def main():
     # Step 4: Test API connections
     print("\n4⃣  Testing API connections...")
     
-    models_working = []
-    
+    # Both checks are one network round-trip each, so run them side by side
+    checks = []
     if has_openai:
-        try:
-            from src.models import OpenAIModel
-            model = OpenAIModel()
-            response = model.query("Say 'hello' and nothing else.")
-            if response.success:
-                print(f"   OpenAI API working (latency: {response.latency_ms}ms)")
-                models_working.append(model)
-            else:
-                print(f"   OpenAI API error: {response.error}")
-        except Exception as e:
-            print(f"   OpenAI API error: {e}")
-    
+        checks.append(("OpenAI", "OpenAIModel"))
     if has_anthropic:
-        try:
-            from src.models import AnthropicModel
-            model = AnthropicModel()
-            response = model.query("Say 'hello' and nothing else.")
-            if response.success:
-                print(f"   Anthropic API working (latency: {response.latency_ms}ms)")
+        checks.append(("Anthropic", "AnthropicModel"))
+    
+    models_working = []
+    
+    if checks:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            results = list(executor.map(lambda check: smoke_test_api(*check), checks))
+        
+        for model, message in results:
+            print(message)
+            if model is not None:
                 models_working.append(model)
-            else:
-                print(f"   Anthropic API error: {response.error}")
-        except Exception as e:
-            print(f"   Anthropic API error: {e}")
     
     if not models_working:
         print("\n No working API connections!")
@@ -202,7 +235,7 @@ def main():
     loaded_run = storage.load_run(run.run_id)
     if loaded_run:
         print(f"   Results saved and loaded successfully")
-        print(f"     File: data/raw/run_{run.run_id}.json")
+        print(f"     File: data/raw/run_{run.run_id}.jsonl")
     else:
         print("   Could not load saved results")
         all_good = False
@@ -7,6 +7,7 @@ from .baseline import (
 
 from .drift_detection import (
     detect_drift,
+    detect_drift_all,
     DriftResult,
     compare_periods,
     print_drift_report,
@@ -14,6 +15,7 @@ from .drift_detection import (
 
 from .statistics import (
     calculate_statistics,
+    grouped_statistics,
     welch_ttest,
     cohens_d,
 )
@@ -24,10 +26,12 @@ __all__ = [
     "get_all_baselines",
     "print_baseline_report",
     "detect_drift",
+    "detect_drift_all",
     "DriftResult",
     "compare_periods",
     "print_drift_report",
     "calculate_statistics",
+    "grouped_statistics",
     "welch_ttest",
     "cohens_d",
 ]
\ No newline at end of file
@@ -1,12 +1,15 @@
+import sys
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from datetime import datetime
 
-from ..storage import ResultsStorage, TestRun
-from .statistics import calculate_statistics, Statistics
+import numpy as np
 
+from ..storage import ResultArrays, ResultsStorage, TestRun
+from .statistics import calculate_statistics, grouped_statistics, Statistics
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class BaselineMetrics:
     """
     Baseline performance metrics for a model.
@@ -64,8 +67,9 @@ def calculate_baseline(
     model_name: str,
     start_date: str = None,
     end_date: str = None,
-    num_runs: int = 7
-) -> BaselineMetrics:
+    num_runs: int = 7,
+    return_raw: bool = False
+):
     """
     Calculate baseline metrics for a model.
     
@@ -75,64 +79,100 @@ def calculate_baseline(
         start_date: Optional start date (YYYY-MM-DD)
         end_date: Optional end date (YYYY-MM-DD)
         num_runs: If dates not specified, use first N runs
+        return_raw: Also return the baseline scores the stats were built from
     
     Returns:
-        BaselineMetrics with all statistics
+        BaselineMetrics with all statistics, or a tuple of
+        (BaselineMetrics, scores array) if return_raw is set
     
     Example:
         storage = ResultsStorage()
         baseline = calculate_baseline(storage, "GPT-4 Turbo", num_runs=7)
         print(f"Baseline score: {baseline.overall_stats.mean:.1%}")
     """
-    if start_date and end_date:
-        runs = storage.load_runs_since(start_date)
-        runs = [r for r in runs if r.timestamp[:10] <= end_date]
-    else:
-        all_runs = storage.load_all_runs()
-        runs = []
-        for run in all_runs:
-            if model_name in run.models_tested:
-                runs.append(run)
-                if len(runs) >= num_runs:
-                    break
-    
-    if not runs:
-        raise ValueError("No runs found for baseline calculation")
-    
-    all_results = []
-    for run in runs:
-        model_results = [r for r in run.results if r.model_name == model_name]
-        all_results.extend(model_results)
-    
-    if not all_results:
+    table = storage.as_table()
+    
+    # Memoized on the table, so repeat calls are free until a run is added
+    key = ("baseline", model_name, start_date, end_date, num_runs)
+    cached = table.memo.get(key)
+    
+    if cached is None:
+        if start_date and end_date:
+            runs = table.runs_between(start_date, end_date)
+        else:
+            runs = table.runs_with_model(model_name)[:num_runs]
+        
+        if not runs.size:
+            raise ValueError("No runs found for baseline calculation")
+        
+        rows = np.flatnonzero(table.model_mask(model_name) & np.isin(table.run_idx, runs))
+        cached = table.memo[key] = _memo_entry(table, model_name, runs, rows)
+    
+    baseline, scores = cached
+    if return_raw:
+        return baseline, scores
+    return baseline
+
+
+def _memo_entry(
+    table: ResultArrays,
+    model_name: str,
+    runs: np.ndarray,
+    rows: np.ndarray
+) -> Tuple[BaselineMetrics, np.ndarray]:
+    """(baseline, raw scores) for the memo; the shared scores are read-only."""
+    baseline = _baseline_from_rows(table, model_name, runs, rows)
+    scores = table.score[rows]
+    scores.flags.writeable = False
+    return baseline, scores
+
+
+def _baseline_from_rows(
+    table: ResultArrays,
+    model_name: str,
+    runs: np.ndarray,
+    rows: np.ndarray
+) -> BaselineMetrics:
+    """
+    Build BaselineMetrics from already selected results.
+    
+    Args:
+        table: The storage's result arrays
+        model_name: Model the rows belong to
+        runs: Indexes of the baseline runs, oldest first
+        rows: Indexes of the model's results in those runs
+    """
+    if not rows.size:
         raise ValueError(f"No results found for model: {model_name}")
     
-    all_scores = [r.score for r in all_results]
+    all_scores = table.score[rows]
     overall_stats = calculate_statistics(all_scores)
     
-    by_category = {}
-    categories = set(r.category for r in all_results if r.category)
-    for category in categories:
-        cat_results = [r for r in all_results if r.category == category]
-        cat_scores = [r.score for r in cat_results]
-        if cat_scores:
-            by_category[category] = calculate_statistics(cat_scores)
-    
-    by_test = {}
-    test_ids = set(r.test_id for r in all_results)
-    for test_id in test_ids:
-        test_results = [r for r in all_results if r.test_id == test_id]
-        test_scores = [r.score for r in test_results]
-        if test_scores:
-            by_test[test_id] = calculate_statistics(test_scores)
-    
-    latencies = [r.latency_ms for r in all_results if r.success]
-    latency_stats = calculate_statistics(latencies) if latencies else None
+    # One grouped pass per breakdown instead of re-filtering per group
+    category_codes = table.category_code[rows]
+    categorized = np.array([bool(c) for c in table.categories])[category_codes]
+    by_category = {
+        table.categories[code]: stats
+        for code, stats in grouped_statistics(
+            all_scores[categorized],
+            category_codes[categorized]
+        ).items()
+    }
+    
+    by_test = {
+        table.test_ids[code]: stats
+        for code, stats in grouped_statistics(all_scores, table.test_code[rows]).items()
+    }
+    
+    # Successful calls with a measured latency (Batch API results have none)
+    latencies = table.latency_ms[rows[table.success[rows]]]
+    latencies = latencies[~np.isnan(latencies)]
+    latency_stats = calculate_statistics(latencies) if latencies.size else None
     
     return BaselineMetrics(
         model_name=model_name,
-        start_date=runs[0].timestamp[:10],
-        end_date=runs[-1].timestamp[:10],
+        start_date=table.run_timestamps[runs[0]][:10],
+        end_date=table.run_timestamps[runs[-1]][:10],
         num_runs=len(runs),
         overall_stats=overall_stats,
         by_category=by_category,
@@ -155,20 +195,49 @@ def get_all_baselines(
     Returns:
         Dictionary mapping model names to BaselineMetrics
     """
-    runs = storage.load_all_runs()
+    table = storage.as_table()
     
-    if not runs:
+    if not table.num_runs:
         raise ValueError("No runs found")
     
     model_names = set()
-    for run in runs:
-        model_names.update(run.models_tested)
+    for models_tested in table.run_models:
+        model_names.update(models_tested)
+    
+    # Mark each model's baseline runs, then pick out every model's baseline
+    # results in one gather instead of masking the whole table per model
+    baseline_runs = {}
+    in_baseline = np.zeros((len(table.models), table.num_runs), dtype=bool)
+    for model_name in model_names:
+        runs = table.runs_with_model(model_name)[:num_runs]
+        baseline_runs[model_name] = runs
+        in_baseline[table.model_codes[model_name], runs] = True
+    
+    rows = np.flatnonzero(in_baseline[table.model_code, table.run_idx])
+    
+    # Group the rows by model, keeping run/result order within each model
+    rows = rows[np.argsort(table.model_code[rows], kind="stable")]
+    bounds = np.searchsorted(table.model_code[rows], np.arange(len(table.models) + 1))
     
     baselines = {}
     for model_name in model_names:
         try:
-            baseline = calculate_baseline(storage, model_name, num_runs=num_runs)
-            baselines[model_name] = baseline
+            runs = baseline_runs[model_name]
+            if not runs.size:
+                raise ValueError("No runs found for baseline calculation")
+            
+            # Same key as calculate_baseline, so later calls reuse this
+            key = ("baseline", model_name, None, None, num_runs)
+            cached = table.memo.get(key)
+            if cached is None:
+                code = table.model_codes[model_name]
+                cached = table.memo[key] = _memo_entry(
+                    table,
+                    model_name,
+                    runs,
+                    rows[bounds[code]:bounds[code + 1]]
+                )
+            baselines[model_name] = cached[0]
         except Exception as e:
             print(f"Warning: Could not calculate baseline for {model_name}: {e}")
     
@@ -182,31 +251,35 @@ def print_baseline_report(baseline: BaselineMetrics):
     Args:
         baseline: BaselineMetrics to display
     """
-    print(f"\n{'='*60}")
-    print(f"BASELINE REPORT: {baseline.model_name}")
-    print(f"{'='*60}")
-    print(f"Period: {baseline.start_date} to {baseline.end_date}")
-    print(f"Runs: {baseline.num_runs}")
-    print()
-    
-    print("Overall Performance:")
+    lines = []
+    lines.append(f"\n{'='*60}")
+    lines.append(f"BASELINE REPORT: {baseline.model_name}")
+    lines.append(f"{'='*60}")
+    lines.append(f"Period: {baseline.start_date} to {baseline.end_date}")
+    lines.append(f"Runs: {baseline.num_runs}")
+    lines.append("")
+    
+    lines.append("Overall Performance:")
     stats = baseline.overall_stats
     ci_lower, ci_upper = stats.confidence_interval_95
-    print(f"  Mean score: {stats.mean:.1%}")
-    print(f"  Std dev: {stats.std:.3f}")
-    print(f"  95% CI: [{ci_lower:.1%}, {ci_upper:.1%}]")
-    print(f"  Range: [{stats.min:.1%}, {stats.max:.1%}]")
-    print()
+    lines.append(f"  Mean score: {stats.mean:.1%}")
+    lines.append(f"  Std dev: {stats.std:.3f}")
+    lines.append(f"  95% CI: [{ci_lower:.1%}, {ci_upper:.1%}]")
+    lines.append(f"  Range: [{stats.min:.1%}, {stats.max:.1%}]")
+    lines.append("")
     
-    print("By Category:")
+    lines.append("By Category:")
     for category, cat_stats in sorted(baseline.by_category.items()):
-        print(f"  {category:15s}: {cat_stats.mean:.1%} ± {cat_stats.std:.3f}")
-    print()
+        lines.append(f"  {category:15s}: {cat_stats.mean:.1%} ± {cat_stats.std:.3f}")
+    lines.append("")
     
     if baseline.latency_stats:
-        print("Performance:")
-        print(f"  Avg latency: {baseline.latency_stats.mean:.0f}ms")
-        print(f"  Latency std: {baseline.latency_stats.std:.0f}ms")
+        lines.append("Performance:")
+        lines.append(f"  Avg latency: {baseline.latency_stats.mean:.0f}ms")
+        lines.append(f"  Latency std: {baseline.latency_stats.std:.0f}ms")
+    
+    # One write for the whole report instead of one per line
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # Test the baseline calculation
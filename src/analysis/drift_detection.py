@@ -1,10 +1,16 @@
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Union
 from enum import Enum
 
-from ..storage import ResultsStorage, TestRun
+import numpy as np
+
+from ..storage import ResultArrays, ResultsStorage, TestRun
 from .baseline import BaselineMetrics, calculate_baseline
 from .statistics import (
+    _cohens_d_from_moments,
+    _describe_groups,
+    _welch_from_moments,
     calculate_statistics,
     welch_ttest,
     cohens_d,
@@ -22,7 +28,26 @@ class DriftSeverity(Enum):
     MAJOR = "major"         # Significant with large effect
 
 
-@dataclass
+# |Cohen's d| cut-offs between minor/moderate and moderate/major drift
+_SEVERITY_THRESHOLDS = np.array([0.5, 0.8])
+_SEVERITIES = (DriftSeverity.MINOR, DriftSeverity.MODERATE, DriftSeverity.MAJOR)
+
+# Set on results whose two windows include runs with different output caps
+TOKEN_CAP_WARNING = (
+    "Compared runs used different max_tokens caps, so token counts, latency "
+    "and truncated answers can change without the model drifting."
+)
+
+
+def _severity(is_significant: bool, abs_effect: float) -> DriftSeverity:
+    """Drift severity from significance and effect size magnitude."""
+    if not is_significant:
+        return DriftSeverity.NONE
+    # side="right": an effect of exactly 0.5 or 0.8 moves up a level
+    return _SEVERITIES[int(np.searchsorted(_SEVERITY_THRESHOLDS, abs_effect, side="right"))]
+
+
+@dataclass(slots=True, frozen=True)
 class DriftResult:
     """
     Result of drift detection analysis.
@@ -52,6 +77,9 @@ class DriftResult:
     # Human-readable summary
     summary: str = ""
     
+    # Why the comparison may not be like for like (e.g. TOKEN_CAP_WARNING)
+    warning: Optional[str] = None
+    
     def __repr__(self) -> str:
         status = " DRIFT" if self.drift_detected else " STABLE"
         return (
@@ -73,7 +101,9 @@ class DriftResult:
             "change_percent": self.change_percent,
             "p_value": self.p_value,
             "cohens_d": self.cohens_d,
+            "category_drift": self.category_drift,
             "summary": self.summary,
+            "warning": self.warning,
         }
 
 
@@ -106,37 +136,30 @@ def detect_drift(
         else:
             print(" No significant drift")
     """
-    all_runs = storage.load_all_runs()
+    table = storage.as_table()
     
-    if len(all_runs) < baseline_runs + current_runs:
+    if table.num_runs < baseline_runs + current_runs:
         raise ValueError(
             f"Need at least {baseline_runs + current_runs} runs "
             f"({baseline_runs} baseline + {current_runs} current). "
-            f"Only have {len(all_runs)}."
+            f"Only have {table.num_runs}."
         )
     
-    baseline = calculate_baseline(storage, model_name, num_runs=baseline_runs)
+    # Reuse the scores the baseline was built from
+    baseline, baseline_scores = calculate_baseline(
+        storage,
+        model_name,
+        num_runs=baseline_runs,
+        return_raw=True
+    )
     
-    current_runs_data = all_runs[-current_runs:]
-    current_results = []
-    for run in current_runs_data:
-        model_results = [r for r in run.results if r.model_name == model_name]
-        current_results.extend(model_results)
+    model_mask = table.model_mask(model_name)
+    first_current = table.num_runs - current_runs
+    current_rows = np.flatnonzero(model_mask & (table.run_idx >= first_current))
+    current_scores = table.score[current_rows]
     
-    if not current_results:
+    if not current_scores.size:
         raise ValueError(f"No current results found for {model_name}")
-    
-    baseline_scores = []
-    baseline_run_count = 0
-    for run in all_runs:
-        if model_name in run.models_tested:
-            model_results = [r for r in run.results if r.model_name == model_name]
-            baseline_scores.extend([r.score for r in model_results])
-            baseline_run_count += 1
-            if baseline_run_count >= baseline_runs:
-                break
-
-    current_scores = [r.score for r in current_results]
 
     # Ensure we have enough data
     if len(baseline_scores) < 2 or len(current_scores) < 2:
@@ -147,24 +170,123 @@ def detect_drift(
     t_stat, p_value = welch_ttest(baseline_scores, current_scores)
     effect_size = cohens_d(baseline_scores, current_scores)
     
-    is_significant = p_value < significance_level
+    # The baseline's rows (same selection as calculate_baseline), for the
+    # per-category tests
+    baseline_run_idx = table.runs_with_model(model_name)[:baseline_runs]
+    baseline_rows = np.flatnonzero(model_mask & np.isin(table.run_idx, baseline_run_idx))
+    current_run_idx = np.arange(first_current, table.num_runs)
     
-    abs_effect = abs(effect_size)
-    if not is_significant:
-        severity = DriftSeverity.NONE
-    elif abs_effect < 0.5:
-        severity = DriftSeverity.MINOR
-    elif abs_effect < 0.8:
-        severity = DriftSeverity.MODERATE
-    else:
-        severity = DriftSeverity.MAJOR
+    # Test period description
+    test_period = f"{table.run_timestamps[first_current][:10]} to {table.run_timestamps[-1][:10]}"
+    
+    return _drift_result(
+        model_name,
+        test_period,
+        baseline.overall_stats.mean,
+        current_stats.mean,
+        p_value,
+        effect_size,
+        significance_level,
+        _category_drift(table, baseline_rows, current_rows, significance_level),
+        TOKEN_CAP_WARNING if table.mixed_token_caps(baseline_run_idx, current_run_idx) else None,
+    )
+
+
+def _category_pvalues(
+    scores: np.ndarray,
+    category_codes: np.ndarray,
+    groups: np.ndarray,
+    num_models: int,
+    num_categories: int
+):
+    """
+    Welch p-values for every (model, category) pair in one pass.
     
-    drift_detected = severity != DriftSeverity.NONE
+    Args:
+        scores: Scores from both windows
+        category_codes: Category code of each score
+        groups: Model index m for a baseline score, num_models + m for a
+            current score
+        num_models: Number of models being compared
+        num_categories: Number of category codes
     
-    change_percent = (
-        (current_stats.mean - baseline.overall_stats.mean) / 
-        baseline.overall_stats.mean * 100
+    Returns:
+        (p_values, testable): arrays of shape (num_models, num_categories).
+        testable marks pairs with at least 2 scores in each window.
+    """
+    keys = groups * num_categories + category_codes
+    order = np.argsort(keys, kind="stable")
+    offsets = np.searchsorted(keys[order], np.arange(2 * num_models * num_categories + 1))
+    
+    means, variances, _, _, counts = _describe_groups(scores[order], offsets)
+    
+    # Axis 0 is the window: baseline, then current
+    shape = (2, num_models, num_categories)
+    means = means.reshape(shape)
+    variances = variances.reshape(shape)
+    counts = counts.reshape(shape)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _, p_values = _welch_from_moments(
+            means[0], variances[0], counts[0],
+            means[1], variances[1], counts[1]
+        )
+    
+    return p_values, (counts[0] >= 2) & (counts[1] >= 2)
+
+
+def _category_drift_dict(
+    table: ResultArrays,
+    p_values: np.ndarray,
+    testable: np.ndarray,
+    significance_level: float
+) -> Dict[str, bool]:
+    """Category -> significant change, for one model's row of p-values."""
+    return {
+        table.categories[code]: bool(p_values[code] < significance_level)
+        for code in np.flatnonzero(testable)
+        if table.categories[code]
+    }
+
+
+def _category_drift(
+    table: ResultArrays,
+    baseline_rows: np.ndarray,
+    current_rows: np.ndarray,
+    significance_level: float
+) -> Dict[str, bool]:
+    """Whether each category changed significantly between two sets of rows."""
+    rows = np.concatenate((baseline_rows, current_rows))
+    groups = np.repeat([0, 1], [len(baseline_rows), len(current_rows)])
+    
+    p_values, testable = _category_pvalues(
+        table.score[rows],
+        table.category_code[rows],
+        groups,
+        1,
+        len(table.categories)
     )
+    return _category_drift_dict(table, p_values[0], testable[0], significance_level)
+
+
+def _drift_result(
+    model_name: str,
+    test_period: str,
+    baseline_mean: float,
+    current_mean: float,
+    p_value: float,
+    effect_size: float,
+    significance_level: float,
+    category_drift: Optional[Dict[str, bool]] = None,
+    warning: Optional[str] = None
+) -> DriftResult:
+    """DriftResult for a baseline vs current comparison, with its summary."""
+    is_significant = p_value < significance_level
+    severity = _severity(is_significant, abs(effect_size))
+    
+    drift_detected = severity != DriftSeverity.NONE
+    
+    change_percent = (current_mean - baseline_mean) / baseline_mean * 100
     
     # Generate summary
     direction = "improved" if change_percent > 0 else "degraded"
@@ -177,27 +299,169 @@ def detect_drift(
     else:
         summary = (
             f"No significant drift detected. "
-            f"Performance is stable at {current_stats.mean:.1%} "
+            f"Performance is stable at {current_mean:.1%} "
             f"({interpret_pvalue(p_value)})."
         )
     
-    # Test period description
-    test_period = f"{current_runs_data[0].timestamp[:10]} to {current_runs_data[-1].timestamp[:10]}"
-    
     return DriftResult(
         model_name=model_name,
         test_period=test_period,
         drift_detected=drift_detected,
         severity=severity,
-        baseline_mean=baseline.overall_stats.mean,
-        current_mean=current_stats.mean,
+        baseline_mean=baseline_mean,
+        current_mean=current_mean,
         change_percent=change_percent,
         p_value=p_value,
         cohens_d=effect_size,
+        category_drift=category_drift,
         summary=summary,
+        warning=warning,
     )
 
 
+def detect_drift_all(
+    storage: ResultsStorage,
+    model_names: Optional[Iterable[str]] = None,
+    baseline_runs: int = 7,
+    current_runs: int = 3,
+    significance_level: float = 0.05
+) -> Dict[str, Union[DriftResult, Exception]]:
+    """
+    Run detect_drift() for many models at once.
+    
+    Every model's baseline and current scores are selected in one pass
+    over the results table and their statistics computed together, instead
+    of scanning the table again per model. Results are the same as calling
+    detect_drift() for each model.
+    
+    Args:
+        storage: ResultsStorage instance
+        model_names: Models to analyze (default: every model in storage)
+        baseline_runs: Number of runs to use for baseline (default: first 7)
+        current_runs: Number of recent runs to test (default: last 3)
+        significance_level: p-value threshold for significance (default: 0.05)
+    
+    Returns:
+        Dictionary mapping each model name to its DriftResult, or to the
+        exception analyzing it raised (the ValueError detect_drift() would
+        raise when its data is insufficient)
+    
+    Example:
+        for model, result in detect_drift_all(storage).items():
+            if isinstance(result, Exception):
+                print(f"Error analyzing {model}: {result}")
+            else:
+                print_drift_report(result)
+    """
+    table = storage.as_table()
+    
+    if table.num_runs < baseline_runs + current_runs:
+        raise ValueError(
+            f"Need at least {baseline_runs + current_runs} runs "
+            f"({baseline_runs} baseline + {current_runs} current). "
+            f"Only have {table.num_runs}."
+        )
+    
+    if model_names is None:
+        model_names = set()
+        for models_tested in table.run_models:
+            model_names.update(models_tested)
+    model_names = list(model_names)
+    
+    # (model code, run) cells in each window: a model's first runs for the
+    # baseline, the last runs overall for the current period
+    num_models = len(table.models)
+    first_current = table.num_runs - current_runs
+    in_baseline = np.zeros((num_models, table.num_runs), dtype=bool)
+    current_run_idx = np.arange(first_current, table.num_runs)
+    has_baseline_runs = {}
+    mixed_caps = {}
+    for model_name in model_names:
+        runs = table.runs_with_model(model_name)[:baseline_runs]
+        has_baseline_runs[model_name] = runs.size > 0
+        mixed_caps[model_name] = table.mixed_token_caps(runs, current_run_idx)
+        if model_name in table.model_codes:
+            in_baseline[table.model_codes[model_name], runs] = True
+    
+    # Group g < num_models holds model g's baseline scores, group
+    # num_models + g its current scores (a run can be in both windows);
+    # offsets delimit the groups
+    group = np.concatenate((
+        np.where(in_baseline[table.model_code, table.run_idx], table.model_code, -1),
+        np.where(table.run_idx >= first_current, num_models + table.model_code, -1),
+    ))
+    rows = np.flatnonzero(group >= 0)
+    rows = rows[np.argsort(group[rows], kind="stable")]
+    offsets = np.searchsorted(group[rows], np.arange(2 * num_models + 1))
+    
+    scores = np.tile(table.score, 2)[rows]
+    means, variances, _, _, counts = _describe_groups(scores, offsets)
+    
+    # Per-category tests for every model, also in one pass
+    category_p_values, category_testable = _category_pvalues(
+        scores,
+        np.tile(table.category_code, 2)[rows],
+        group[rows],
+        num_models,
+        len(table.categories)
+    )
+    
+    # Every model's tests in one vectorized call
+    base = slice(0, num_models)
+    cur = slice(num_models, 2 * num_models)
+    moments = (
+        means[base], variances[base], counts[base],
+        means[cur], variances[cur], counts[cur],
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _, p_values = _welch_from_moments(*moments)
+        effect_sizes = _cohens_d_from_moments(*moments)
+    
+    test_period = f"{table.run_timestamps[first_current][:10]} to {table.run_timestamps[-1][:10]}"
+    
+    results = {}
+    for model_name in model_names:
+        code = table.model_codes.get(model_name)
+        n_baseline = counts[code] if code is not None else 0
+        n_current = counts[num_models + code] if code is not None else 0
+        
+        # Same checks, in the same order, as detect_drift()
+        if not has_baseline_runs[model_name]:
+            results[model_name] = ValueError("No runs found for baseline calculation")
+        elif not n_baseline:
+            results[model_name] = ValueError(f"No results found for model: {model_name}")
+        elif not n_current:
+            results[model_name] = ValueError(f"No current results found for {model_name}")
+        elif n_baseline < 2 or n_current < 2:
+            results[model_name] = ValueError(
+                f"Need at least 2 samples in each group. "
+                f"Baseline: {n_baseline}, Current: {n_current}"
+            )
+        else:
+            # One model failing must not lose the others' results
+            try:
+                results[model_name] = _drift_result(
+                    model_name,
+                    test_period,
+                    float(means[code]),
+                    float(means[num_models + code]),
+                    float(p_values[code]),
+                    float(effect_sizes[code]),
+                    significance_level,
+                    _category_drift_dict(
+                        table,
+                        category_p_values[code],
+                        category_testable[code],
+                        significance_level
+                    ),
+                    TOKEN_CAP_WARNING if mixed_caps[model_name] else None,
+                )
+            except Exception as e:
+                results[model_name] = e
+    
+    return results
+
+
 def compare_periods(
     storage: ResultsStorage,
     model_name: str,
@@ -230,31 +494,21 @@ def compare_periods(
             "2024-12-01", "2024-12-07"   # Week 2
         )
     """
-    all_runs = storage.load_all_runs()
-    
-    period1_runs = [
-        r for r in all_runs
-        if period1_start <= r.timestamp[:10] <= period1_end
-    ]
-    period2_runs = [
-        r for r in all_runs
-        if period2_start <= r.timestamp[:10] <= period2_end
-    ]
-    
-    if not period1_runs or not period2_runs:
-        raise ValueError("No runs found in one or both periods")
+    table = storage.as_table()
+    
+    period1_runs = table.runs_between(period1_start, period1_end)
+    period2_runs = table.runs_between(period2_start, period2_end)
     
-    period1_scores = []
-    for run in period1_runs:
-        results = [r for r in run.results if r.model_name == model_name]
-        period1_scores.extend([r.score for r in results])
+    if not period1_runs.size or not period2_runs.size:
+        raise ValueError("No runs found in one or both periods")
     
-    period2_scores = []
-    for run in period2_runs:
-        results = [r for r in run.results if r.model_name == model_name]
-        period2_scores.extend([r.score for r in results])
+    model_mask = table.model_mask(model_name)
+    period1_rows = np.flatnonzero(model_mask & np.isin(table.run_idx, period1_runs))
+    period2_rows = np.flatnonzero(model_mask & np.isin(table.run_idx, period2_runs))
+    period1_scores = table.score[period1_rows]
+    period2_scores = table.score[period2_rows]
     
-    if not period1_scores or not period2_scores:
+    if not period1_scores.size or not period2_scores.size:
         raise ValueError(f"No results found for {model_name}")
     
     period1_stats = calculate_statistics(period1_scores)
@@ -265,16 +519,7 @@ def compare_periods(
     effect_size = cohens_d(period1_scores, period2_scores)
     
     is_significant = p_value < 0.05
-    abs_effect = abs(effect_size)
-    
-    if not is_significant:
-        severity = DriftSeverity.NONE
-    elif abs_effect < 0.5:
-        severity = DriftSeverity.MINOR
-    elif abs_effect < 0.8:
-        severity = DriftSeverity.MODERATE
-    else:
-        severity = DriftSeverity.MAJOR
+    severity = _severity(is_significant, abs(effect_size))
     
     drift_detected = severity != DriftSeverity.NONE
     
@@ -305,7 +550,9 @@ def compare_periods(
         change_percent=change_percent,
         p_value=p_value,
         cohens_d=effect_size,
+        category_drift=_category_drift(table, period1_rows, period2_rows, 0.05),
         summary=summary,
+        warning=TOKEN_CAP_WARNING if table.mixed_token_caps(period1_runs, period2_runs) else None,
     )
 
 
@@ -316,11 +563,12 @@ def print_drift_report(result: DriftResult):
     Args:
         result: DriftResult to display
     """
-    print(f"\n{'='*60}")
-    print(f"DRIFT DETECTION REPORT: {result.model_name}")
-    print(f"{'='*60}")
-    print(f"Period: {result.test_period}")
-    print()
+    lines = []
+    lines.append(f"\n{'='*60}")
+    lines.append(f"DRIFT DETECTION REPORT: {result.model_name}")
+    lines.append(f"{'='*60}")
+    lines.append(f"Period: {result.test_period}")
+    lines.append("")
     
     # Status
     if result.drift_detected:
@@ -330,62 +578,69 @@ def print_drift_report(result: DriftResult):
         icon = ""
         status = "NO DRIFT DETECTED"
     
-    print(f"{icon} {status}")
-    print()
+    lines.append(f"{icon} {status}")
+    lines.append("")
     
     # Performance change
-    print("Performance Change:")
-    print(f"  Baseline: {result.baseline_mean:.1%}")
-    print(f"  Current:  {result.current_mean:.1%}")
-    print(f"  Change:   {result.change_percent:+.1f}%")
-    print()
+    lines.append("Performance Change:")
+    lines.append(f"  Baseline: {result.baseline_mean:.1%}")
+    lines.append(f"  Current:  {result.current_mean:.1%}")
+    lines.append(f"  Change:   {result.change_percent:+.1f}%")
+    lines.append("")
     
     # Statistical evidence
-    print("Statistical Evidence:")
-    print(f"  p-value:   {result.p_value:.4f} ({interpret_pvalue(result.p_value)})")
-    print(f"  Cohen's d: {result.cohens_d:.3f} ({interpret_cohens_d(result.cohens_d)})")
-    print()
+    lines.append("Statistical Evidence:")
+    lines.append(f"  p-value:   {result.p_value:.4f} ({interpret_pvalue(result.p_value)})")
+    lines.append(f"  Cohen's d: {result.cohens_d:.3f} ({interpret_cohens_d(result.cohens_d)})")
+    lines.append("")
     
     # Summary
-    print("Summary:")
-    print(f"  {result.summary}")
-    print()
+    lines.append("Summary:")
+    lines.append(f"  {result.summary}")
+    lines.append("")
+    
+    if result.warning:
+        lines.append(f"  Warning: {result.warning}")
+        lines.append("")
     
     # Recommendation
     if result.severity == DriftSeverity.MAJOR:
-        print("  RECOMMENDATION: Investigate immediately. Major performance change.")
+        lines.append("  RECOMMENDATION: Investigate immediately. Major performance change.")
     elif result.severity == DriftSeverity.MODERATE:
-        print("  RECOMMENDATION: Monitor closely. Notable performance change.")
+        lines.append("  RECOMMENDATION: Monitor closely. Notable performance change.")
     elif result.severity == DriftSeverity.MINOR:
-        print("  RECOMMENDATION: Keep monitoring. Minor but significant change.")
+        lines.append("  RECOMMENDATION: Keep monitoring. Minor but significant change.")
     else:
-        print(" RECOMMENDATION: Continue normal monitoring.")
+        lines.append(" RECOMMENDATION: Continue normal monitoring.")
+    
+    # One write for the whole report instead of one per line
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # Command-line tool
 if __name__ == "__main__":
-    import sys
     from ..storage import ResultsStorage
     
     storage = ResultsStorage()
-    runs = storage.load_all_runs()
+    num_runs = storage.as_table().num_runs
     
-    if len(runs) < 10:
-        print(f"  Only {len(runs)} runs available.")
+    if num_runs < 10:
+        print(f"  Only {num_runs} runs available.")
         print("   Need at least 10 runs (7 baseline + 3 current) for drift detection.")
         print("   Keep running daily tests and check back later!")
         sys.exit(0)
     
     print("Running drift detection analysis...")
     
-    model_names = set()
-    for run in runs:
-        model_names.update(run.models_tested)
+    # Detect drift for every model in one pass
+    try:
+        results = detect_drift_all(storage)
+    except Exception as e:
+        print(f"Error analyzing drift: {e}")
+        sys.exit(1)
     
-    # Detect drift for each model
-    for model_name in model_names:
-        try:
-            result = detect_drift(storage, model_name)
-            print_drift_report(result)
-        except Exception as e:
-            print(f"Error analyzing {model_name}: {e}")
\ No newline at end of file
+    for model_name, result in results.items():
+        if isinstance(result, Exception):
+            print(f"Error analyzing {model_name}: {result}")
+        else:
+            print_drift_report(result)
\ No newline at end of file
@@ -1,10 +1,24 @@
 import numpy as np
-from scipy import stats
+from scipy import special
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
 
+# Numba compiles the single-pass describe loop; NumPy reductions otherwise
+try:
+    from numba import njit, prange, types
+except ImportError:
+    njit = None
+    prange = range
 
-@dataclass
+
+# Two-tailed 95% t critical values, indexed by sample size n (df = n - 1).
+# Sizes above 30 use the normal approximation instead
+_T_CRIT_95 = special.stdtrit(np.arange(-1, 30), 0.975)
+_T_CRIT_95[:2] = np.nan  # n = 0 or 1: no degrees of freedom
+
+
+@dataclass(slots=True, frozen=True)
 class Statistics:
     """Container for statistical measurements."""
     mean: float
@@ -22,6 +36,171 @@ class Statistics:
         )
 
 
+def _describe_loop(arr):
+    """
+    Mean, sample variance, min and max in one pass (compiled by Numba).
+    
+    Welford's update keeps the variance accurate without a second pass
+    over the data.
+    """
+    n = arr.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    lowest = arr[0]
+    highest = arr[0]
+    for i in range(n):
+        x = arr[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+        if x < lowest:
+            lowest = x
+        if x > highest:
+            highest = x
+    return mean, m2 / (n - 1), lowest, highest
+
+
+# The kernels are given explicit signatures, so Numba compiles them when
+# this module is imported rather than on the first call, and cache=True
+# saves the machine code under __pycache__ so later runs skip compiling.
+# Each is compiled for writable and read-only (e.g. memoized baseline
+# scores) arrays of any layout; other inputs take the NumPy path.
+# error_model="numpy": a single value gives NaN variance instead of raising
+if njit is not None:
+    _FLOAT_ARRAYS = [
+        types.Array(types.float64, 1, layout, readonly=readonly)
+        for layout in ("C", "A")
+        for readonly in (False, True)
+    ]
+    _INDEX_ARRAY = types.Array(types.intp, 1, "A")
+else:
+    _FLOAT_ARRAYS = []
+
+_describe_kernel = (
+    njit([(arr,) for arr in _FLOAT_ARRAYS], cache=True, error_model="numpy")(_describe_loop)
+    if njit is not None else None
+)
+
+
+def _describe(arr: np.ndarray) -> Tuple[np.float64, np.float64, np.float64, np.float64, int]:
+    """
+    Mean, sample variance (ddof=1), min, max and size of a non-empty float64 array.
+    
+    Used by calculate_statistics, welch_ttest and cohens_d, which drift
+    detection and baselines call for every model, category and period.
+    """
+    if _describe_kernel is not None:
+        try:
+            mean, variance, lowest, highest = _describe_kernel(arr)
+        except TypeError:
+            pass  # no compiled signature for these array flags
+        else:
+            return (
+                np.float64(mean),
+                np.float64(variance),
+                np.float64(lowest),
+                np.float64(highest),
+                arr.size,
+            )
+    return arr.mean(), arr.var(ddof=1), arr.min(), arr.max(), arr.size
+
+
+def _describe_groups_loop(values, offsets):
+    """
+    Mean, sample variance, min and max of each values[offsets[g]:offsets[g + 1]].
+    
+    Compiled with parallel=True, so groups run on separate threads;
+    empty groups are left as NaN.
+    """
+    k = offsets.shape[0] - 1
+    means = np.full(k, np.nan)
+    variances = np.full(k, np.nan)
+    mins = np.full(k, np.nan)
+    maxs = np.full(k, np.nan)
+    for g in prange(k):
+        if offsets[g + 1] > offsets[g]:
+            mean, variance, lowest, highest = _describe_kernel(values[offsets[g]:offsets[g + 1]])
+            means[g] = mean
+            variances[g] = variance
+            mins[g] = lowest
+            maxs[g] = highest
+    return means, variances, mins, maxs
+
+
+_describe_groups_kernel = (
+    njit(
+        [(arr, _INDEX_ARRAY) for arr in _FLOAT_ARRAYS],
+        parallel=True,
+        cache=True,
+        error_model="numpy"
+    )(_describe_groups_loop)
+    if njit is not None else None
+)
+
+
+def _describe_groups(values: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Means, sample variances, mins, maxes and sizes of consecutive slices of values.
+    
+    Group g is values[offsets[g]:offsets[g + 1]]. Each group gets exactly
+    the numbers _describe() gives for it on its own.
+    """
+    offsets = offsets.astype(np.intp, copy=False)  # the kernel's signature
+    counts = np.diff(offsets)
+    if _describe_groups_kernel is not None:
+        try:
+            means, variances, mins, maxs = _describe_groups_kernel(values, offsets)
+        except TypeError:
+            pass  # no compiled signature for these array flags
+        else:
+            return means, variances, mins, maxs, counts
+    
+    means, variances, mins, maxs = np.full((4, len(counts)), np.nan)
+    for g in np.flatnonzero(counts):
+        group = values[offsets[g]:offsets[g + 1]]
+        if group.size > 1:
+            means[g], variances[g], mins[g], maxs[g], _ = _describe(group)
+        else:
+            # NaN variance, without NumPy's ddof warning
+            means[g] = mins[g] = maxs[g] = group[0]
+    return means, variances, mins, maxs, counts
+
+
+def _welch_from_moments(mean1, var1, n1, mean2, var2, n2):
+    """
+    Welch's t statistic and two-sided p-value from group moments.
+    
+    Works elementwise, so one call can test many pairs of groups.
+    """
+    vn1 = var1 / n1
+    vn2 = var2 / n2
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_statistic = (mean1 - mean2) / np.sqrt(vn1 + vn2)
+        # Welch-Satterthwaite degrees of freedom. Squares are written as
+        # products: NumPy computes scalar ** 2 with pow() but array ** 2 as
+        # x * x, which can differ in the last bit
+        df = (vn1 + vn2) * (vn1 + vn2) / (vn1 * vn1 / (n1 - 1) + vn2 * vn2 / (n2 - 1))
+    
+    # Both variances zero: df is undefined but irrelevant, as in scipy
+    df = np.where(np.isnan(df), 1.0, df)
+    
+    # Two-sided tail of Student's t CDF. Same value as the textbook
+    # betainc(df / 2, 0.5, df / (df + t**2)), but stdtr is one ufunc call
+    # that is both faster and more accurate for very small p-values
+    p_value = 2 * special.stdtr(df, -np.abs(t_statistic))
+    
+    return t_statistic, p_value
+
+
+def _cohens_d_from_moments(mean1, var1, n1, mean2, var2, n2):
+    """Cohen's d from group moments, elementwise like _welch_from_moments."""
+    # Pooled standard deviation
+    pooled_std = np.sqrt(((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2))
+    
+    return (mean2 - mean1) / pooled_std
+
+
 def calculate_statistics(values: List[float]) -> Statistics:
     """
     Calculate descriptive statistics for a list of values.
@@ -32,21 +211,21 @@ def calculate_statistics(values: List[float]) -> Statistics:
     Returns:
         Statistics object with all measurements
     """
-    if not values:
+    if len(values) == 0:
         raise ValueError("Cannot calculate statistics on empty list")
     
-    arr = np.array(values)
-    mean = float(np.mean(arr))
-    std = float(np.std(arr, ddof=1))  # ddof=1 for sample std
+    mean, variance, lowest, highest, n = _describe(np.asarray(values, dtype=np.float64))
+    mean = float(mean)
+    variance = float(variance)  # ddof=1 for sample variance
+    std = float(np.sqrt(variance))
     
     # CI = mean ± (critical_value * standard_error)
-    n = len(arr)
     if n > 30:
         # Use normal distribution (z-score)
         critical_value = 1.96
     else:
-        # Use t-distribution
-        critical_value = stats.t.ppf(0.975, df=n-1)  # 0.975 for two-tailed 95%
+        # Use t-distribution, from the precomputed table
+        critical_value = _T_CRIT_95[n]
     
     standard_error = std / np.sqrt(n)
     margin_of_error = critical_value * standard_error
@@ -56,14 +235,86 @@ def calculate_statistics(values: List[float]) -> Statistics:
     return Statistics(
         mean=mean,
         std=std,
-        variance=float(np.var(arr, ddof=1)),
-        min=float(np.min(arr)),
-        max=float(np.max(arr)),
+        variance=variance,
+        min=float(lowest),
+        max=float(highest),
         count=n,
         confidence_interval_95=(ci_lower, ci_upper),
     )
 
 
+def grouped_statistics(values: Sequence[float], keys: Sequence[Any]) -> Dict[Any, Statistics]:
+    """
+    Calculate descriptive statistics for each group of values at once.
+    
+    Same numbers as calling calculate_statistics() per group, but the values
+    are sorted into groups once and each group is a slice of one array,
+    instead of filtering the full list again for each group.
+    
+    Args:
+        values: Numeric values (e.g., scores)
+        keys: Group key for each value (e.g., test IDs), same length as values.
+            An integer array (such as the results table's codes) is grouped
+            with np.unique instead of a Python pass over the keys.
+    
+    Returns:
+        Dictionary mapping each key to its Statistics, in first-seen order
+    """
+    if isinstance(keys, np.ndarray) and keys.dtype.kind in "iu":
+        if not keys.size:
+            return {}
+        
+        uniques, first_seen, codes = np.unique(keys, return_index=True, return_inverse=True)
+        
+        # np.unique numbers groups in sorted key order; renumber them in
+        # first-seen order like the dict path below
+        by_first_seen = np.argsort(first_seen)
+        renumber = np.empty_like(by_first_seen)
+        renumber[by_first_seen] = np.arange(len(by_first_seen))
+        codes = renumber[codes]
+        key_codes = dict(zip(uniques[by_first_seen].tolist(), range(len(uniques))))
+    else:
+        # Intern keys to integer codes, numbered in first-seen order
+        key_codes = {}
+        codes = np.fromiter(
+            (key_codes.setdefault(key, len(key_codes)) for key in keys),
+            dtype=np.intp,
+            count=len(values)
+        )
+        if not key_codes:
+            return {}
+    
+    # Sort values into contiguous groups; group i holds code i
+    order = np.argsort(codes, kind="stable")
+    arr = np.asarray(values, dtype=np.float64)[order]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(codes))))
+    
+    # All groups in one call (in parallel when Numba is installed), each
+    # reduced exactly as calculate_statistics() reduces it
+    means, variances, mins, maxs, counts = _describe_groups(arr, offsets)
+    
+    # Single-value groups get NaN spread, as calculate_statistics does
+    critical_values = np.where(counts > 30, 1.96, _T_CRIT_95[np.minimum(counts, 30)])
+    stds = np.sqrt(variances)
+    margins = critical_values * (stds / np.sqrt(counts))
+    
+    return {
+        key: Statistics(
+            mean=float(means[code]),
+            std=float(stds[code]),
+            variance=float(variances[code]),
+            min=float(mins[code]),
+            max=float(maxs[code]),
+            count=int(counts[code]),
+            confidence_interval_95=(
+                float(means[code] - margins[code]),
+                float(means[code] + margins[code]),
+            ),
+        )
+        for key, code in key_codes.items()
+    }
+
+
 def welch_ttest(group1: List[float], group2: List[float]) -> Tuple[float, float]:
     """
     Perform Welch's t-test (doesn't assume equal variance).
@@ -92,8 +343,12 @@ def welch_ttest(group1: List[float], group2: List[float]) -> Tuple[float, float]
     if len(group1) < 2 or len(group2) < 2:
         raise ValueError("Need at least 2 samples in each group")
     
-    # Welch's t-test (unequal variances)
-    t_statistic, p_value = stats.ttest_ind(group1, group2, equal_var=False)
+    mean1, var1, _, _, n1 = _describe(np.asarray(group1, dtype=np.float64))
+    mean2, var2, _, _, n2 = _describe(np.asarray(group2, dtype=np.float64))
+    
+    # Welch's t-test (unequal variances), computed directly instead of via
+    # stats.ttest_ind, whose input validation dominates for small groups
+    t_statistic, p_value = _welch_from_moments(mean1, var1, n1, mean2, var2, n2)
     
     return float(t_statistic), float(p_value)
 
@@ -126,25 +381,13 @@ def cohens_d(group1: List[float], group2: List[float]) -> float:
         d = cohens_d(baseline, current)
         # d ≈ -1.5 (large negative effect = performance dropped)
     """
-    arr1 = np.array(group1)
-    arr2 = np.array(group2)
-    
-    mean1 = np.mean(arr1)
-    mean2 = np.mean(arr2)
-    
-    # Pooled standard deviation
-    n1, n2 = len(arr1), len(arr2)
-    var1 = np.var(arr1, ddof=1)
-    var2 = np.var(arr2, ddof=1)
-    
-    pooled_std = np.sqrt(((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2))
-    
-    # Cohen's d
-    d = (mean2 - mean1) / pooled_std
+    mean1, var1, _, _, n1 = _describe(np.asarray(group1, dtype=np.float64))
+    mean2, var2, _, _, n2 = _describe(np.asarray(group2, dtype=np.float64))
     
-    return float(d)
+    return float(_cohens_d_from_moments(mean1, var1, n1, mean2, var2, n2))
 
 
+@lru_cache(maxsize=256)
 def interpret_cohens_d(d: float) -> str:
     """
     Interpret Cohen's d value in plain English.
@@ -170,6 +413,7 @@ def interpret_cohens_d(d: float) -> str:
     return f"{magnitude} {direction}"
 
 
+@lru_cache(maxsize=256)
 def interpret_pvalue(p: float) -> str:
     """
     Interpret p-value in plain English.
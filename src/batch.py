@@ -0,0 +1,302 @@
+"""
+src/batch.py
+
+Submit test prompts through the providers' Batch APIs.
+
+Scheduled daily runs don't need answers within seconds, and both OpenAI
+and Anthropic run batch jobs at half the price of regular requests. This
+module:
+1. Packs every test prompt for one model into a single batch job
+2. Polls the job with exponential backoff until it finishes
+3. Converts the batch output back into ModelResponse objects
+
+Only OpenAI and Anthropic clients are supported. The runner falls back
+to regular queries for every other model.
+"""
+
+import io
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .models import BaseModel, ModelResponse
+from .tests import TestCase, get_max_tokens
+
+
+# Batch responses carry no per-request timing. Their latency is stored as
+# None, so latency averages skip them instead of counting them as instant
+BATCH_LATENCY_MS = None
+
+# Smaller jobs are queried directly: the discount on a handful of prompts
+# isn't worth waiting minutes-to-hours for the job to be scheduled
+BATCH_MIN_REQUESTS = 50
+
+
+@dataclass
+class BatchJob:
+    """A submitted batch job for one model."""
+    model: BaseModel
+    provider: str
+    batch_id: str
+    prompts: Dict[str, str]
+
+
+def _unwrap(model: BaseModel) -> BaseModel:
+    """The provider model inside any CachedModel/ResilientModel wrappers."""
+    while hasattr(model, "_model"):
+        model = model._model
+    return model
+
+
+def _get_client(model: BaseModel):
+    """The SDK client a model wrapper queries through, if any."""
+    model = _unwrap(model)
+    return getattr(model, "_client", None) or getattr(model, "client", None)
+
+
+def get_batch_provider(model: BaseModel) -> Optional[str]:
+    """
+    Which Batch API a model can use.
+    
+    Returns:
+        "openai", "anthropic", or None if the model has no batch support
+    """
+    client = _get_client(model)
+    
+    # The SDKs take about a second to import, so only load them here: the
+    # runner imports this module even when batch mode is off
+    try:
+        from openai import OpenAI
+    except ImportError:
+        OpenAI = None
+    
+    try:
+        from anthropic import Anthropic
+    except ImportError:
+        Anthropic = None
+    
+    if OpenAI is not None and isinstance(client, OpenAI):
+        return "openai"
+    if Anthropic is not None and isinstance(client, Anthropic):
+        return "anthropic"
+    return None
+
+
+def submit_batch(
+    model: BaseModel,
+    tests: List[TestCase],
+    temperature: float = 0.0
+) -> BatchJob:
+    """
+    Submit every test prompt for one model as a single batch job.
+    
+    Each model gets its own job, so the test ID alone is a unique
+    custom_id within it.
+    
+    Args:
+        model: Model to query (must have a batch provider)
+        tests: Tests whose prompts to send
+        temperature: Sampling temperature
+    
+    Returns:
+        BatchJob to pass to wait_for_batch / collect_batch
+    """
+    provider = get_batch_provider(model)
+    client = _get_client(model)
+    max_tokens = getattr(_unwrap(model), "_max_tokens", 1000)
+    system_prompt = getattr(_unwrap(model), "_system_prompt", None)
+    prompts = {test.id: test.prompt for test in tests}
+    limits = {test.id: get_max_tokens(test) or max_tokens for test in tests}
+    
+    if provider == "openai":
+        system = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        lines = [
+            json.dumps({
+                "custom_id": test_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model.model_id,
+                    "messages": system + [{"role": "user", "content": prompt}],
+                    "temperature": temperature,
+                    "max_tokens": limits[test_id],
+                },
+            })
+            for test_id, prompt in prompts.items()
+        ]
+        input_file = client.files.create(
+            file=("batch.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+    elif provider == "anthropic":
+        system = {"system": system_prompt} if system_prompt else {}
+        batch = client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": test_id,
+                    "params": {
+                        "model": model.model_id,
+                        "max_tokens": limits[test_id],
+                        "messages": [{"role": "user", "content": prompt}],
+                        "temperature": temperature,
+                        **system,
+                    },
+                }
+                for test_id, prompt in prompts.items()
+            ]
+        )
+    else:
+        raise ValueError(f"{model.name} does not support batch submission")
+    
+    return BatchJob(model=model, provider=provider, batch_id=batch.id, prompts=prompts)
+
+
+def _is_finished(job: BatchJob) -> bool:
+    """Check whether a batch job has stopped processing."""
+    client = _get_client(job.model)
+    
+    if job.provider == "openai":
+        status = client.batches.retrieve(job.batch_id).status
+        return status in ("completed", "failed", "expired", "cancelled")
+    
+    return client.messages.batches.retrieve(job.batch_id).processing_status == "ended"
+
+
+def wait_for_batch(
+    job: BatchJob,
+    initial_delay: float = 10.0,
+    max_delay: float = 300.0
+):
+    """
+    Block until a batch job finishes, polling with exponential backoff.
+    
+    Args:
+        job: The submitted job
+        initial_delay: Seconds before the first status check
+        max_delay: Upper bound on the delay between checks
+    """
+    delay = initial_delay
+    
+    while True:
+        time.sleep(delay)
+        if _is_finished(job):
+            return
+        delay = min(delay * 2, max_delay)
+
+
+def _error_response(job: BatchJob, prompt: str, error: str) -> ModelResponse:
+    """ModelResponse for a request that produced no output."""
+    return ModelResponse(
+        model_name=job.model.model_id,
+        prompt=prompt,
+        response="",
+        latency_ms=BATCH_LATENCY_MS,
+        tokens_input=0,
+        tokens_output=0,
+        tokens_total=0,
+        success=False,
+        error=error,
+    )
+
+
+def _collect_openai(job: BatchJob) -> Dict[str, ModelResponse]:
+    """Parse the output file of a finished OpenAI batch."""
+    client = _get_client(job.model)
+    batch = client.batches.retrieve(job.batch_id)
+    timestamp = datetime.now().isoformat()
+    responses = {}
+    
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            
+            entry = json.loads(line)
+            test_id = entry["custom_id"]
+            prompt = job.prompts.get(test_id, "")
+            response = entry.get("response") or {}
+            
+            if entry.get("error") or response.get("status_code") != 200:
+                error = entry.get("error") or response.get("body", {}).get("error")
+                responses[test_id] = _error_response(job, prompt, str(error))
+                continue
+            
+            body = response["body"]
+            usage = body.get("usage", {})
+            responses[test_id] = ModelResponse(
+                model_name=job.model.model_id,
+                prompt=prompt,
+                response=body["choices"][0]["message"]["content"] or "",
+                latency_ms=BATCH_LATENCY_MS,
+                tokens_input=usage.get("prompt_tokens", 0),
+                tokens_output=usage.get("completion_tokens", 0),
+                tokens_total=usage.get("total_tokens", 0),
+                timestamp=timestamp,
+                success=True,
+                error=None,
+            )
+    
+    return responses
+
+
+def _collect_anthropic(job: BatchJob) -> Dict[str, ModelResponse]:
+    """Read the results of a finished Anthropic batch."""
+    client = _get_client(job.model)
+    timestamp = datetime.now().isoformat()
+    responses = {}
+    
+    for entry in client.messages.batches.results(job.batch_id):
+        test_id = entry.custom_id
+        prompt = job.prompts.get(test_id, "")
+        
+        if entry.result.type != "succeeded":
+            error = getattr(entry.result, "error", None) or entry.result.type
+            responses[test_id] = _error_response(job, prompt, str(error))
+            continue
+        
+        message = entry.result.message
+        tokens_input = message.usage.input_tokens
+        tokens_output = message.usage.output_tokens
+        responses[test_id] = ModelResponse(
+            model_name=job.model.model_id,
+            prompt=prompt,
+            response=message.content[0].text,
+            latency_ms=BATCH_LATENCY_MS,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            tokens_total=tokens_input + tokens_output,
+            timestamp=timestamp,
+            success=True,
+            error=None,
+        )
+    
+    return responses
+
+
+def collect_batch(job: BatchJob) -> Dict[str, ModelResponse]:
+    """
+    Fetch the results of a finished batch job.
+    
+    Prompts the provider returned nothing for (expired or failed jobs)
+    come back as failed responses, so every test still gets a result.
+    
+    Returns:
+        Dictionary mapping test IDs to ModelResponse
+    """
+    if job.provider == "openai":
+        responses = _collect_openai(job)
+    else:
+        responses = _collect_anthropic(job)
+    
+    for test_id, prompt in job.prompts.items():
+        if test_id not in responses:
+            responses[test_id] = _error_response(job, prompt, "No result returned by batch job")
+    
+    return responses
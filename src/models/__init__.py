@@ -1,29 +1,79 @@
+import asyncio
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from .base import BaseModel, ModelResponse
-from .openai_model import OpenAIModel
-from .anthropic_model import AnthropicModel
+from .cache import CachedModel
+from .resilience import ResilientModel
 
-# Import new models with error handling
-try:
-    from .gpt4o_model import GPT4oModel, GPT35TurboModel
-except ImportError:
-    GPT4oModel = None
-    GPT35TurboModel = None
+# Each provider wrapper imports its SDK (openai, anthropic, google...) at
+# module level, which takes seconds in total. They are imported on first
+# access instead (PEP 562 module __getattr__), so code that only needs one
+# provider - or none, like the analysis tools - doesn't pay for all of them.
+_LAZY_MODELS = {
+    "OpenAIModel": "openai_model",
+    "AnthropicModel": "anthropic_model",
+    "GPT4oModel": "gpt4o_model",
+    "GPT35TurboModel": "gpt4o_model",
+    "GeminiModel": "gemini_model",
+    "GeminiFlashModel": "gemini_model",
+    "MistralModel": "mistral_model",
+    "LlamaModel": "llama_model",
+}
+
+# Providers whose wrapper module is optional: the class is None if it
+# can't be imported. The SDKs themselves are imported when a model is
+# created, so a missing SDK raises ImportError from the constructor
+_OPTIONAL_MODELS = {
+    "GPT4oModel",
+    "GPT35TurboModel",
+    "GeminiModel",
+    "GeminiFlashModel",
+    "MistralModel",
+    "LlamaModel",
+}
 
-try:
-    from .gemini_model import GeminiModel, GeminiFlashModel
-except ImportError:
-    GeminiModel = None
-    GeminiFlashModel = None
 
-try:
-    from .mistral_model import MistralModel
-except ImportError:
-    MistralModel = None
+def _model_class(name: str):
+    """Import a provider wrapper class on first use and keep it as a module global."""
+    if name in globals():
+        return globals()[name]
+    
+    try:
+        module = importlib.import_module(f".{_LAZY_MODELS[name]}", __name__)
+        model_class = getattr(module, name)
+    except ImportError:
+        if name not in _OPTIONAL_MODELS:
+            raise
+        model_class = None
+    
+    globals()[name] = model_class
+    return model_class
 
-try:
-    from .llama_model import LlamaModel
-except ImportError:
-    LlamaModel = None
+
+def __getattr__(name: str):
+    if name in _LAZY_MODELS:
+        return _model_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MODELS))
+
+
+# Models get_all_models() tries, as (model name, class name), in the
+# order they are returned. Names match each wrapper's default `name`
+_CATALOG = (
+    ("GPT-4 Turbo", "OpenAIModel"),
+    ("GPT-4o", "GPT4oModel"),
+    ("GPT-3.5 Turbo", "GPT35TurboModel"),
+    ("Claude Sonnet 4", "AnthropicModel"),
+    ("Gemini 1.5 Pro", "GeminiModel"),
+    ("Gemini 1.5 Flash", "GeminiFlashModel"),
+    ("Mistral Large", "MistralModel"),
+    ("Llama 3.1 70B", "LlamaModel"),
+)
 
 
 def get_all_models() -> list[BaseModel]:
@@ -31,69 +81,25 @@ def get_all_models() -> list[BaseModel]:
     Get all available models based on which API keys are set.
     Only includes models where the API key is configured.
     """
-    models = []
-    
-    # OpenAI GPT-4 Turbo (original)
-    try:
-        models.append(OpenAIModel())
-        print(" Added: GPT-4 Turbo")
-    except ValueError as e:
-        print(f"  Skipping GPT-4 Turbo: {e}")
-    
-    # OpenAI GPT-4o
-    if GPT4oModel:
-        try:
-            models.append(GPT4oModel())
-            print(" Added: GPT-4o")
-        except ValueError as e:
-            print(f"  Skipping GPT-4o: {e}")
-    
-    # OpenAI GPT-3.5 Turbo
-    if GPT35TurboModel:
-        try:
-            models.append(GPT35TurboModel())
-            print(" Added: GPT-3.5 Turbo")
-        except ValueError as e:
-            print(f"  Skipping GPT-3.5 Turbo: {e}")
+    candidates = [
+        (label, model_class)
+        for label, name in _CATALOG
+        if (model_class := _model_class(name))
+    ]
     
-    # Anthropic Claude
-    try:
-        models.append(AnthropicModel())
-        print(" Added: Claude Sonnet")
-    except ValueError as e:
-        print(f"  Skipping Claude: {e}")
-    
-    # Google Gemini Pro
-    if GeminiModel:
-        try:
-            models.append(GeminiModel())
-            print(" Added: Gemini 1.5 Pro")
-        except ValueError as e:
-            print(f"  Skipping Gemini Pro: {e}")
-    
-    # Google Gemini Flash
-    if GeminiFlashModel:
-        try:
-            models.append(GeminiFlashModel())
-            print(" Added: Gemini 1.5 Flash")
-        except ValueError as e:
-            print(f"  Skipping Gemini Flash: {e}")
-    
-    # Mistral Large
-    if MistralModel:
-        try:
-            models.append(MistralModel())
-            print(" Added: Mistral Large")
-        except ValueError as e:
-            print(f"  Skipping Mistral: {e}")
-    
-    # Llama 3.1 70B
-    if LlamaModel:
-        try:
-            models.append(LlamaModel())
-            print(" Added: Llama 3.1 70B")
-        except ValueError as e:
-            print(f"  Skipping Llama: {e}")
+    # Each constructor sets up an SDK client, which blocks on I/O - build
+    # them all at once. Results are read back in candidate order, so the
+    # model list and the log don't depend on which finishes first
+    models = []
+    with ThreadPoolExecutor(max_workers=max(len(candidates), 1)) as executor:
+        futures = [(label, executor.submit(model_class)) for label, model_class in candidates]
+        
+        for label, future in futures:
+            try:
+                models.append(future.result())
+                print(f" Added: {label}")
+            except (ValueError, ImportError) as e:
+                print(f"  Skipping {label}: {e}")
     
     if not models:
         raise ValueError("No models available. Check your API keys in .env file")
@@ -102,13 +108,49 @@ def get_all_models() -> list[BaseModel]:
     return models
 
 
+async def query_all(prompt: str, models: list[BaseModel] = None, temperature: float = 0.0) -> list:
+    """
+    Send one prompt to several models at once.
+    
+    Args:
+        prompt: The text to send to every model
+        models: Models to query. Defaults to get_all_models().
+        temperature: Sampling temperature
+    
+    Returns:
+        One ModelResponse per model, in the same order. A model whose
+        aquery() raised gets the exception in its place instead.
+    """
+    models = models or get_all_models()
+    return await asyncio.gather(
+        *(model.aquery(prompt, temperature=temperature) for model in models),
+        return_exceptions=True
+    )
+
+
 def get_model_by_name(name: str) -> BaseModel:
-    """Get a specific model by name."""
-    models = get_all_models()
-    for model in models:
-        if model.name == name:
-            return model
-    raise ValueError(f"Model '{name}' not found or not configured")
+    """
+    Get a specific model by name.
+    
+    Only that model is constructed, not every configured provider.
+    """
+    class_name = dict(_CATALOG).get(name)
+    model_class = _model_class(class_name) if class_name else None
+    
+    if model_class is None:
+        raise ValueError(f"Model '{name}' not found or not configured")
+    
+    try:
+        return model_class()
+    except ImportError as e:
+        raise ValueError(f"Model '{name}' not found or not configured: {e}") from e
+
+
+# LLM_DRIFT_EAGER_IMPORT=1 imports every provider up front (e.g. in CI), so
+# a broken provider module fails at import instead of on first use
+if os.getenv("LLM_DRIFT_EAGER_IMPORT"):
+    for _name in _LAZY_MODELS:
+        _model_class(_name)
 
 
 __all__ = [
@@ -122,6 +164,9 @@ __all__ = [
     "GeminiFlashModel",
     "MistralModel",
     "LlamaModel",
+    "CachedModel",
+    "ResilientModel",
     "get_all_models",
+    "query_all",
     "get_model_by_name",
 ]
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+src/models/_env.py
+
+API keys for the provider wrappers.
+
+.env is read once, when the first wrapper module is imported - each
+wrapper imports this module, so that holds however the wrappers are
+loaded. Keys are still looked up in os.environ on every call instead of
+being copied into constants, so a key set after import (in a test or a
+notebook) is picked up.
+"""
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def get_api_key(env_var: str) -> Optional[str]:
+    """The key stored in `env_var`, or None if it isn't set."""
+    return os.environ.get(env_var)
@@ -1,13 +1,42 @@
-import os
-import time
-from typing import Optional
+import atexit
+import threading
+from time import perf_counter_ns
+from typing import AsyncIterator, Iterator, Optional
 
-from dotenv import load_dotenv
-from anthropic import Anthropic
+from ._env import get_api_key
+from .base import BaseModel, ModelResponse, http_client, is_transient_error, user_messages
 
-from .base import BaseModel, ModelResponse
 
-load_dotenv()
+# Friendly names for known model IDs; anything else is shown as its ID
+_MODEL_NAMES = {
+    "claude-sonnet-4-20250514": "Claude Sonnet 4",
+    "claude-opus-4-20250514": "Claude Opus 4",
+    "claude-haiku-4-20250514": "Claude Haiku 4",
+}
+
+# One client (and connection pool) per API key - see anthropic_client()
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def anthropic_client(api_key: str):
+    """The process-wide Anthropic client for an API key, created on first use."""
+    with _clients_lock:
+        if api_key not in _clients:
+            # SDK imported on first use, not when this module is imported
+            import anthropic
+            
+            _clients[api_key] = anthropic.Anthropic(api_key=api_key, http_client=http_client(anthropic))
+        return _clients[api_key]
+
+
+@atexit.register
+def _close_clients():
+    """Close the shared clients' pooled connections at interpreter exit."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
 
 
 class AnthropicModel(BaseModel):
@@ -23,11 +52,21 @@ class AnthropicModel(BaseModel):
         model = AnthropicModel(model_id="claude-opus-4-20250514")
     """
     
+    __slots__ = (
+        "_model_id",
+        "_name",
+        "_max_tokens",
+        "_system_prompt",
+        "_api_key",
+        "_client",
+    )
+    
     def __init__(
         self,
         model_id: str = "claude-sonnet-4-20250514",
         api_key: Optional[str] = None,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        system_prompt: Optional[str] = None
     ):
         """
         Initialize the Anthropic model wrapper.
@@ -39,11 +78,16 @@ class AnthropicModel(BaseModel):
                 - "claude-haiku-4-20250514" (fastest, cheapest)
             api_key: Anthropic API key. If None, reads from env var
             max_tokens: Maximum tokens in the response
+            system_prompt: Optional instructions sent ahead of every prompt.
+                Marked for prompt caching, so a long shared prefix is only
+                processed once per cache window instead of on every test.
         """
         self._model_id = model_id
+        self._name = _MODEL_NAMES.get(model_id, model_id)
         self._max_tokens = max_tokens
+        self._system_prompt = system_prompt
         
-        self._api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self._api_key = api_key or get_api_key("ANTHROPIC_API_KEY")
         
         if not self._api_key:
             raise ValueError(
@@ -53,25 +97,20 @@ class AnthropicModel(BaseModel):
                 "3. Set ANTHROPIC_API_KEY environment variable"
             )
         
-        # Create the Anthropic client
-        self._client = Anthropic(api_key=self._api_key)
+        # Get the shared Anthropic client
+        self._client = anthropic_client(self._api_key)
     
     @property
     def name(self) -> str:
         """Human-readable name."""
-        names = {
-            "claude-sonnet-4-20250514": "Claude Sonnet 4",
-            "claude-opus-4-20250514": "Claude Opus 4",
-            "claude-haiku-4-20250514": "Claude Haiku 4",
-        }
-        return names.get(self._model_id, self._model_id)
+        return self._name
     
     @property
     def model_id(self) -> str:
         """The exact model identifier used in API calls."""
         return self._model_id
     
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """
         Send a prompt to Claude and get a response.
         
@@ -88,58 +127,106 @@ class AnthropicModel(BaseModel):
         Returns:
             ModelResponse with the model's output and metadata
         """
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         
         try:
-            # Make the API call
             # Note: Anthropic requires max_tokens, unlike OpenAI where it's optional
-            response = self._client.messages.create(
-                model=self._model_id,
-                max_tokens=self._max_tokens,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                # Note: Anthropic doesn't support temperature=0 exactly
-                # Using a very small value instead for near-deterministic output
-                temperature=max(temperature, 0.0),
-            )
-            
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            # Anthropic returns a list of content blocks; we take the first text block
-            response_text = response.content[0].text
-            
-            # Anthropic splits this differently than OpenAI
-            tokens_input = response.usage.input_tokens
-            tokens_output = response.usage.output_tokens
-            tokens_total = tokens_input + tokens_output
-            
-            return ModelResponse(
-                model_name=self._model_id,
-                prompt=prompt,
-                response=response_text,
-                latency_ms=latency_ms,
-                tokens_input=tokens_input,
-                tokens_output=tokens_output,
-                tokens_total=tokens_total,
-                success=True,
-                error=None,
-            )
-            
+            response = self._client.messages.create(**self._request(prompt, temperature, max_tokens))
+            return self._response(prompt, response, start_ns)
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            return ModelResponse(
-                model_name=self._model_id,
-                prompt=prompt,
-                response="",
-                latency_ms=latency_ms,
-                tokens_input=0,
-                tokens_output=0,
-                tokens_total=0,
-                success=False,
-                error=str(e),
+            return self._error_response(prompt, e, start_ns)
+    
+    async def aquery(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Same as query(), through the SDK's async client."""
+        start_ns = perf_counter_ns()
+        
+        try:
+            response = await self._async_anthropic().messages.create(
+                **self._request(prompt, temperature, max_tokens)
             )
+            return self._response(prompt, response, start_ns)
+        except Exception as e:
+            return self._error_response(prompt, e, start_ns)
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        """Same as query(), yielding the text as it arrives."""
+        with self._client.messages.stream(**self._request(prompt, temperature)) as stream:
+            yield from stream.text_stream
+    
+    async def aquery_stream(self, prompt: str, temperature: float = 0.0) -> AsyncIterator[str]:
+        """Same as aquery(), yielding the text as it arrives."""
+        async with self._async_anthropic().messages.stream(**self._request(prompt, temperature)) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    def _async_anthropic(self):
+        """The AsyncAnthropic client for the running event loop."""
+        import anthropic
+        
+        return self._async_client(lambda: anthropic.AsyncAnthropic(
+            api_key=self._api_key,
+            http_client=http_client(anthropic, asynchronous=True)
+        ))
+    
+    def _request(self, prompt: str, temperature: float, max_tokens: Optional[int] = None) -> dict:
+        """Keyword arguments for messages.create()."""
+        # Stable prefix first, marked cacheable; the test prompt goes last
+        extra = {}
+        if self._system_prompt:
+            extra["system"] = [{
+                "type": "text",
+                "text": self._system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }]
+        
+        return dict(
+            model=self._model_id,
+            max_tokens=max_tokens or self._max_tokens,
+            messages=user_messages(prompt),
+            temperature=temperature,
+            **extra,
+        )
+    
+    def _response(self, prompt: str, response, start_ns: int) -> ModelResponse:
+        """Convert an API response into a ModelResponse."""
+        latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        
+        # Anthropic returns a list of content blocks; we take the first text block
+        response_text = response.content[0].text
+        
+        # Anthropic splits this differently than OpenAI
+        tokens_input = response.usage.input_tokens
+        tokens_output = response.usage.output_tokens
+        tokens_total = tokens_input + tokens_output
+        
+        return ModelResponse(
+            model_name=self._model_id,
+            prompt=prompt,
+            response=response_text,
+            latency_ms=latency_ms,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            tokens_total=tokens_total,
+            success=True,
+            error=None,
+        )
+    
+    def _error_response(self, prompt: str, error: Exception, start_ns: int) -> ModelResponse:
+        """ModelResponse for a failed call."""
+        latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        
+        return ModelResponse(
+            model_name=self._model_id,
+            prompt=prompt,
+            response="",
+            latency_ms=latency_ms,
+            tokens_input=0,
+            tokens_output=0,
+            tokens_total=0,
+            success=False,
+            error=str(error),
+            transient=is_transient_error(error),
+        )
 
 
 def test_anthropic():
@@ -1,10 +1,13 @@
+import asyncio
+import importlib.util
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, AsyncIterator, Iterator
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelResponse:
     """
     Standardized response from any LLM.
@@ -13,41 +16,153 @@ class ModelResponse:
         model_name: Which model was called (e.g., "gpt-4-turbo-preview")
         prompt: The input we sent
         response: The text output from the model
-        latency_ms: How long the API call took in milliseconds
+        latency_ms: How long the API call took in milliseconds (None for
+                    Batch API results, which have no per-request timing)
         tokens_input: Number of tokens in the prompt
         tokens_output: Number of tokens in the response
         tokens_total: Total tokens used (input + output)
         timestamp: When this response was generated
         success: Whether the call succeeded
         error: Error message if it failed
+        ttft_ms: Milliseconds until the first text arrived, for wrappers
+                 that stream the response (None otherwise)
+        transient: Whether a failed call is worth retrying (timeout,
+                   dropped connection, rate limit or server error)
         raw_response: The original API response (for debugging)
     """
     model_name: str
     prompt: str
     response: str
-    latency_ms: int
+    latency_ms: Optional[int]
     tokens_input: int
     tokens_output: int
     tokens_total: int
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     success: bool = True
     error: Optional[str] = None
+    ttft_ms: Optional[int] = None
+    transient: bool = False
     raw_response: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "model_name": self.model_name,
-            "prompt": self.prompt,
-            "response": self.response,
-            "latency_ms": self.latency_ms,
-            "tokens_input": self.tokens_input,
-            "tokens_output": self.tokens_output,
-            "tokens_total": self.tokens_total,
-            "timestamp": self.timestamp,
-            "success": self.success,
-            "error": self.error,
-        }
+        """Convert to dictionary for JSON serialization (without raw_response)."""
+        return {key: getattr(self, key) for key in SERIALIZED_FIELDS}
+
+
+# Fields to_dict() writes, in declaration order. raw_response is debug-only
+# and transient only matters to ResilientModel while the call is retried
+SERIALIZED_FIELDS = tuple(
+    f.name for f in fields(ModelResponse) if f.name not in ("raw_response", "transient")
+)
+
+# HTTP statuses worth retrying: request timeout, rate limit, server errors
+# (529 is Anthropic's "overloaded")
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504, 529})
+
+
+@lru_cache(maxsize=1)
+def _transient_error_types() -> tuple:
+    """Exception classes for timeouts and dropped connections, from whichever SDKs are installed."""
+    types = [TimeoutError, ConnectionError]
+    
+    # The SDKs raise these for both timeouts and connection failures
+    for sdk_name in ("openai", "anthropic"):
+        try:
+            types.append(importlib.import_module(sdk_name).APIConnectionError)
+        except ImportError:
+            pass
+    
+    try:
+        import httpx
+        types += [httpx.TimeoutException, httpx.NetworkError]
+    except ImportError:
+        pass
+    
+    return tuple(types)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of a failed API call, if the exception carries one."""
+    # openai/anthropic APIStatusError and Mistral's SDKError set status_code,
+    # httpx.HTTPStatusError keeps it on the response, Google's API errors
+    # use code
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Whether a failed API call is worth retrying.
+    
+    Decided by the exception's type and HTTP status, never its message:
+    a permanent 400 can easily mention "timeout" or "5000 tokens".
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES
+    return isinstance(error, _transient_error_types())
+
+def user_messages(prompt: str) -> list:
+    """The single-turn message list the chat APIs take for one prompt."""
+    return [{"role": "user", "content": prompt}]
+
+
+def chat_completion_text(stream) -> Iterator[str]:
+    """Text pieces of a streamed OpenAI-style chat completion (OpenAI, Together, Mistral)."""
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def achat_completion_text(stream) -> AsyncIterator[str]:
+    """Async version of chat_completion_text()."""
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def aiohttp_available() -> bool:
+    """Whether the SDKs' aiohttp transport is installed (pip install 'openai[aiohttp]')."""
+    return importlib.util.find_spec("httpx_aiohttp") is not None
+
+
+def http_client(sdk, asynchronous: bool = False, aiohttp: bool = False):
+    """
+    HTTP client to hand to a provider SDK (the openai or anthropic module).
+    
+    A run sends hundreds of prompts to the same few hosts, so idle
+    connections are kept open between queries instead of reconnecting.
+    HTTP/2 is used when the optional h2 package is installed
+    (pip install 'httpx[http2]'). Built from the SDK's own default client
+    class and Timeout, so its other defaults (redirects, TCP keep-alive)
+    still apply. Compression and TCP_NODELAY need no setting here: httpx
+    already sends Accept-Encoding: gzip, deflate (plus br/zstd when
+    those packages are installed), and httpcore turns off Nagle on every
+    socket it opens.
+    
+    With aiohttp=True (async only) the SDK's aiohttp-backed client is
+    returned instead: httpx's async pool stops scaling at a few dozen
+    concurrent requests, aiohttp keeps up with hundreds.
+    """
+    if aiohttp:
+        return sdk.DefaultAioHttpClient(timeout=sdk.Timeout(60.0, connect=5.0))
+    
+    import httpx
+    
+    client_class = sdk.DefaultAsyncHttpxClient if asynchronous else sdk.DefaultHttpxClient
+    return client_class(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=64,
+            keepalive_expiry=300,
+        ),
+        timeout=sdk.Timeout(60.0, connect=5.0),
+    )
 
 
 class BaseModel(ABC):
@@ -75,6 +190,8 @@ class BaseModel(ABC):
             # Works the same regardless of which model!
     """
     
+    __slots__ = ("_aclient",)
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -94,7 +211,7 @@ class BaseModel(ABC):
         pass
     
     @abstractmethod
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """
         Send a prompt to the model and get a response.
         
@@ -102,12 +219,60 @@ class BaseModel(ABC):
             prompt: The text to send to the model
             temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
                         We default to 0.0 for benchmarking consistency.
+            max_tokens: Cap on the response length for this call. None uses
+                        the wrapper's own limit.
         
         Returns:
             ModelResponse with all the data we need for analysis
         """
         pass
     
+    async def aquery(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """
+        Async version of query(), so several models can be queried at once.
+        
+        Wrappers whose SDK has an async client override this. The default
+        runs the blocking query() in the event loop's thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.query, prompt, temperature, max_tokens)
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        """
+        Send a prompt and yield the response text as it arrives.
+        
+        Wrappers whose SDK can stream override this. The default yields
+        the whole text from query() in one piece.
+        
+        Unlike query(), failures are raised rather than returned: a stream
+        can break after part of the text has already been yielded.
+        """
+        response = self.query(prompt, temperature=temperature)
+        if not response.success:
+            raise RuntimeError(response.error)
+        yield response.response
+    
+    async def aquery_stream(self, prompt: str, temperature: float = 0.0) -> AsyncIterator[str]:
+        """Async version of stream_query()."""
+        response = await self.aquery(prompt, temperature=temperature)
+        if not response.success:
+            raise RuntimeError(response.error)
+        yield response.response
+    
+    def _async_client(self, factory):
+        """
+        The async SDK client for the running event loop, created on first use.
+        
+        Async clients hold connections tied to the loop they were created
+        in, so a new one is made when aquery() runs under a different loop
+        (e.g. a second asyncio.run()).
+        """
+        loop = asyncio.get_running_loop()
+        cached = getattr(self, "_aclient", None)
+        if cached is None or cached[0] is not loop:
+            cached = self._aclient = (loop, factory())
+        return cached[1]
+    
     def __repr__(self) -> str:
         """String representation for debugging."""
         return f"{self.__class__.__name__}(name='{self.name}', model_id='{self.model_id}')"
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+src/models/cache.py
+
+Local response cache for development runs.
+
+Re-running the suite while working on scoring or the dashboard sends the
+exact same prompts again. CachedModel wraps any model and replays earlier
+responses from a SQLite file instead of calling the API.
+
+Only temperature 0 queries are cached: at any higher temperature the
+model is supposed to answer differently each time, so those always go to
+the API.
+
+Never use this for the daily monitoring runs - a replayed response can't
+show drift.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .base import BaseModel, ModelResponse
+
+
+class CachedModel(BaseModel):
+    """
+    Wraps a model and caches its successful responses on disk.
+    
+    Only exact matches are served: two prompts that differ by a single
+    digit (math_001 vs math_002) need different answers, so there is no
+    similarity matching.
+    
+    Example usage:
+        model = CachedModel(OpenAIModel(), ttl_seconds=3600)
+        model.query("What is 2+2?")  # API call
+        model.query("What is 2+2?")  # served from cache
+        model.stats                  # {"hits": 1, "misses": 1}
+    """
+    
+    __slots__ = ("_model", "_path", "_ttl_seconds", "_lock", "_settings", "stats")
+    
+    def __init__(
+        self,
+        model: BaseModel,
+        cache_path: str = "./data/cache/responses.sqlite",
+        ttl_seconds: int = 86400
+    ):
+        """
+        Args:
+            model: The model to wrap
+            cache_path: SQLite file to store responses in
+            ttl_seconds: How long a cached response stays valid
+        """
+        self._model = model
+        self._path = Path(cache_path)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+        
+        # Request settings that change the answer besides the prompt, read
+        # from the provider model under any other wrappers
+        inner = model
+        while hasattr(inner, "_model"):
+            inner = inner._model
+        self._settings = {
+            "max_tokens": getattr(inner, "_max_tokens", None),
+            "system_prompt": getattr(inner, "_system_prompt", None),
+        }
+        
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # sqlite3's own context manager only commits; closing() closes
+        with closing(sqlite3.connect(self._path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, created_at REAL, response TEXT)"
+            )
+    
+    @property
+    def name(self) -> str:
+        return self._model.name
+    
+    @property
+    def model_id(self) -> str:
+        return self._model.model_id
+    
+    def _key(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """Cache key for one (model, settings, prompt) combination at temperature 0."""
+        settings = dict(self._settings)
+        if max_tokens is not None:
+            settings["max_tokens"] = max_tokens
+        raw = f"{self.model_id}\0{json.dumps(settings, sort_keys=True)}\0{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Return a cached response if there is a fresh one, else query the model."""
+        if temperature != 0:
+            return self._model.query(prompt, temperature=temperature, max_tokens=max_tokens)
+        
+        key = self._key(prompt, max_tokens)
+        
+        with self._lock, closing(sqlite3.connect(self._path)) as conn:
+            row = conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self._ttl_seconds)
+            ).fetchone()
+            self.stats["hits" if row else "misses"] += 1
+        
+        if row:
+            cached = ModelResponse(**json.loads(row[0]))
+            return replace(cached, timestamp=datetime.now().isoformat())
+        
+        response = self._model.query(prompt, temperature=temperature, max_tokens=max_tokens)
+        
+        # Errors are worth retrying next time, so only keep successes
+        if response.success:
+            with self._lock, closing(sqlite3.connect(self._path)) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, time.time(), json.dumps(response.to_dict()))
+                )
+        
+        return response
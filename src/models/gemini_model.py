@@ -1,68 +1,78 @@
 """Google Gemini model wrapper."""
 
-import os
-import time
-import google.generativeai as genai
-from .base import BaseModel, ModelResponse
+from time import perf_counter_ns
+from typing import Iterator, Optional
+from ._env import get_api_key
+from .base import BaseModel, ModelResponse, is_transient_error
+
+
+def _display_name(model_name: str) -> str:
+    """Human-readable name for a Gemini model ID."""
+    if "pro" in model_name:
+        return "Gemini 1.5 Pro"
+    elif "flash" in model_name:
+        return "Gemini 1.5 Flash"
+    return f"Gemini ({model_name})"
 
 
 class GeminiModel(BaseModel):
     """Google Gemini Pro model wrapper."""
     
+    __slots__ = ("_genai", "model", "_model_name", "_name")
+    
     def __init__(self, model_name: str = "gemini-pro-latest"):
-        api_key = os.getenv("GOOGLE_API_KEY")
+        api_key = get_api_key("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment")
         
+        # SDK imported on first use, not when this module is imported;
+        # query() reuses the module through self._genai
+        import google.generativeai as genai
+        
+        self._genai = genai
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
         self._model_name = model_name
+        self._name = _display_name(model_name)
     
     @property
     def name(self) -> str:
-        if "pro" in self._model_name:
-            return "Gemini 1.5 Pro"
-        elif "flash" in self._model_name:
-            return "Gemini 1.5 Flash"
-        return f"Gemini ({self._model_name})"
+        return self._name
     
     @property
     def model_id(self) -> str:
         return self._model_name
     
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """Query Gemini model."""
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         
         try:
-            generation_config = genai.types.GenerationConfig(
-                temperature=temperature,
-                max_output_tokens=1000,
-            )
-            
             response = self.model.generate_content(
                 prompt,
-                generation_config=generation_config
+                generation_config=self._generation_config(temperature, max_tokens)
             )
             
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
             
             if hasattr(response, 'text'):
                 text = response.text
             else:
                 text = str(response)
             
-            # Estimate tokens (~4 chars per token)
-            tokens = len(prompt + text) // 4
+            # Estimate tokens (~4 chars per token). The total is taken from
+            # the summed lengths, as before, without building prompt + text
+            prompt_chars = len(prompt)
+            text_chars = len(text)
             
             return ModelResponse(
                 model_name=self.name,
                 prompt=prompt,
                 response=text,
                 latency_ms=latency_ms,
-                tokens_input=len(prompt) // 4,  # Estimate
-                tokens_output=len(text) // 4,    # Estimate
-                tokens_total=len(prompt + text) // 4,
+                tokens_input=prompt_chars // 4,  # Estimate
+                tokens_output=text_chars // 4,    # Estimate
+                tokens_total=(prompt_chars + text_chars) // 4,
                 success=True,
                 error=None,
             )
@@ -72,18 +82,37 @@ class GeminiModel(BaseModel):
                 model_name=self.name,
                 prompt=prompt,
                 response=f"ERROR: {str(e)}",
-                latency_ms=int((time.time() - start_time) * 1000),
+                latency_ms=(perf_counter_ns() - start_ns) // 1_000_000,
                 tokens_input=0,
                 tokens_output=0,
                 tokens_total=0,
                 success=False,
                 error=str(e),
+                transient=is_transient_error(e),
             )
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        """Stream a Gemini response."""
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._generation_config(temperature),
+            stream=True
+        )
+        for chunk in response:
+            yield chunk.text
+    
+    def _generation_config(self, temperature: float, max_tokens: Optional[int] = None):
+        return self._genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens or 1000,
+        )
 
 
 class GeminiFlashModel(GeminiModel):
     """Gemini Flash (faster) model wrapper."""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(model_name="gemini-flash-latest")
 
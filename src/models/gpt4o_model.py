@@ -1,20 +1,75 @@
 """OpenAI GPT-4o model wrapper."""
 
-import os
-import time
-from openai import OpenAI
-from .base import BaseModel, ModelResponse
+from time import perf_counter_ns
+from typing import AsyncIterator, Iterator, Optional
+from ._env import get_api_key
+from .base import (
+    BaseModel,
+    ModelResponse,
+    achat_completion_text,
+    chat_completion_text,
+    http_client,
+    is_transient_error,
+    user_messages,
+)
+from .openai_model import openai_client
+
+
+def _chat_response(model_name: str, prompt: str, response, start_ns: int) -> ModelResponse:
+    """Convert a chat completion into a ModelResponse."""
+    latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
+    
+    return ModelResponse(
+        model_name=model_name,
+        prompt=prompt,
+        response=response.choices[0].message.content,
+        latency_ms=latency_ms,
+        tokens_input=response.usage.prompt_tokens,
+        tokens_output=response.usage.completion_tokens,
+        tokens_total=response.usage.total_tokens,
+        success=True,
+        error=None,
+    )
+
+
+def _error_response(model_name: str, prompt: str, error: Exception, start_ns: int) -> ModelResponse:
+    """ModelResponse for a failed call."""
+    return ModelResponse(
+        model_name=model_name,
+        prompt=prompt,
+        response=f"ERROR: {str(error)}",
+        latency_ms=(perf_counter_ns() - start_ns) // 1_000_000,
+        tokens_input=0,
+        tokens_output=0,
+        tokens_total=0,
+        success=False,
+        error=str(error),
+        transient=is_transient_error(error),
+    )
+
+
+def _async_openai(model: BaseModel):
+    """The AsyncOpenAI client for `model` in the running event loop."""
+    import openai
+    
+    return model._async_client(lambda: openai.AsyncOpenAI(
+        api_key=model._api_key,
+        http_client=http_client(openai, asynchronous=True)
+    ))
 
 
 class GPT4oModel(BaseModel):
     """GPT-4o model wrapper."""
     
+    __slots__ = ("_api_key", "client", "_model_name")
+    
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = get_api_key("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found")
         
-        self.client = OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self.client = openai_client(api_key)
         self._model_name = "gpt-4o"
     
     @property
@@ -25,58 +80,62 @@ class GPT4oModel(BaseModel):
     def model_id(self) -> str:
         return "gpt-4o"
     
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """Query GPT-4o model."""
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         
         try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=1000
-            )
-            
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            text = response.choices[0].message.content
-            tokens = response.usage.total_tokens
-            
-            return ModelResponse(
-                model_name=self.name,
-                prompt=prompt,
-                response=text,
-                latency_ms=latency_ms,
-                tokens_input=response.usage.prompt_tokens,
-                tokens_output=response.usage.completion_tokens,
-                tokens_total=response.usage.total_tokens,
-                success=True,
-                error=None,  
-            )
-            
+            response = self.client.chat.completions.create(**self._request(prompt, temperature, max_tokens))
+            return _chat_response(self.name, prompt, response, start_ns)
         except Exception as e:
-            return ModelResponse(
-                model_name=self.name,
-                prompt=prompt,
-                response=f"ERROR: {str(e)}",
-                latency_ms=int((time.time() - start_time) * 1000),
-                tokens_input=0,
-                tokens_output=0,
-                tokens_total=0,
-                success=False,
-                error=str(e),
+            return _error_response(self.name, prompt, e, start_ns)
+    
+    async def aquery(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Query GPT-4o through the SDK's async client."""
+        start_ns = perf_counter_ns()
+        
+        try:
+            response = await _async_openai(self).chat.completions.create(
+                **self._request(prompt, temperature, max_tokens)
             )
+            return _chat_response(self.name, prompt, response, start_ns)
+        except Exception as e:
+            return _error_response(self.name, prompt, e, start_ns)
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        yield from chat_completion_text(stream)
+    
+    async def aquery_stream(self, prompt: str, temperature: float = 0.0) -> AsyncIterator[str]:
+        stream = await _async_openai(self).chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        async for text in achat_completion_text(stream):
+            yield text
+    
+    def _request(self, prompt: str, temperature: float, max_tokens: Optional[int] = None) -> dict:
+        return dict(
+            model=self._model_name,
+            messages=user_messages(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens or 1000
+        )
 
 
 class GPT35TurboModel(BaseModel):
     """GPT-3.5 Turbo model wrapper."""
     
+    __slots__ = ("_api_key", "client", "_model_name")
+    
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = get_api_key("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found")
         
-        self.client = OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self.client = openai_client(api_key)
         self._model_name = "gpt-3.5-turbo"
     
     @property
@@ -87,47 +146,48 @@ class GPT35TurboModel(BaseModel):
     def model_id(self) -> str:
         return "gpt-3.5-turbo"  # ADD THIS
     
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """Query GPT-3.5 Turbo model."""
-        start_time = time.time()
+        start_ns = perf_counter_ns()
+        
+        try:
+            response = self.client.chat.completions.create(**self._request(prompt, temperature, max_tokens))
+            return _chat_response(self.name, prompt, response, start_ns)
+        except Exception as e:
+            return _error_response(self.name, prompt, e, start_ns)
+    
+    async def aquery(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Query GPT-3.5 Turbo through the SDK's async client."""
+        start_ns = perf_counter_ns()
         
         try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=1000
+            response = await _async_openai(self).chat.completions.create(
+                **self._request(prompt, temperature, max_tokens)
             )
-            
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            text = response.choices[0].message.content
-            tokens = response.usage.total_tokens
-            
-            return ModelResponse(
-                model_name=self.name,
-                prompt=prompt,
-                response=text,
-                latency_ms=latency_ms,
-                tokens_input=response.usage.prompt_tokens,
-                tokens_output=response.usage.completion_tokens,
-                tokens_total=response.usage.total_tokens,
-                success=True,
-                error=None,
-)
-            
+            return _chat_response(self.name, prompt, response, start_ns)
         except Exception as e:
-            return ModelResponse(
-                model_name=self.name,
-                prompt=prompt,
-                response=f"ERROR: {str(e)}",
-                latency_ms=int((time.time() - start_time) * 1000),
-                tokens_input=0,
-                tokens_output=0,
-                tokens_total=0,
-                success=False,
-                error=str(e),
-)
+            return _error_response(self.name, prompt, e, start_ns)
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        yield from chat_completion_text(stream)
+    
+    async def aquery_stream(self, prompt: str, temperature: float = 0.0) -> AsyncIterator[str]:
+        stream = await _async_openai(self).chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        async for text in achat_completion_text(stream):
+            yield text
+    
+    def _request(self, prompt: str, temperature: float, max_tokens: Optional[int] = None) -> dict:
+        return dict(
+            model=self._model_name,
+            messages=user_messages(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens or 1000
+        )
 
 
 if __name__ == "__main__":
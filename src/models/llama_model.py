@@ -1,76 +1,138 @@
 """Together.ai model wrapper (for Llama and others)."""
 
-import os
-import time
-from together import Together
-from .base import BaseModel, ModelResponse
+from time import perf_counter_ns
+from typing import AsyncIterator, Iterator, Optional
+from ._env import get_api_key
+from .base import (
+    BaseModel,
+    ModelResponse,
+    achat_completion_text,
+    chat_completion_text,
+    is_transient_error,
+    user_messages,
+)
+
+
+def _display_name(model_name: str) -> str:
+    """Human-readable name for a Together model ID."""
+    model_name = model_name.lower()
+    if "70b" in model_name:
+        return "Llama 3.1 70B"
+    elif "8b" in model_name:
+        return "Llama 3.1 8B"
+    elif "405b" in model_name:
+        return "Llama 3.1 405B"
+    return "Llama 3.1"
 
 
 class LlamaModel(BaseModel):
     """Llama model wrapper via Together.ai."""
     
+    __slots__ = ("_api_key", "client", "_model_name", "_name")
+    
     def __init__(self, model_name: str = "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo"):
-        api_key = os.getenv("TOGETHER_API_KEY")
+        api_key = get_api_key("TOGETHER_API_KEY")
         if not api_key:
             raise ValueError("TOGETHER_API_KEY not found")
         
+        # SDK imported on first use, not when this module is imported
+        from together import Together
+        
+        self._api_key = api_key
         self.client = Together(api_key=api_key)
         self._model_name = model_name
+        self._name = _display_name(model_name)
     
     @property
     def name(self) -> str:
-        if "70b" in self._model_name.lower():
-            return "Llama 3.1 70B"
-        elif "8b" in self._model_name.lower():
-            return "Llama 3.1 8B"
-        elif "405b" in self._model_name.lower():
-            return "Llama 3.1 405B"
-        return "Llama 3.1"
+        return self._name
+    
     @property
     def model_id(self) -> str:
         return self._model_name
     
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """Query Llama via Together.ai."""
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         
         try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=1000
-            )
-            
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            text = response.choices[0].message.content
-            tokens = response.usage.total_tokens if hasattr(response, 'usage') else 0
-            
-            return ModelResponse(
-                model_name=self.name,
-                prompt=prompt,
-                response=text,
-                latency_ms=latency_ms,
-                tokens_input=response.usage.prompt_tokens if hasattr(response, 'usage') else 0,
-                tokens_output=response.usage.completion_tokens if hasattr(response, 'usage') else 0,
-                tokens_total=response.usage.total_tokens if hasattr(response, 'usage') else 0,
-                success=True,
-                error=None,
-            )
-            
+            response = self.client.chat.completions.create(**self._request(prompt, temperature, max_tokens))
+            return self._response(prompt, response, start_ns)
         except Exception as e:
-            return ModelResponse(
-                model_name=self.name,
-                prompt=prompt,
-                response=f"ERROR: {str(e)}",
-                latency_ms=int((time.time() - start_time) * 1000),
-                tokens_input=0,
-                tokens_output=0,
-                tokens_total=0,
-                success=False,
-                error=str(e),
+            return self._error_response(prompt, e, start_ns)
+    
+    async def aquery(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Query Llama through Together's async client."""
+        start_ns = perf_counter_ns()
+        
+        try:
+            response = await self._async_together().chat.completions.create(
+                **self._request(prompt, temperature, max_tokens)
             )
+            return self._response(prompt, response, start_ns)
+        except Exception as e:
+            return self._error_response(prompt, e, start_ns)
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        yield from chat_completion_text(stream)
+    
+    async def aquery_stream(self, prompt: str, temperature: float = 0.0) -> AsyncIterator[str]:
+        stream = await self._async_together().chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        async for text in achat_completion_text(stream):
+            yield text
+    
+    def _async_together(self):
+        """The AsyncTogether client for the running event loop."""
+        from together import AsyncTogether
+        
+        return self._async_client(lambda: AsyncTogether(api_key=self._api_key))
+    
+    def _request(self, prompt: str, temperature: float, max_tokens: Optional[int] = None) -> dict:
+        return dict(
+            model=self._model_name,
+            messages=user_messages(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens or 1000
+        )
+    
+    def _response(self, prompt: str, response, start_ns: int) -> ModelResponse:
+        """Convert a chat completion into a ModelResponse."""
+        latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        
+        text = response.choices[0].message.content
+        usage = getattr(response, "usage", None)
+        
+        return ModelResponse(
+            model_name=self.name,
+            prompt=prompt,
+            response=text,
+            latency_ms=latency_ms,
+            tokens_input=usage.prompt_tokens if usage else 0,
+            tokens_output=usage.completion_tokens if usage else 0,
+            tokens_total=usage.total_tokens if usage else 0,
+            success=True,
+            error=None,
+        )
+    
+    def _error_response(self, prompt: str, error: Exception, start_ns: int) -> ModelResponse:
+        """ModelResponse for a failed call."""
+        return ModelResponse(
+            model_name=self.name,
+            prompt=prompt,
+            response=f"ERROR: {str(error)}",
+            latency_ms=(perf_counter_ns() - start_ns) // 1_000_000,
+            tokens_input=0,
+            tokens_output=0,
+            tokens_total=0,
+            success=False,
+            error=str(error),
+            transient=is_transient_error(error),
+        )
 
 
 if __name__ == "__main__":
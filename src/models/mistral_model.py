@@ -1,54 +1,67 @@
 """Mistral AI model wrapper."""
 
-import os
-import time
-from mistralai.client import MistralClient
-from mistralai.models.chat_completion import ChatMessage
-from .base import BaseModel, ModelResponse
+from time import perf_counter_ns
+from typing import Iterator, Optional
+from ._env import get_api_key
+from .base import BaseModel, ModelResponse, chat_completion_text, is_transient_error
+
+
+def _display_name(model_name: str) -> str:
+    """Human-readable name for a Mistral model ID."""
+    if "large" in model_name:
+        return "Mistral Large"
+    elif "medium" in model_name:
+        return "Mistral Medium"
+    elif "small" in model_name:
+        return "Mistral Small"
+    return f"Mistral ({model_name})"
 
 
 class MistralModel(BaseModel):
     """Mistral model wrapper."""
     
+    __slots__ = ("_chat_message", "client", "_model_name", "_name")
+    
     def __init__(self, model_name: str = "mistral-large-latest"):
-        api_key = os.getenv("MISTRAL_API_KEY")
+        api_key = get_api_key("MISTRAL_API_KEY")
         if not api_key:
             raise ValueError("MISTRAL_API_KEY not found")
         
+        # SDK imported on first use, not when this module is imported;
+        # query() builds messages through self._chat_message
+        from mistralai.client import MistralClient
+        from mistralai.models.chat_completion import ChatMessage
+        
+        self._chat_message = ChatMessage
         self.client = MistralClient(api_key=api_key)
         self._model_name = model_name
+        self._name = _display_name(model_name)
     
     @property
     def name(self) -> str:
-        if "large" in self._model_name:
-            return "Mistral Large"
-        elif "medium" in self._model_name:
-            return "Mistral Medium"
-        elif "small" in self._model_name:
-            return "Mistral Small"
-        return f"Mistral ({self._model_name})"
+        return self._name
+    
     @property
     def model_id(self) -> str:
         return self._model_name
     
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """Query Mistral model."""
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         
         try:
-            messages = [ChatMessage(role="user", content=prompt)]
+            messages = [self._chat_message(role="user", content=prompt)]
             
             response = self.client.chat(
                 model=self._model_name,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=1000
+                max_tokens=max_tokens or 1000
             )
             
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
             
             text = response.choices[0].message.content
-            tokens = response.usage.total_tokens
             
             return ModelResponse(
                 model_name=self.name,
@@ -67,13 +80,24 @@ class MistralModel(BaseModel):
                 model_name=self.name,
                 prompt=prompt,
                 response=f"ERROR: {str(e)}",
-                latency_ms=int((time.time() - start_time) * 1000),
+                latency_ms=(perf_counter_ns() - start_ns) // 1_000_000,
                 tokens_input=0,
                 tokens_output=0,
                 tokens_total=0,
                 success=False,
                 error=str(e),
+                transient=is_transient_error(e),
             )
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        """Stream a Mistral response."""
+        stream = self.client.chat_stream(
+            model=self._model_name,
+            messages=[self._chat_message(role="user", content=prompt)],
+            temperature=temperature,
+            max_tokens=1000
+        )
+        yield from chat_completion_text(stream)
 
 
 if __name__ == "__main__":
@@ -18,16 +18,93 @@ AUTHENTICATION:
 - Never hardcode API keys in your code!
 """
 
-import os
-import time
-from typing import Optional
+import atexit
+import json
+import threading
+from time import perf_counter_ns
+from typing import Any, AsyncIterator, Iterator, List, Optional
 
-from dotenv import load_dotenv
-from openai import OpenAI
+from ._env import get_api_key
+from .base import (
+    BaseModel,
+    ModelResponse,
+    achat_completion_text,
+    aiohttp_available,
+    chat_completion_text,
+    http_client,
+    is_transient_error,
+    user_messages,
+)
 
-from .base import BaseModel, ModelResponse
 
-load_dotenv()
+# Map model IDs to friendly names; anything else is shown as its ID
+_MODEL_NAMES = {
+    "gpt-4-turbo-preview": "GPT-4 Turbo",
+    "gpt-4o": "GPT-4o",
+    "gpt-4": "GPT-4",
+    "gpt-3.5-turbo": "GPT-3.5 Turbo",
+}
+
+# Sent ahead of the numbered prompts in query_batch()
+_BATCH_INSTRUCTIONS = (
+    "Answer each of the numbered questions below on its own. Reply with a "
+    'JSON object {"answers": [...]} holding one string per question, in order.'
+)
+
+# One client (and connection pool) per API key, shared by every OpenAI
+# wrapper in the process - see openai_client()
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def openai_client(api_key: str):
+    """
+    The process-wide OpenAI client for an API key, created on first use.
+    
+    Each client holds its own HTTP connection pool, so wrappers for
+    different OpenAI models (GPT-4 Turbo, GPT-4o, GPT-3.5) share one
+    instead of opening separate connections to the same API. Locked
+    because get_all_models() constructs models from several threads.
+    """
+    with _clients_lock:
+        if api_key not in _clients:
+            # Imported here rather than at module level, so importing this
+            # wrapper doesn't load the SDK until a model is actually created
+            import openai
+            
+            _clients[api_key] = openai.OpenAI(api_key=api_key, http_client=http_client(openai))
+        return _clients[api_key]
+
+
+@atexit.register
+def _close_clients():
+    """Close the shared clients' pooled connections at interpreter exit."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+class _StreamedCompletion:
+    """Text, token usage and time to first token of a streamed chat completion."""
+    
+    __slots__ = ("start_ns", "parts", "usage", "ttft_ms")
+    
+    def __init__(self, start_ns: int):
+        self.start_ns = start_ns
+        self.parts = []
+        self.usage = None
+        self.ttft_ms = None
+    
+    def add(self, chunk):
+        """Take in one chunk of the stream."""
+        # With include_usage the last chunk has usage and no choices
+        if chunk.usage:
+            self.usage = chunk.usage
+        if chunk.choices and chunk.choices[0].delta.content:
+            if self.ttft_ms is None:
+                self.ttft_ms = (perf_counter_ns() - self.start_ns) // 1_000_000
+            self.parts.append(chunk.choices[0].delta.content)
 
 
 class OpenAIModel(BaseModel):
@@ -44,11 +121,24 @@ class OpenAIModel(BaseModel):
         model = OpenAIModel(model_id="gpt-4o")
     """
     
+    __slots__ = (
+        "_model_id",
+        "_name",
+        "_max_tokens",
+        "_system_prompt",
+        "_api_key",
+        "_client",
+        "_use_aiohttp",
+    )
+    
     def __init__(
         self, 
         model_id: str = "gpt-4-turbo-preview",
         api_key: Optional[str] = None,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        system_prompt: Optional[str] = None,
+        http_client: Optional[Any] = None,
+        use_aiohttp: bool = False
     ):
         """
         Initialize the OpenAI model wrapper.
@@ -61,11 +151,26 @@ class OpenAIModel(BaseModel):
                 - "gpt-3.5-turbo" (cheaper, less capable)
             api_key: OpenAI API key. If None, reads from OPENAI_API_KEY env var
             max_tokens: Maximum tokens in the response
+            system_prompt: Optional instructions sent ahead of every prompt.
+                OpenAI caches identical prefixes automatically, so keeping
+                this byte-identical across tests lets them share it.
+            http_client: httpx client to send requests through (e.g. one
+                with a mock transport in tests). By default the process-wide
+                client for the API key is used - see openai_client().
+            use_aiohttp: Send aquery()/aquery_stream() requests through
+                aiohttp instead of httpx, for runs with hundreds of calls
+                in flight. Needs pip install 'openai[aiohttp]'.
         """
         self._model_id = model_id
+        self._name = _MODEL_NAMES.get(model_id, model_id)
         self._max_tokens = max_tokens
+        self._system_prompt = system_prompt
+        self._use_aiohttp = use_aiohttp
+        
+        if use_aiohttp and not aiohttp_available():
+            raise ImportError("use_aiohttp needs the aiohttp extra: pip install 'openai[aiohttp]'")
         
-        self._api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self._api_key = api_key or get_api_key("OPENAI_API_KEY")
         
         if not self._api_key:
             raise ValueError(
@@ -75,28 +180,26 @@ class OpenAIModel(BaseModel):
                 "3. Set OPENAI_API_KEY environment variable"
             )
         
-        # Create the OpenAI client
+        # Get the shared OpenAI client, unless a transport was injected
         # This doesn't make any API calls yet - just sets up the connection
-        self._client = OpenAI(api_key=self._api_key)
+        if http_client is None:
+            self._client = openai_client(self._api_key)
+        else:
+            import openai
+            
+            self._client = openai.OpenAI(api_key=self._api_key, http_client=http_client)
     
     @property
     def name(self) -> str:
         """Human-readable name."""
-        # Map model IDs to friendly names
-        names = {
-            "gpt-4-turbo-preview": "GPT-4 Turbo",
-            "gpt-4o": "GPT-4o",
-            "gpt-4": "GPT-4",
-            "gpt-3.5-turbo": "GPT-3.5 Turbo",
-        }
-        return names.get(self._model_id, self._model_id)
+        return self._name
     
     @property
     def model_id(self) -> str:
         """The exact model identifier used in API calls."""
         return self._model_id
     
-    def query(self, prompt: str, temperature: float = 0.0) -> ModelResponse:
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
         """
         Send a prompt to GPT and get a response.
         
@@ -115,59 +218,183 @@ class OpenAIModel(BaseModel):
             ModelResponse with the model's output and metadata
         """
         # Record start time for latency measurement
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         
         try:
             # Make the API call
-            # This is where the actual network request happens
+            # This is where the actual network request happens. The
+            # response is streamed so the time to first token is known
+            stream = self._client.chat.completions.create(**self._streamed_request(prompt, temperature, max_tokens))
+            completion = _StreamedCompletion(start_ns)
+            for chunk in stream:
+                completion.add(chunk)
+            return self._response(prompt, completion)
+        except Exception as e:
+            # If anything goes wrong, return an error response
+            # This is better than crashing - we can still record that this test failed
+            return self._error_response(prompt, e, start_ns)
+    
+    async def aquery(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Same as query(), through the SDK's async client."""
+        start_ns = perf_counter_ns()
+        
+        try:
+            stream = await self._async_openai().chat.completions.create(
+                **self._streamed_request(prompt, temperature, max_tokens)
+            )
+            completion = _StreamedCompletion(start_ns)
+            async for chunk in stream:
+                completion.add(chunk)
+            return self._response(prompt, completion)
+        except Exception as e:
+            return self._error_response(prompt, e, start_ns)
+    
+    def stream_query(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        """Same as query(), yielding the text as it arrives."""
+        stream = self._client.chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        yield from chat_completion_text(stream)
+    
+    async def aquery_stream(self, prompt: str, temperature: float = 0.0) -> AsyncIterator[str]:
+        """Same as aquery(), yielding the text as it arrives."""
+        stream = await self._async_openai().chat.completions.create(
+            **self._request(prompt, temperature), stream=True
+        )
+        async for text in achat_completion_text(stream):
+            yield text
+    
+    def query_batch(self, prompts: List[str], temperature: float = 0.0) -> List[ModelResponse]:
+        """
+        Answer several prompts with a single chat completion.
+        
+        The prompts go out as one numbered list and the model replies in
+        JSON mode with one answer per prompt, saving a round trip per
+        prompt. Every answer gets the latency of the whole call and an
+        even share of its tokens. If the reply doesn't hold exactly one
+        answer per prompt, each prompt is sent with query() instead.
+        
+        Prompts answered together can influence each other, so results
+        aren't comparable with single-prompt runs. The runner doesn't use
+        this for monitoring runs.
+        
+        Args:
+            prompts: The texts to send
+            temperature: Randomness control (0.0 = deterministic)
+        
+        Returns:
+            One ModelResponse per prompt, in order
+        """
+        if len(prompts) < 2:
+            return [self.query(prompt, temperature=temperature) for prompt in prompts]
+        
+        numbered = "\n".join(f"{i}. {prompt}" for i, prompt in enumerate(prompts, 1))
+        start_ns = perf_counter_ns()
+        
+        try:
             response = self._client.chat.completions.create(
-                model=self._model_id,
-                messages=[
-                    # We just send a single user message
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=self._max_tokens,
+                **self._request(f"{_BATCH_INSTRUCTIONS}\n\n{numbered}", temperature),
+                response_format={"type": "json_object"},
             )
-            
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            # The API returns a complex object; we just want the text
-            response_text = response.choices[0].message.content
-            
-            # This is important for cost tracking and analysis
-            tokens_input = response.usage.prompt_tokens
-            tokens_output = response.usage.completion_tokens
-            tokens_total = response.usage.total_tokens
-            
-            return ModelResponse(
+            answers = json.loads(response.choices[0].message.content)["answers"]
+            if not isinstance(answers, list) or len(answers) != len(prompts):
+                raise ValueError(f"expected {len(prompts)} answers, got {len(answers)}")
+        except Exception:
+            return [self.query(prompt, temperature=temperature) for prompt in prompts]
+        
+        latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        count = len(prompts)
+        usage = response.usage
+        
+        return [
+            ModelResponse(
                 model_name=self._model_id,
                 prompt=prompt,
-                response=response_text,
+                response=str(answer),
                 latency_ms=latency_ms,
-                tokens_input=tokens_input,
-                tokens_output=tokens_output,
-                tokens_total=tokens_total,
+                tokens_input=usage.prompt_tokens // count,
+                tokens_output=usage.completion_tokens // count,
+                tokens_total=usage.total_tokens // count,
                 success=True,
                 error=None,
             )
-            
-        except Exception as e:
-            # If anything goes wrong, return an error response
-            # This is better than crashing - we can still record that this test failed
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            return ModelResponse(
-                model_name=self._model_id,
-                prompt=prompt,
-                response="",  # Empty response on error
-                latency_ms=latency_ms,
-                tokens_input=0,
-                tokens_output=0,
-                tokens_total=0,
-                success=False,
-                error=str(e),
-            )
+            for prompt, answer in zip(prompts, answers)
+        ]
+    
+    def _async_openai(self):
+        """The AsyncOpenAI client for the running event loop."""
+        import openai
+        
+        return self._async_client(lambda: openai.AsyncOpenAI(
+            api_key=self._api_key,
+            http_client=http_client(openai, asynchronous=True, aiohttp=self._use_aiohttp)
+        ))
+    
+    def _request(self, prompt: str, temperature: float, max_tokens: Optional[int] = None) -> dict:
+        """Keyword arguments for chat.completions.create()."""
+        # Stable system prefix first so it can be cached; the test prompt goes last
+        messages = []
+        if self._system_prompt:
+            messages.append({"role": "system", "content": self._system_prompt})
+        messages.extend(user_messages(prompt))
+        
+        return dict(
+            model=self._model_id,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens or self._max_tokens,
+        )
+    
+    def _streamed_request(self, prompt: str, temperature: float, max_tokens: Optional[int] = None) -> dict:
+        """_request() for a stream that ends with a token usage chunk."""
+        return dict(
+            self._request(prompt, temperature, max_tokens),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+    
+    def _response(self, prompt: str, completion: "_StreamedCompletion") -> ModelResponse:
+        """Convert a finished stream into a ModelResponse."""
+        latency_ms = (perf_counter_ns() - completion.start_ns) // 1_000_000
+        
+        # The API streams the text in pieces; we just want the whole text
+        response_text = "".join(completion.parts)
+        
+        # This is important for cost tracking and analysis
+        usage = completion.usage
+        tokens_input = usage.prompt_tokens if usage else 0
+        tokens_output = usage.completion_tokens if usage else 0
+        tokens_total = usage.total_tokens if usage else 0
+        
+        return ModelResponse(
+            model_name=self._model_id,
+            prompt=prompt,
+            response=response_text,
+            latency_ms=latency_ms,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            tokens_total=tokens_total,
+            success=True,
+            error=None,
+            ttft_ms=completion.ttft_ms,
+        )
+    
+    def _error_response(self, prompt: str, error: Exception, start_ns: int) -> ModelResponse:
+        """ModelResponse for a failed call."""
+        latency_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        
+        return ModelResponse(
+            model_name=self._model_id,
+            prompt=prompt,
+            response="",  # Empty response on error
+            latency_ms=latency_ms,
+            tokens_input=0,
+            tokens_output=0,
+            tokens_total=0,
+            success=False,
+            error=str(error),
+            transient=is_transient_error(error),
+        )
 
 
 # Convenience function for quick testing
@@ -0,0 +1,162 @@
+"""
+src/models/resilience.py
+
+Retries and a circuit breaker around model queries.
+
+Model wrappers never raise - a failed API call comes back as a
+ModelResponse with success=False. ResilientModel looks at those responses:
+1. Transient failures (rate limits, 5xx, timeouts) are retried with
+   exponential backoff and jitter. The wrappers decide what is transient
+   from the exception type and HTTP status (ModelResponse.transient)
+2. After too many transient failures in a row the circuit opens, and
+   further queries fail immediately instead of waiting on a provider
+   that is down
+3. Once the cool-off period passes, one query is let through to probe
+   whether the provider has recovered
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from .base import BaseModel, ModelResponse
+
+
+class ResilientModel(BaseModel):
+    """
+    Wraps a model with retries and a circuit breaker.
+    
+    Example usage:
+        model = ResilientModel(OpenAIModel(), max_attempts=4)
+        response = model.query("What is 2+2?")  # retried on 429/5xx
+    """
+    
+    __slots__ = (
+        "_model",
+        "_max_attempts",
+        "_initial_delay",
+        "_max_delay",
+        "_failure_threshold",
+        "_reset_after",
+        "_lock",
+        "_failures",
+        "_opened_at",
+    )
+    
+    def __init__(
+        self,
+        model: BaseModel,
+        max_attempts: int = 4,
+        initial_delay: float = 1.0,
+        max_delay: float = 16.0,
+        failure_threshold: int = 5,
+        reset_after: float = 60.0
+    ):
+        """
+        Args:
+            model: The model to wrap
+            max_attempts: Total tries per query, including the first
+            initial_delay: Seconds before the first retry (doubles each time)
+            max_delay: Upper bound on the delay between retries
+            failure_threshold: Failed queries in a row that open the circuit
+            reset_after: Seconds the circuit stays open before a probe query
+        """
+        self._model = model
+        self._max_attempts = max(1, max_attempts)
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._failure_threshold = failure_threshold
+        self._reset_after = reset_after
+        
+        # Circuit state, shared by the runner's worker threads
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+    
+    @property
+    def name(self) -> str:
+        return self._model.name
+    
+    @property
+    def model_id(self) -> str:
+        return self._model.model_id
+    
+    def _circuit_open(self) -> bool:
+        """Check the circuit, letting one probe through once it has cooled off."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at >= self._reset_after:
+                # Half-open: this caller probes, the rest keep failing fast
+                self._opened_at = time.monotonic()
+                return False
+            return True
+    
+    def _record(self, response: ModelResponse):
+        """Update the failure count and open or close the circuit."""
+        with self._lock:
+            if response.success:
+                self._failures = 0
+                self._opened_at = None
+            elif response.transient:
+                # Permanent errors (bad request, auth) say nothing about
+                # whether the provider is up, so only these count
+                self._failures += 1
+                if self._failures >= self._failure_threshold:
+                    self._opened_at = time.monotonic()
+    
+    def _delay(self, attempt: int) -> float:
+        """Backoff before retry number `attempt` (0-based), with jitter."""
+        delay = self._initial_delay * (2 ** attempt) + random.uniform(0, self._initial_delay)
+        return min(delay, self._max_delay)
+    
+    def _circuit_open_response(self, prompt: str) -> ModelResponse:
+        """Failed response returned without calling the model."""
+        return ModelResponse(
+            model_name=self.model_id,
+            prompt=prompt,
+            response="",
+            latency_ms=0,
+            tokens_input=0,
+            tokens_output=0,
+            tokens_total=0,
+            timestamp=datetime.now().isoformat(),
+            success=False,
+            error=f"Circuit open: {self.name} failed {self._failures} times in a row",
+            transient=True,
+        )
+    
+    def query(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Query the model, retrying transient failures unless the circuit is open."""
+        if self._circuit_open():
+            return self._circuit_open_response(prompt)
+        
+        for attempt in range(self._max_attempts):
+            response = self._model.query(prompt, temperature=temperature, max_tokens=max_tokens)
+            
+            if response.success or not response.transient:
+                break
+            if attempt + 1 < self._max_attempts:
+                time.sleep(self._delay(attempt))
+        
+        self._record(response)
+        return response
+    
+    async def aquery(self, prompt: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> ModelResponse:
+        """Same as query(), through the wrapped model's aquery()."""
+        if self._circuit_open():
+            return self._circuit_open_response(prompt)
+        
+        for attempt in range(self._max_attempts):
+            response = await self._model.aquery(prompt, temperature=temperature, max_tokens=max_tokens)
+            
+            if response.success or not response.transient:
+                break
+            if attempt + 1 < self._max_attempts:
+                await asyncio.sleep(self._delay(attempt))
+        
+        self._record(response)
+        return response
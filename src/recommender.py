@@ -4,10 +4,22 @@ Model Recommendation Engine
 Analyzes performance data and recommends the best model for specific tasks.
 """
 
+import heapq
+import math
+import os
+import pickle
+import tempfile
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 from enum import Enum
-from src.storage import ResultsStorage
+from pathlib import Path
+from src.storage import ResultsStorage, ResultsTable
+
+
+# Aggregated performance matrix, stored next to the other processed data.
+# Bump the version whenever the aggregation changes so old files are rebuilt
+MATRIX_CACHE_FILE = "performance_matrix.pkl"
+MATRIX_CACHE_VERSION = 2
 
 
 class TaskType(Enum):
@@ -21,7 +33,7 @@ class TaskType(Enum):
     CONSISTENCY = "consistency"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelRecommendation:
     """Recommendation result."""
     recommended_model: str
@@ -37,7 +49,58 @@ class ModelRecommender:
     
     def __init__(self, storage: ResultsStorage):
         self.storage = storage
-        self.performance_matrix = self._calculate_performance_matrix()
+        self.performance_matrix = self._load_cached_matrix()
+        
+        # Highest average latency in each category, for speed normalization.
+        # NaN latency: the model only has Batch API results, which aren't timed
+        self._max_latency_by_cat = {}
+        for categories in self.performance_matrix.values():
+            for category, metrics in categories.items():
+                if math.isnan(metrics['latency']):
+                    continue
+                self._max_latency_by_cat[category] = max(
+                    self._max_latency_by_cat.get(category, 0),
+                    metrics['latency']
+                )
+    
+    def _load_cached_matrix(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Performance matrix from the on-disk cache.
+        
+        The cache is keyed by storage.signature() and MATRIX_CACHE_VERSION,
+        so it's recomputed (and rewritten) only when a run file is added,
+        removed or rewritten, or the aggregation changes.
+        """
+        path = self.storage.processed_dir / MATRIX_CACHE_FILE
+        signature = (MATRIX_CACHE_VERSION, self.storage.signature())
+        
+        try:
+            with open(path, "rb") as f:
+                cached_signature, matrix, df = pickle.load(f)
+            if cached_signature == signature:
+                self._df = df
+                return matrix
+        except Exception:
+            pass  # Missing, partly written, or from another pandas version
+        
+        matrix = self._calculate_performance_matrix()
+        
+        # Written to a temporary file and renamed into place, so other
+        # processes never read a half-written cache. The matrix is already
+        # computed, so a failed write (read-only dir, full disk) is ignored
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=path.parent, prefix=f"{MATRIX_CACHE_FILE}.", delete=False
+            ) as f:
+                tmp_path = f.name
+                pickle.dump((signature, matrix, self._df), f, protocol=5)
+            os.replace(tmp_path, path)
+        except OSError:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+        
+        return matrix
     
     def _calculate_performance_matrix(self) -> Dict[str, Dict[str, Dict[str, float]]]:
         """
@@ -52,57 +115,32 @@ class ModelRecommender:
                 ...
             }
         """
-        runs = self.storage.load_all_runs()
+        df = ResultsTable(self.storage).load(
+            columns=["model_name", "category", "score", "latency_ms"]
+        )
         
-        if not runs:
+        if df.empty:
+            self._df = df
             return {}
         
-        # Aggregate results by model and category
-        model_category_results = {}
-        
-        for run in runs:
-            for result in run.results:
-                model = result.model_name
-                category = result.test_id.split('_')[0]  # e.g., "math" from "math_001"
-                
-                if model not in model_category_results:
-                    model_category_results[model] = {}
-                
-                if category not in model_category_results[model]:
-                    model_category_results[model][category] = {
-                        'scores': [],
-                        'latencies': [],
-                    }
-                
-                model_category_results[model][category]['scores'].append(result.score)
-                model_category_results[model][category]['latencies'].append(result.latency_ms)
+        # One row per (model, category), in order of first appearance
+        grouped = df.groupby(["model_name", "category"], sort=False)
+        stats = grouped.agg(
+            accuracy=("score", "mean"),
+            latency=("latency_ms", "mean"),
+            count=("score", "size"),
+        )
+        stats["std"] = grouped["score"].std(ddof=0)
         
-        performance_matrix = {}
+        # Consistency = 1 - (std_dev / mean); a single sample has std 0
+        ratio = (stats["std"] / stats["accuracy"]).where(stats["accuracy"] > 0, 0.0)
+        stats["consistency"] = (1 - ratio).clip(0, 1)
+        stats = stats[["accuracy", "latency", "consistency", "std", "count"]]
+        self._df = stats
         
-        for model, categories in model_category_results.items():
-            performance_matrix[model] = {}
-            
-            for category, data in categories.items():
-                scores = data['scores']
-                latencies = data['latencies']
-                
-                avg_accuracy = sum(scores) / len(scores) if scores else 0
-                avg_latency = sum(latencies) / len(latencies) if latencies else 0
-                
-                # Consistency = 1 - (std_dev / mean)
-                if len(scores) > 1:
-                    mean = avg_accuracy
-                    variance = sum((x - mean) ** 2 for x in scores) / len(scores)
-                    std_dev = variance ** 0.5
-                    consistency = 1 - (std_dev / mean if mean > 0 else 0)
-                else:
-                    consistency = 1.0
-                
-                performance_matrix[model][category] = {
-                    'accuracy': avg_accuracy,
-                    'latency': avg_latency,
-                    'consistency': max(0, min(1, consistency))
-                }
+        performance_matrix = {}
+        for (model, category), metrics in stats.to_dict(orient="index").items():
+            performance_matrix.setdefault(model, {})[category] = metrics
         
         return performance_matrix
     
@@ -131,6 +169,10 @@ class ModelRecommender:
         
         category = task_type.value
         
+        # Normalize latency (lower is better, convert to 0-1 scale)
+        # against the slowest model for this category
+        max_latency = self._max_latency_by_cat.get(category, 1)
+        
         model_scores = {}
         
         for model, categories in self.performance_matrix.items():
@@ -139,17 +181,12 @@ class ModelRecommender:
             
             metrics = categories[category]
             
-            # Normalize latency (lower is better, convert to 0-1 scale)
-            # Find max latency across all models for this category
-            all_latencies = [
-                self.performance_matrix[m][category]['latency']
-                for m in self.performance_matrix
-                if category in self.performance_matrix[m]
-            ]
-            max_latency = max(all_latencies) if all_latencies else 1
-            
-            # Speed score (inverted latency)
-            speed_score = 1 - (metrics['latency'] / max_latency) if max_latency > 0 else 1
+            # Speed score (inverted latency). A model with no timed results
+            # gets no speed credit rather than looking instant
+            if math.isnan(metrics['latency']):
+                speed_score = 0.0
+            else:
+                speed_score = 1 - (metrics['latency'] / max_latency) if max_latency > 0 else 1
             
             weighted_score = (
                 metrics['accuracy'] * priorities.get("accuracy", 0.7) +
@@ -235,6 +272,49 @@ class ModelRecommender:
             f"This is the {conf_text} for {task_type.value} tasks."
         )
     
+    def compare_models(self, task_type: TaskType) -> Dict[str, Dict[str, float]]:
+        """
+        Side-by-side stats for every model with data for a task type.
+        
+        Returns:
+            {model: {"avg_score", "std", "avg_latency", "count"}}
+        """
+        category = task_type.value
+        
+        return {
+            model: {
+                "avg_score": categories[category]['accuracy'],
+                "std": categories[category]['std'],
+                "avg_latency": categories[category]['latency'],
+                "count": categories[category]['count'],
+            }
+            for model, categories in self.performance_matrix.items()
+            if category in categories
+        }
+    
+    def get_model_strengths(
+        self,
+        model_name: str,
+        top: Optional[int] = None
+    ) -> List[tuple[str, float]]:
+        """
+        Categories a model does best at.
+        
+        Args:
+            model_name: Model to look up
+            top: Only return this many categories
+        
+        Returns:
+            List of (category, accuracy), best first
+        """
+        categories = self.performance_matrix.get(model_name, {})
+        items = ((category, metrics['accuracy']) for category, metrics in categories.items())
+        
+        if top is not None:
+            return heapq.nlargest(top, items, key=lambda x: x[1])
+        
+        return sorted(items, key=lambda x: x[1], reverse=True)
+    
     def get_all_recommendations(self) -> Dict[TaskType, ModelRecommendation]:
         """Get recommendations for all task types."""
         recommendations = {}
@@ -260,7 +340,8 @@ class ModelRecommender:
             print(f"   Best: {rec.recommended_model}")
             print(f"   Performance: {rec.performance_details['accuracy']:.1%}")
             print(f"   Confidence: {rec.confidence:.1%}")
-            print(f"   Latency: {rec.performance_details['latency_ms']:.0f}ms")
+            if not math.isnan(rec.performance_details['latency_ms']):
+                print(f"   Latency: {rec.performance_details['latency_ms']:.0f}ms")
             print(f"   Reason: {rec.reasoning}")
             
             if rec.alternatives:
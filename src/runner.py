@@ -13,13 +13,32 @@ This module:
 This is the core engine of the drift monitor.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from tqdm import tqdm  # Progress bar library
 
-from .models import BaseModel, ModelResponse, get_all_models, get_model_by_name
-from .tests import TestCase, get_all_tests, get_tests_by_category, score_response, TestCategory
+from .models import BaseModel, CachedModel, ModelResponse, ResilientModel, get_all_models, get_model_by_name
+from .tests import TestCase, get_all_tests, get_max_tokens, get_tests_by_category, score_response, TestCategory
 from .storage import TestResult, TestRun, ResultsStorage, generate_run_id
+from .batch import BATCH_MIN_REQUESTS, BatchJob, get_batch_provider, submit_batch, wait_for_batch, collect_batch
+
+
+def _interleaved_order(num_models: int, num_tests: int) -> List[int]:
+    """
+    Indexes into the model-major (model, test) pair list, test by test.
+    
+    Calls are started in this order so every model has requests in flight
+    from the start. In pair order, the first max_concurrency slots would
+    all go to the first model and each model's suite would mostly finish
+    before the next one's began.
+    """
+    return [
+        model_idx * num_tests + test_idx
+        for test_idx in range(num_tests)
+        for model_idx in range(num_models)
+    ]
 
 
 class DriftMonitorRunner:
@@ -42,7 +61,11 @@ class DriftMonitorRunner:
         self,
         models: Optional[List[BaseModel]] = None,
         data_dir: str = "./data",
-        verbose: bool = True
+        verbose: bool = True,
+        max_concurrency: int = 8,
+        retries: int = 0,
+        use_cache: bool = False,
+        cache_ttl: int = 86400
     ):
         """
         Initialize the runner.
@@ -51,10 +74,29 @@ class DriftMonitorRunner:
             models: List of models to test. If None, uses all available models.
             data_dir: Directory for storing results
             verbose: Whether to print progress
+            max_concurrency: Maximum number of API calls in flight at once
+            retries: Retries per query on rate limits, 5xx errors and
+                     timeouts, with exponential backoff. Off by default;
+                     main.py turns it on with --retries
+            use_cache: Replay responses to prompts already sent at
+                       temperature 0 from the local cache (development
+                       only - a replayed response can't show drift)
+            cache_ttl: Seconds a cached response stays valid
         """
         self.models = models or get_all_models()
+        # Retry inside the cache so only the final response gets cached
+        if retries > 0:
+            self.models = [
+                model if isinstance(model, ResilientModel)
+                else ResilientModel(model, max_attempts=retries + 1)
+                for model in self.models
+            ]
+        if use_cache:
+            self.models = [CachedModel(model, ttl_seconds=cache_ttl) for model in self.models]
         self.storage = ResultsStorage(data_dir)
         self.verbose = verbose
+        self.max_concurrency = max(1, max_concurrency)
+        self._last_run: Optional[TestRun] = None
         
         if not self.models:
             raise ValueError("No models available. Check your API keys.")
@@ -76,8 +118,27 @@ class DriftMonitorRunner:
             TestResult with all data
         """
         # Query the model
-        response: ModelResponse = model.query(test.prompt)
+        response: ModelResponse = model.query(test.prompt, max_tokens=get_max_tokens(test))
+        
+        return self._record_result(test, model, response)
+    
+    def _record_result(
+        self,
+        test: TestCase,
+        model: BaseModel,
+        response: ModelResponse
+    ) -> TestResult:
+        """
+        Score a model response and wrap it in a TestResult.
         
+        Args:
+            test: The test case the response answers
+            model: The model that produced it
+            response: The model's response
+        
+        Returns:
+            TestResult with all data
+        """
         # Score the response
         score = score_response(test, response.response)
         
@@ -98,65 +159,134 @@ class DriftMonitorRunner:
             success=response.success,
             error=response.error,
             category=test.category.value if hasattr(test.category, 'value') else test.category,
+            ttft_ms=response.ttft_ms,
         )
     
-    def run_all_tests(
+    def iter_results(
         self,
         tests: Optional[List[TestCase]] = None,
-        save: bool = True
-    ) -> TestRun:
+        save: bool = True,
+        batch: bool = False
+    ) -> Iterator[TestResult]:
         """
-        Run all tests against all models.
+        Run all tests against all models, yielding each result as it finishes.
+        
+        Results arrive in completion order. Once the generator is exhausted
+        the run is saved and finalize() returns it, in model/test order.
         
         Args:
             tests: Specific tests to run. If None, runs all tests.
             save: Whether to save results to disk
+            batch: Send prompts for OpenAI and Anthropic models through
+                   their Batch APIs (cheaper, but can take hours). Other
+                   models are queried directly.
         
-        Returns:
-            TestRun containing all results
+        Yields:
+            TestResult for each (model, test) pair
         """
+        self._last_run = None
         tests = tests or get_all_tests()
         run_id = generate_run_id()
         timestamp = datetime.now().isoformat()
-        results: List[TestResult] = []
         
-        total_iterations = len(tests) * len(self.models)
+        # Every (model, test) pair is an independent API call
+        pairs = [(model, test) for model in self.models for test in tests]
+        results: List[Optional[TestResult]] = [None] * len(pairs)
+        
+        total_iterations = len(pairs)
         
         if self.verbose:
-            print(f"\n{'='*60}")
-            print(f"LLM DRIFT MONITOR - Test Run")
-            print(f"{'='*60}")
-            print(f"Run ID: {run_id}")
-            print(f"Tests: {len(tests)}")
-            print(f"Models: {len(self.models)}")
-            print(f"Total iterations: {total_iterations}")
-            print(f"{'='*60}\n")
+            self._print_header(run_id, tests, total_iterations)
+        
+        # Submit batch jobs first so they process while direct queries run.
+        # Each model is its own job; too few tests and it isn't worth it
+        batch_jobs = []
+        if batch and len(tests) < BATCH_MIN_REQUESTS:
+            if self.verbose:
+                print(f"Only {len(tests)} tests per model (batch minimum {BATCH_MIN_REQUESTS}), querying directly")
+        elif batch:
+            for model in self.models:
+                if get_batch_provider(model):
+                    batch_jobs.append(submit_batch(model, tests))
+                    if self.verbose:
+                        print(f"📦 Submitted batch for {model.name}")
+        batched_models = [job.model for job in batch_jobs]
         
         # Create progress bar
         if self.verbose:
             pbar = tqdm(total=total_iterations, desc="Running tests")
         
-        for model in self.models:
-            if self.verbose:
-                tqdm.write(f"\n Testing: {model.name}")
+        # The calls are network-bound, so overlap them on a thread pool.
+        # Results are stored by position so the run keeps model/test order.
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {
+                executor.submit(self.run_single_test, pairs[idx][1], pairs[idx][0]): idx
+                for idx in _interleaved_order(len(self.models), len(tests))
+                if pairs[idx][0] not in batched_models
+            }
             
-            for test in tests:
-                result = self.run_single_test(test, model)
-                results.append(result)
+            for future in as_completed(futures):
+                idx = futures[future]
+                result = future.result()
+                results[idx] = result
                 
                 # Update progress bar with result indicator
                 if self.verbose:
+                    model, test = pairs[idx]
                     status = "" if result.score == 1.0 else "" if result.score > 0 else ""
                     pbar.set_postfix({
+                        "model": model.name,
                         "test": test.id[:15],
                         "score": f"{result.score:.0%}",
                         "status": status
                     })
                     pbar.update(1)
+                
+                yield result
+        
+        # Wait for batch jobs and score their responses
+        for job in batch_jobs:
+            if self.verbose:
+                tqdm.write(f"\n⏳ Waiting for {job.model.name} batch {job.batch_id}")
+            
+            wait_for_batch(job)
+            responses = collect_batch(job)
+            
+            for idx, (model, test) in enumerate(pairs):
+                if model is job.model:
+                    results[idx] = self._record_result(test, model, responses[test.id])
+                    yield results[idx]
+            
+            if self.verbose:
+                pbar.update(len(tests))
         
         if self.verbose:
             pbar.close()
         
+        self._finish_run(run_id, timestamp, tests, results, batch_jobs, save)
+    
+    def _print_header(self, run_id: str, tests: List[TestCase], total_iterations: int):
+        """Print the banner at the start of a run."""
+        print(f"\n{'='*60}")
+        print(f"LLM DRIFT MONITOR - Test Run")
+        print(f"{'='*60}")
+        print(f"Run ID: {run_id}")
+        print(f"Tests: {len(tests)}")
+        print(f"Models: {len(self.models)}")
+        print(f"Total iterations: {total_iterations}")
+        print(f"Concurrency: {self.max_concurrency}")
+        print(f"{'='*60}\n")
+    
+    def _finish_run(
+        self,
+        run_id: str,
+        timestamp: str,
+        tests: List[TestCase],
+        results: List[TestResult],
+        batch_jobs: List[BatchJob],
+        save: bool
+    ) -> TestRun:
+        """Build the TestRun from finished results, save it and keep it for finalize()."""
         # Create TestRun object
         run = TestRun(
             run_id=run_id,
@@ -167,8 +297,19 @@ class DriftMonitorRunner:
             results=results,
             metadata={
                 "models": [{"name": m.name, "id": m.model_id} for m in self.models],
+                # Output caps change token counts and latency, so drift
+                # analysis checks the runs it compares used the same ones.
+                # Tests not listed ran with the model's own limit
+                "max_tokens": {
+                    test.id: get_max_tokens(test)
+                    for test in tests
+                    if get_max_tokens(test) is not None
+                },
             }
         )
+        if batch_jobs:
+            run.metadata["batch_models"] = [job.model.name for job in batch_jobs]
+            run.metadata["batch_ids"] = {job.model.name: job.batch_id for job in batch_jobs}
         
         # Save results
         if save:
@@ -180,8 +321,118 @@ class DriftMonitorRunner:
         if self.verbose:
             self._print_summary(run)
         
+        self._last_run = run
         return run
     
+    def finalize(self) -> TestRun:
+        """
+        Return the TestRun built by the last completed iter_results() call.
+        
+        Raises:
+            RuntimeError: If iter_results() hasn't been run to the end
+        """
+        if self._last_run is None:
+            raise RuntimeError("No finished run. Consume iter_results() first.")
+        return self._last_run
+    
+    def run_all_tests(
+        self,
+        tests: Optional[List[TestCase]] = None,
+        save: bool = True,
+        batch: bool = False,
+        use_async: bool = False
+    ) -> TestRun:
+        """
+        Run all tests against all models.
+        
+        Args:
+            tests: Specific tests to run. If None, runs all tests.
+            save: Whether to save results to disk
+            batch: Send prompts for OpenAI and Anthropic models through
+                   their Batch APIs (cheaper, but can take hours). Other
+                   models are queried directly.
+            use_async: Run through arun_all_tests() on a fresh event loop
+                       instead of the thread pool. Can't be combined with batch.
+        
+        Returns:
+            TestRun containing all results
+        """
+        if use_async:
+            if batch:
+                raise ValueError("batch=True is not supported with use_async=True")
+            return asyncio.run(self.arun_all_tests(tests=tests, save=save))
+        
+        for _ in self.iter_results(tests=tests, save=save, batch=batch):
+            pass
+        return self.finalize()
+    
+    async def arun_all_tests(
+        self,
+        tests: Optional[List[TestCase]] = None,
+        save: bool = True
+    ) -> TestRun:
+        """
+        Run all tests against all models from an event loop.
+        
+        Same as run_all_tests(), but every query goes through
+        model.aquery() - the SDKs' async clients where a wrapper has one -
+        with at most max_concurrency calls in flight. Batch submission
+        isn't supported here.
+        
+        Usage:
+            run = asyncio.run(runner.arun_all_tests())
+        
+        Returns:
+            TestRun containing all results, in model/test order
+        """
+        self._last_run = None
+        tests = tests or get_all_tests()
+        run_id = generate_run_id()
+        timestamp = datetime.now().isoformat()
+        
+        pairs = [(model, test) for model in self.models for test in tests]
+        
+        if self.verbose:
+            self._print_header(run_id, tests, len(pairs))
+            pbar = tqdm(total=len(pairs), desc="Running tests")
+        
+        # Bounds the requests in flight, like the thread pool in iter_results()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_pair(model: BaseModel, test: TestCase) -> TestResult:
+            async with semaphore:
+                response = await model.aquery(test.prompt, max_tokens=get_max_tokens(test))
+            
+            result = self._record_result(test, model, response)
+            if self.verbose:
+                pbar.update(1)
+            return result
+        
+        # gather() returns results in submission order; put them back by
+        # pair index so the run keeps model/test order
+        order = _interleaved_order(len(self.models), len(tests))
+        finished = await asyncio.gather(*(run_pair(*pairs[idx]) for idx in order))
+        results = [None] * len(pairs)
+        for idx, result in zip(order, finished):
+            results[idx] = result
+        
+        if self.verbose:
+            pbar.close()
+        
+        return self._finish_run(run_id, timestamp, tests, results, [], save)
+    
+    def run_all_tests_batch(
+        self,
+        tests: Optional[List[TestCase]] = None,
+        save: bool = True
+    ) -> TestRun:
+        """
+        Run all tests, sending OpenAI and Anthropic prompts through their
+        Batch APIs (half price, can take hours). Shorthand for
+        run_all_tests(batch=True).
+        """
+        return self.run_all_tests(tests=tests, save=save, batch=True)
+    
     def run_category(self, category: TestCategory, save: bool = True) -> TestRun:
         """
         Run tests for a specific category only.
@@ -198,7 +449,7 @@ class DriftMonitorRunner:
     
     def _print_summary(self, run: TestRun):
         """Print a summary of the test run."""
-        summary = run.calculate_summary()
+        summary = run.summary
         
         print(f"\n{'='*60}")
         print(" RESULTS SUMMARY")
@@ -211,11 +462,18 @@ class DriftMonitorRunner:
             print(f"  {model}:")
             print(f"    Average score: {stats['avg_score']:.1%}")
             print(f"    Perfect scores: {stats['perfect_scores']}/{stats['count']}")
-            print(f"    Avg latency: {stats['avg_latency_ms']:.0f}ms")
+            if stats['avg_latency_ms'] is not None:
+                print(f"    Avg latency: {stats['avg_latency_ms']:.0f}ms")
         
         print("\n📂 By Category:")
         for cat, stats in summary["by_category"].items():
             print(f"  {cat}: {stats['avg_score']:.1%} ({stats['count']} tests)")
+        
+        cached = [m for m in self.models if isinstance(m, CachedModel)]
+        if cached:
+            hits = sum(m.stats["hits"] for m in cached)
+            misses = sum(m.stats["misses"] for m in cached)
+            print(f"\n💾 Response cache: {hits} hits, {misses} misses")
 
 
 def run_quick_test(model_name: str = "claude") -> TestRun:
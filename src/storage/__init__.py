@@ -9,11 +9,33 @@ from .results import (
     TestRun,
     ResultsStorage,
     generate_run_id,
+    date_to_int,
 )
 
+import importlib
+
+# ResultsTable needs pandas and pyarrow, ResultArrays NumPy. Both are
+# imported on first access (PEP 562 module __getattr__), so saving and
+# loading runs - all the runner does - doesn't load them
+_LAZY_EXPORTS = {
+    "ResultsTable": "table",
+    "ResultArrays": "arrays",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "TestResult",
     "TestRun",
     "ResultsStorage",
     "generate_run_id",
+    "date_to_int",
+    "ResultsTable",
+    "ResultArrays",
 ]
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+src/storage/arrays.py
+
+All test results as parallel NumPy arrays (one array per field).
+
+TestRun/TestResult objects are convenient for saving and displaying a
+run, but the analysis code selects results by model and date range over
+every run at once. Here each field is a flat array and string fields are
+stored as integer codes, so a selection is one boolean mask:
+
+    table = storage.as_table()
+    code = table.model_codes["GPT-4 Turbo"]
+    scores = table.score[table.model_code == code]
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .results import TestRun, date_to_int
+
+
+def _intern(codes: Dict[str, int], value: str) -> int:
+    """Integer code for a string, assigning the next free one if new."""
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(codes)
+    return code
+
+
+@dataclass
+class ResultArrays:
+    """
+    Every result of every run, one array per field.
+    
+    Per-result arrays (all the same length, in run then result order):
+        model_code, category_code, test_code: indexes into models,
+            categories and test_ids
+        score, latency_ms, success: the TestResult fields; latency_ms is
+            NaN for results without timing (Batch API runs)
+        run_idx: index of the result's run
+        date: the run's date as YYYYMMDD
+    
+    Per-run fields are indexed by run_idx. run_max_tokens holds each run's
+    per-test output caps (metadata["max_tokens"]; empty for runs made
+    before caps were recorded, which all used the models' own limits).
+    
+    memo holds results derived from this table (e.g. baselines). Storage
+    builds a new table whenever its run files change, so entries never
+    go stale.
+    """
+    # Per run
+    run_ids: List[str]
+    run_timestamps: List[str]
+    run_models: List[List[str]]
+    run_dates: np.ndarray
+    run_max_tokens: List[frozenset]
+    # Inverted index: model name -> indexes of the runs that tested it
+    model_runs: Dict[str, np.ndarray]
+    
+    # Lookup tables for the code arrays
+    models: List[str]
+    categories: List[str]
+    test_ids: List[str]
+    model_codes: Dict[str, int]
+    
+    # Per result
+    model_code: np.ndarray
+    category_code: np.ndarray
+    test_code: np.ndarray
+    score: np.ndarray
+    latency_ms: np.ndarray
+    success: np.ndarray
+    run_idx: np.ndarray
+    date: np.ndarray = field(repr=False)
+    
+    memo: Dict[Any, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def from_runs(cls, runs: List[TestRun]) -> "ResultArrays":
+        """Build the arrays in a single walk over the runs."""
+        model_codes: Dict[str, int] = {}
+        category_codes: Dict[str, int] = {}
+        test_codes: Dict[str, int] = {}
+        
+        # The total is known up front, so fill preallocated arrays instead
+        # of growing Python lists of boxed values and converting them
+        total = sum(len(run.results) for run in runs)
+        model_code = np.empty(total, dtype=np.int32)
+        category_code = np.empty(total, dtype=np.int32)
+        test_code = np.empty(total, dtype=np.int32)
+        score = np.empty(total, dtype=np.float64)
+        # float32 holds every latency under ~4.6 hours exactly, has room for
+        # NaN, and is half the size of float64
+        latency_ms = np.empty(total, dtype=np.float32)
+        success = np.empty(total, dtype=bool)
+        run_idx = np.repeat(
+            np.arange(len(runs), dtype=np.int32),
+            [len(run.results) for run in runs]
+        )
+        
+        model_runs: Dict[str, List[int]] = {}
+        
+        i = 0
+        for idx, run in enumerate(runs):
+            for model_name in run.models_tested:
+                _intern(model_codes, model_name)
+                model_runs.setdefault(model_name, []).append(idx)
+            for result in run.results:
+                model_code[i] = _intern(model_codes, result.model_name)
+                category_code[i] = _intern(category_codes, result.category)
+                test_code[i] = _intern(test_codes, result.test_id)
+                score[i] = result.score
+                latency_ms[i] = np.nan if result.latency_ms is None else result.latency_ms
+                success[i] = result.success
+                i += 1
+        
+        run_dates = np.fromiter((run.date_int for run in runs), dtype=np.int32, count=len(runs))
+        
+        return cls(
+            run_ids=[run.run_id for run in runs],
+            run_timestamps=[run.timestamp for run in runs],
+            run_models=[list(run.models_tested) for run in runs],
+            run_dates=run_dates,
+            run_max_tokens=[
+                frozenset(run.metadata.get("max_tokens", {}).items())
+                for run in runs
+            ],
+            model_runs={
+                name: np.array(idxs, dtype=np.intp)
+                for name, idxs in model_runs.items()
+            },
+            models=list(model_codes),
+            categories=list(category_codes),
+            test_ids=list(test_codes),
+            model_codes=model_codes,
+            model_code=model_code,
+            category_code=category_code,
+            test_code=test_code,
+            score=score,
+            latency_ms=latency_ms,
+            success=success,
+            run_idx=run_idx,
+            date=run_dates[run_idx],
+        )
+    
+    @property
+    def num_runs(self) -> int:
+        return len(self.run_ids)
+    
+    def model_mask(self, model_name: str) -> np.ndarray:
+        """Boolean mask of the results for one model (all False if unknown)."""
+        code = self.model_codes.get(model_name)
+        if code is None:
+            return np.zeros(len(self.score), dtype=bool)
+        return self.model_code == code
+    
+    def runs_between(self, start_date: str, end_date: str) -> np.ndarray:
+        """Indexes of the runs dated start_date..end_date (inclusive)."""
+        start, end = date_to_int(start_date), date_to_int(end_date)
+        
+        # Runs are stored in run ID (= date) order, so this is normally
+        # a binary search; fall back to a mask if files were renamed
+        if np.all(self.run_dates[1:] >= self.run_dates[:-1]):
+            return np.arange(
+                np.searchsorted(self.run_dates, start, side="left"),
+                np.searchsorted(self.run_dates, end, side="right")
+            )
+        return np.flatnonzero((self.run_dates >= start) & (self.run_dates <= end))
+    
+    def runs_with_model(self, model_name: str) -> np.ndarray:
+        """Indexes of the runs that list model_name in models_tested."""
+        return self.model_runs.get(model_name, np.empty(0, dtype=np.intp))
+    
+    def mixed_token_caps(self, *run_groups: np.ndarray) -> bool:
+        """Whether the runs in run_groups were made with different max_tokens caps."""
+        return len({self.run_max_tokens[i] for runs in run_groups for i in runs}) > 1
@@ -4,16 +4,18 @@ src/storage/results.py
 Handle saving and loading test results.
 
 STORAGE DESIGN:
-- Each test run is saved as a separate JSON file
-- Files are named by timestamp: run_20241106_143022.json
+- Each test run is saved as a separate JSON Lines file
+- Files are named by timestamp: run_20241106_143022.jsonl
 - This makes it easy to track results over time
-- JSON is human-readable and easy to process
+- The first line holds the run's metadata, then one line per result, so
+  files can be written and read a result at a time
+- Older runs saved as a single JSON document (run_*.json) still load
 
 DIRECTORY STRUCTURE:
 data/
 ├── raw/           # Individual run files (one per test run)
 │   ├── run_20241106_143022.json
-│   ├── run_20241107_090000.json
+│   ├── run_20241107_090000.jsonl
 │   └── ...
 └── processed/     # Aggregated/analyzed data
     ├── daily_summary.json
@@ -21,14 +23,62 @@ data/
 """
 
 import os
+import sys
 import json
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass, asdict, field
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
+# orjson parses run files several times faster; fall back to json if missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+# Current JSON Lines run files, and the single-document format before it
+RUN_FILE_PATTERNS = ("run_*.jsonl", "run_*.json")
+
+# Repeated in every result of every run: interned on load so each value
+# is stored once and equal values compare by identity
+INTERNED_FIELDS = ("test_id", "model_name", "category")
+
+# Threads reading run files in load_all_runs. Reads release the GIL, so
+# on a cold page cache the disk gets several requests at once instead of
+# one open/read round trip per file
+READ_WORKERS = 8
+
+# Reads allowed ahead of the parser. Enough to keep every worker busy
+# while a file is decoded, without holding every file's bytes at once
+READ_AHEAD = 2 * READ_WORKERS
+
+
+def date_to_int(date: str) -> int:
+    """Turn a "YYYY-MM-DD..." string into an int like 20241106."""
+    return int(date[0:4] + date[5:7] + date[8:10])
+
+
+def _dumps(obj) -> bytes:
+    """Serialize one JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: bytes):
+    """Parse one JSON document or JSON Lines record."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True)
 class TestResult:
     """
     Result of running a single test against a single model.
@@ -48,13 +98,14 @@ class TestResult:
     response: str
     expected: Optional[str]
     score: float
-    latency_ms: int
+    latency_ms: Optional[int]  # None for Batch API results (no timing)
     tokens_input: int
     tokens_output: int
     tokens_total: int
     success: bool
     error: Optional[str] = None
     category: str = ""
+    ttft_ms: Optional[int] = None  # Time to first token, if the model streamed
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -63,6 +114,10 @@ class TestResult:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TestResult":
         """Create TestResult from dictionary."""
+        data = dict(data)
+        for key in INTERNED_FIELDS:
+            if data.get(key) is not None:
+                data[key] = sys.intern(data[key])
         return cls(**data)
 
 
@@ -100,21 +155,38 @@ class TestRun:
         return cls(
             run_id=data["run_id"],
             timestamp=data["timestamp"],
-            models_tested=data.get("models_tested", []),
+            models_tested=[sys.intern(name) for name in data.get("models_tested", [])],
             total_tests=data.get("total_tests", 0),
             total_results=data.get("total_results", len(results)),
             results=results,
             metadata=data.get("metadata", {}),
         )
     
+    @cached_property
+    def date_int(self) -> int:
+        """Run date as YYYYMMDD, for integer date comparisons."""
+        return date_to_int(self.timestamp)
+    
     def get_results_by_model(self, model_name: str) -> List[TestResult]:
         """Get all results for a specific model."""
+        model_name = sys.intern(model_name)
         return [r for r in self.results if r.model_name == model_name]
     
     def get_results_by_category(self, category: str) -> List[TestResult]:
         """Get all results for a specific category."""
+        category = sys.intern(category)
         return [r for r in self.results if r.category == category]
     
+    @cached_property
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summary statistics for this run, computed on first access.
+        
+        Runs are not modified once loaded, so the result is kept on the
+        instance. Call calculate_summary() directly for a fresh copy.
+        """
+        return self.calculate_summary()
+    
     def calculate_summary(self) -> Dict[str, Any]:
         """Calculate summary statistics for this run."""
         summary = {
@@ -130,11 +202,11 @@ class TestRun:
             model_results = self.get_results_by_model(model)
             if model_results:
                 scores = [r.score for r in model_results]
-                latencies = [r.latency_ms for r in model_results]
+                latencies = [r.latency_ms for r in model_results if r.latency_ms is not None]
                 summary["by_model"][model] = {
                     "count": len(model_results),
                     "avg_score": sum(scores) / len(scores),
-                    "avg_latency_ms": sum(latencies) / len(latencies),
+                    "avg_latency_ms": sum(latencies) / len(latencies) if latencies else None,
                     "perfect_scores": sum(1 for s in scores if s == 1.0),
                 }
         
@@ -181,6 +253,11 @@ class ResultsStorage:
         # Create directories if they don't exist
         self.raw_dir.mkdir(parents=True, exist_ok=True)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
+        
+        # as_table() cache; analyze.py shares one storage across threads
+        self._table = None
+        self._table_signature = None
+        self._table_lock = threading.Lock()
     
     def save_run(self, run: TestRun) -> str:
         """
@@ -192,11 +269,16 @@ class ResultsStorage:
         Returns:
             Path to the saved file
         """
-        filename = f"run_{run.run_id}.json"
+        filename = f"run_{run.run_id}.jsonl"
         filepath = self.raw_dir / filename
         
-        with open(filepath, "w") as f:
-            json.dump(run.to_dict(), f, indent=2)
+        header = run.to_dict()
+        del header["results"]
+        
+        with open(filepath, "wb") as f:
+            f.write(_dumps(header) + b"\n")
+            for result in run.results:
+                f.write(_dumps(result.to_dict()) + b"\n")
         
         return str(filepath)
     
@@ -210,16 +292,14 @@ class ResultsStorage:
         Returns:
             TestRun if found, None otherwise
         """
-        filename = f"run_{run_id}.json"
-        filepath = self.raw_dir / filename
+        filepath = self.raw_dir / f"run_{run_id}.jsonl"
+        if not filepath.exists():
+            filepath = self.raw_dir / f"run_{run_id}.json"
         
         if not filepath.exists():
             return None
         
-        with open(filepath) as f:
-            data = json.load(f)
-        
-        return TestRun.from_dict(data)
+        return self.load_run_file(filepath)
     
     def load_all_runs(self) -> List[TestRun]:
         """
@@ -228,18 +308,82 @@ class ResultsStorage:
         Returns:
             List of TestRun objects, sorted by timestamp (oldest first)
         """
+        files = self.run_files()
         runs = []
         
-        for filepath in sorted(self.raw_dir.glob("run_*.json")):
-            try:
-                with open(filepath) as f:
-                    data = json.load(f)
-                runs.append(TestRun.from_dict(data))
-            except Exception as e:
-                print(f"Warning: Could not load {filepath}: {e}")
+        if not files:
+            return runs
+        
+        # Files are read concurrently but parsed here in run order, each
+        # as soon as its bytes are in. Every parsed file frees a slot for
+        # the next read, so I/O keeps going while we decode
+        with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(files))) as executor:
+            pending = iter(files)
+            reads = deque(
+                (filepath, executor.submit(filepath.read_bytes))
+                for filepath in itertools.islice(pending, READ_AHEAD)
+            )
+            
+            while reads:
+                filepath, future = reads.popleft()
+                next_path = next(pending, None)
+                if next_path is not None:
+                    reads.append((next_path, executor.submit(next_path.read_bytes)))
+                
+                try:
+                    runs.append(self.parse_run_file(filepath, future.result()))
+                except Exception as e:
+                    print(f"Warning: Could not load {filepath}: {e}")
         
         return runs
     
+    def load_run_file(self, filepath) -> TestRun:
+        """
+        Load a single run file.
+        
+        Args:
+            filepath: Path to a run_*.jsonl or legacy run_*.json file
+        
+        Returns:
+            TestRun parsed from the file
+        """
+        filepath = Path(filepath)
+        return self.parse_run_file(filepath, filepath.read_bytes())
+    
+    def parse_run_file(self, filepath: Path, data: bytes) -> TestRun:
+        """
+        Parse the contents of a run file.
+        
+        Args:
+            filepath: Path the bytes were read from; its suffix picks the format
+            data: Raw file contents
+        
+        Returns:
+            TestRun parsed from the file
+        """
+        if filepath.suffix != ".jsonl":
+            return TestRun.from_dict(_loads(data))
+        
+        header, _, body = data.partition(b"\n")
+        run = _loads(header)
+        run["results"] = [_loads(line) for line in body.splitlines() if line.strip()]
+        
+        return TestRun.from_dict(run)
+    
+    def run_files(self) -> List[Path]:
+        """
+        Paths of all run files, in either format.
+        
+        Returns:
+            List of paths, sorted by run ID (oldest first)
+        """
+        files = [
+            filepath
+            for pattern in RUN_FILE_PATTERNS
+            for filepath in self.raw_dir.glob(pattern)
+        ]
+        return sorted(files, key=lambda p: p.stem)
+    
     def load_runs_since(self, since_date: str) -> List[TestRun]:
         """
         Load runs since a specific date.
@@ -250,12 +394,43 @@ class ResultsStorage:
         Returns:
             List of TestRun objects from that date onward
         """
-        all_runs = self.load_all_runs()
+        since = date_to_int(since_date)
+        runs = []
         
-        return [
-            run for run in all_runs
-            if run.timestamp[:10] >= since_date
-        ]
+        for filepath in self.run_files():
+            try:
+                # JSON Lines files say when they ran on the first line, so
+                # older runs are skipped without parsing their results
+                header = self.read_run_header(filepath)
+                if header is not None and date_to_int(header["timestamp"]) < since:
+                    continue
+                run = self.load_run_file(filepath)
+            except Exception as e:
+                print(f"Warning: Could not load {filepath}: {e}")
+                continue
+            
+            if run.date_int >= since:
+                runs.append(run)
+        
+        return runs
+    
+    def read_run_header(self, filepath) -> Optional[Dict[str, Any]]:
+        """
+        Run metadata from the first line of a JSON Lines run file.
+        
+        Args:
+            filepath: Path to a run file
+        
+        Returns:
+            The run's fields without results, or None for legacy .json
+            files, which have to be parsed whole
+        """
+        filepath = Path(filepath)
+        if filepath.suffix != ".jsonl":
+            return None
+        
+        with open(filepath, "rb") as f:
+            return _loads(f.readline())
     
     def get_all_results_flat(self) -> List[Dict[str, Any]]:
         """
@@ -278,12 +453,52 @@ class ResultsStorage:
     
     def get_latest_run(self) -> Optional[TestRun]:
         """Get the most recent test run."""
-        runs = self.load_all_runs()
-        return runs[-1] if runs else None
+        # Newest file first; only fall back to older ones if it won't load
+        for filepath in reversed(self.run_files()):
+            try:
+                return self.load_run_file(filepath)
+            except Exception as e:
+                print(f"Warning: Could not load {filepath}: {e}")
+        return None
     
     def count_runs(self) -> int:
         """Count total number of saved runs."""
-        return len(list(self.raw_dir.glob("run_*.json")))
+        return len(self.run_files())
+    
+    def as_table(self):
+        """
+        All results of all runs as parallel NumPy arrays.
+        
+        Built on first use and kept until the run files change, so
+        repeated analyses on one storage read the files only once.
+        
+        Returns:
+            ResultArrays over load_all_runs()
+        """
+        from .arrays import ResultArrays
+        
+        with self._table_lock:
+            signature = self.signature()
+            if self._table is None or self._table_signature != signature:
+                self._table = ResultArrays.from_runs(self.load_all_runs())
+                self._table_signature = signature
+            return self._table
+    
+    def signature(self) -> tuple:
+        """
+        Fingerprint of the run files on disk.
+        
+        Changes whenever a run file is added, removed or rewritten, so it
+        can be used as a cache key for anything derived from the runs.
+        
+        Returns:
+            Tuple of (path, mtime_ns, size) for each run file
+        """
+        signature = []
+        for filepath in self.run_files():
+            stat = filepath.stat()
+            signature.append((str(filepath), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
 
 
 def generate_run_id() -> str:
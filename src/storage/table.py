@@ -0,0 +1,185 @@
+"""
+src/storage/table.py
+
+Columnar copy of all test results for fast loading.
+
+The run files in data/raw stay the source of truth. Next to them we keep one
+Parquet part per run:
+
+data/
+├── raw/
+│   └── run_20241106_143022.jsonl
+└── processed/
+    └── results/
+        └── run_20241106_143022.v2.parquet
+
+Parts are only ever added (or rewritten when their run file or the
+table's columns change), so a new daily run costs one JSON parse. Readers get every run's results as
+a single DataFrame and can load just the columns they need.
+
+Falls back to building the DataFrame from the JSON files when pyarrow is
+not installed.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from .results import ResultsStorage, TestRun
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+# Part layout version, in each part's filename. Bump it when the columns
+# change, so parts written with the old ones are rebuilt on the next sync
+TABLE_VERSION = 2
+
+# One row per test result, plus the run it came from
+TABLE_COLUMNS = [
+    "run_id",
+    "run_timestamp",
+    "test_id",
+    "model_name",
+    "model_id",
+    "timestamp",
+    "category",
+    "ttft_ms",
+    "score",
+    "latency_ms",
+    "tokens_input",
+    "tokens_output",
+    "tokens_total",
+    "success",
+    "error",
+    "prompt",
+    "response",
+    "expected",
+]
+
+
+def _table_schema():
+    """Fixed Parquet schema, so parts with all-null columns still line up."""
+    return pa.schema([
+        ("run_id", pa.string()),
+        ("run_timestamp", pa.string()),
+        ("test_id", pa.string()),
+        ("model_name", pa.string()),
+        ("model_id", pa.string()),
+        ("timestamp", pa.string()),
+        ("category", pa.string()),
+        ("ttft_ms", pa.int64()),  # null unless the model streamed
+        ("score", pa.float64()),
+        ("latency_ms", pa.int64()),
+        ("tokens_input", pa.int64()),
+        ("tokens_output", pa.int64()),
+        ("tokens_total", pa.int64()),
+        ("success", pa.bool_()),
+        ("error", pa.string()),
+        ("prompt", pa.string()),
+        ("response", pa.string()),
+        ("expected", pa.string()),
+    ])
+
+
+def run_to_frame(run: TestRun) -> pd.DataFrame:
+    """Flatten one run into a DataFrame with TABLE_COLUMNS."""
+    records = [
+        {
+            "run_id": run.run_id,
+            "run_timestamp": run.timestamp,
+            **result.to_dict(),
+        }
+        for result in run.results
+    ]
+    return pd.DataFrame.from_records(records, columns=TABLE_COLUMNS)
+
+
+class ResultsTable:
+    """
+    Append-only Parquet table of every result in a ResultsStorage.
+    
+    Usage:
+        table = ResultsTable(ResultsStorage())
+        df = table.load(columns=["model_name", "category", "score"])
+    """
+    
+    def __init__(self, storage: ResultsStorage):
+        self.storage = storage
+        self.parts_dir = storage.processed_dir / "results"
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _part_path(self, run_file: Path) -> Path:
+        return self.parts_dir / f"{run_file.stem}.v{TABLE_VERSION}.parquet"
+    
+    def sync(self) -> List[Path]:
+        """
+        Bring the Parquet parts in line with the run files.
+        
+        Writes parts for new or rewritten runs and removes parts whose
+        run file is gone.
+        
+        Returns:
+            Part paths, in run order
+        """
+        parts = []
+        
+        for run_file in self.storage.run_files():
+            part = self._part_path(run_file)
+            
+            if not part.exists() or part.stat().st_mtime_ns < run_file.stat().st_mtime_ns:
+                try:
+                    run = self.storage.load_run_file(run_file)
+                except Exception as e:
+                    print(f"Warning: Could not load {run_file}: {e}")
+                    continue
+                table = pa.Table.from_pandas(
+                    run_to_frame(run),
+                    schema=_table_schema(),
+                    preserve_index=False
+                )
+                pq.write_table(table, part)
+            
+            parts.append(part)
+        
+        # Drop parts for runs that were deleted, or from an older TABLE_VERSION
+        current = set(parts)
+        for part in self.parts_dir.glob("run_*.parquet"):
+            if part not in current:
+                part.unlink()
+        
+        return parts
+    
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load all results as one DataFrame.
+        
+        Args:
+            columns: Subset of TABLE_COLUMNS to read. Defaults to all.
+        
+        Returns:
+            DataFrame with one row per result, oldest run first
+        """
+        columns = columns or TABLE_COLUMNS
+        
+        if pa is None:
+            frames = [run_to_frame(run) for run in self.storage.load_all_runs()]
+            if not frames:
+                return pd.DataFrame(columns=columns)
+            return pd.concat(frames, ignore_index=True)[columns]
+        
+        parts = self.sync()
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        
+        dataset = pa_dataset.dataset(
+            [str(p) for p in parts],
+            schema=_table_schema(),
+            format="parquet"
+        )
+        return dataset.to_table(columns=columns).to_pandas()
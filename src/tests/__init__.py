@@ -11,6 +11,8 @@ from .test_cases import (
     get_all_tests,
     get_tests_by_category,
     get_test_by_id,
+    get_max_tokens,
+    CATEGORY_MAX_TOKENS,
 )
 
 from .scoring import (
@@ -31,6 +33,8 @@ __all__ = [
     "get_all_tests",
     "get_tests_by_category",
     "get_test_by_id",
+    "get_max_tokens",
+    "CATEGORY_MAX_TOKENS",
     # Scoring functions
     "score_response",
     "score_exact",
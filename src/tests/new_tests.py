@@ -14,6 +14,7 @@ class TestCase:
     expected: Optional[str]
     scoring_method: str  # CHANGED from scoring_type
     metadata: dict = None
+    max_tokens: Optional[int] = None
 
 
 # Creative Writing Tests
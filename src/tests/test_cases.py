@@ -41,6 +41,19 @@ class TestCategory(Enum):
     INSTRUCTION = "instruction"
 
 
+# Response length cap per category. Most prompts ask for just a number or
+# a few words, and every extra token the model may generate adds latency.
+# Categories that aren't listed (reasoning mixes one-word answers with
+# explanations, code needs room) keep each model's own limit.
+CATEGORY_MAX_TOKENS = {
+    "math": 20,
+    "factual": 50,
+    "consistency": 50,
+    "instruction": 100,
+    "creative": 500,
+}
+
+
 class ScoringMethod(Enum):
     """How to score a response."""
     EXACT = "exact"           # Response must contain exact answer
@@ -63,6 +76,8 @@ class TestCase:
         description: Human-readable description of what this tests
         difficulty: Optional difficulty rating (1-5)
         tags: Optional tags for filtering
+        max_tokens: Cap on the response length. None uses the category
+                    default from CATEGORY_MAX_TOKENS (see get_max_tokens)
     """
     id: str
     category: TestCategory
@@ -72,6 +87,7 @@ class TestCase:
     description: str = ""
     difficulty: int = 1
     tags: List[str] = field(default_factory=list)
+    max_tokens: Optional[int] = None
     
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
@@ -84,6 +100,7 @@ class TestCase:
             "description": self.description,
             "difficulty": self.difficulty,
             "tags": self.tags,
+            "max_tokens": self.max_tokens,
         }
 
 
@@ -596,6 +613,22 @@ def get_all_tests() -> List[TestCase]:
     )
 
 
+def get_max_tokens(test: TestCase) -> Optional[int]:
+    """
+    Response length cap to query a test with.
+    
+    Args:
+        test: The test case
+    
+    Returns:
+        The test's own max_tokens, else its category's default, else None
+    """
+    if getattr(test, "max_tokens", None):
+        return test.max_tokens
+    category = test.category.value if hasattr(test.category, 'value') else test.category
+    return CATEGORY_MAX_TOKENS.get(category)
+
+
 def get_tests_by_category(category: TestCategory) -> List[TestCase]:
     """
     Get tests filtered by category.
@@ -606,7 +639,7 @@ def get_tests_by_category(category: TestCategory) -> List[TestCase]:
     Returns:
         List of TestCase objects in that category
     """
-    return [t for t in get_all_tests() if t.category == category]
+    return list(_BY_CATEGORY.get(category, ()))
 
 
 def get_test_by_id(test_id: str) -> Optional[TestCase]:
@@ -619,10 +652,20 @@ def get_test_by_id(test_id: str) -> Optional[TestCase]:
     Returns:
         The TestCase if found, None otherwise
     """
-    for test in get_all_tests():
-        if test.id == test_id:
-            return test
-    return None
+    return _BY_ID.get(test_id)
+
+
+# Lookup tables, built once at import since the suite never changes at runtime
+_ALL_TESTS = tuple(get_all_tests())
+
+_BY_CATEGORY = {
+    category: tuple(t for t in _ALL_TESTS if t.category == category)
+    for category in TestCategory
+}
+
+_BY_ID = {}
+for _test in _ALL_TESTS:
+    _BY_ID.setdefault(_test.id, _test)
 
 
 # Quick summary when this file is run directly
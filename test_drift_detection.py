@@ -0,0 +1,53 @@
+"""
+Test drift detection with your existing data
+"""
+
+import sys
+sys.path.append('.')
+
+import pytest
+
+from src.storage import ResultsStorage
+from src.analysis import detect_drift, statistics
+
+
+def _models(storage):
+    """Every model that appears in the stored runs."""
+    models = sorted({m for run in storage.load_all_runs() for m in run.models_tested})
+    if not models:
+        pytest.skip("No runs saved yet - run 'python main.py' first")
+    return models
+
+
+def test_detect_drift_with_numba():
+    """Memoized baseline scores are read-only; the compiled kernels must accept them."""
+    pytest.importorskip("numba")
+    
+    storage = ResultsStorage()
+    
+    for model in _models(storage):
+        result = detect_drift(storage, model)
+        again = detect_drift(storage, model)  # baseline served from the memo
+        
+        assert 0.0 <= result.p_value <= 1.0
+        assert again.p_value == result.p_value
+
+
+def test_detect_drift_numpy_path(monkeypatch):
+    """Without Numba, drift detection gives the same results as with it."""
+    storage = ResultsStorage()
+    models = _models(storage)
+    expected = {model: detect_drift(storage, model) for model in models}
+    
+    monkeypatch.setattr(statistics, "_describe_kernel", None)
+    monkeypatch.setattr(statistics, "_describe_groups_kernel", None)
+    storage = ResultsStorage()  # fresh table, so nothing comes from the memo
+    
+    for model in models:
+        result = detect_drift(storage, model)
+        
+        assert result.drift_detected == expected[model].drift_detected
+        assert result.category_drift == expected[model].category_drift
+        assert result.current_mean == pytest.approx(expected[model].current_mean)
+        assert result.p_value == pytest.approx(expected[model].p_value)
+        assert result.cohens_d == pytest.approx(expected[model].cohens_d)